@@ -1,7 +1,15 @@
 """__main__.py"""
 
+import argparse
+
 from snow_revoke_privileges.application import Application
 
 if __name__ == "__main__":
-    app: Application = Application()
+
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(prog="python -m snow_revoke_privileges", description="Revoke the privileges granted on the objects of Snowflake databases.")
+    parser.add_argument("--resume", action="store_true", help="skip the requests recorded as successful in the ledgers of the previous run")
+    parser.add_argument("--profile", action="store_true", help="profile each phase and write its profiles (pstats and collapsed stacks) in the output directory")
+    args: argparse.Namespace = parser.parse_args()
+
+    app: Application = Application(resume=args.resume, profile=args.profile)
     app.execute()
@@ -1,21 +1,28 @@
 """reset_privilege.py"""
 
-from typing import Any, Dict, Optional
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
 import logging
 
 import coloredlogs  # pyright: ignore
 import pandas as pd
 
-from snowflake.connector import SnowflakeConnection
-
-from snow_revoke_privileges.tools.my_snowflake import MySnowflake
+from snow_revoke_privileges.tools.my_snowflake import MySnowflake, SnowflakeOptions
 
 from snow_revoke_privileges.tools.configuration import Configuration
+from snow_revoke_privileges.tools.concurrency_controller import ConcurrencyController
+from snow_revoke_privileges.tools.execution_ledger import FAILED, ExecutionLedger, RequestResult
+from snow_revoke_privileges.tools.retry_policy import RetryPolicy, write_dead_letter
+from snow_revoke_privileges.tools.run_metrics import RunMetrics
+from snow_revoke_privileges.tools.stage_profiler import StageProfiler
+from snow_revoke_privileges.tools.wave_scheduler import GRANT, OWNERSHIP, REVOKE, WaveScheduler
 
 from snow_revoke_privileges.snow_privileges import SnowPrivileges
 from snow_revoke_privileges.snow_objects import SnowObjects
 from snow_revoke_privileges.snow_revoke_requests import SnowRevokeRequests
 from snow_revoke_privileges.snow_new_grant_requests import SnowNewGrantRequest
+from snow_revoke_privileges.snow_snapshot import SnowSnapshot
+from snow_revoke_privileges.snow_pipeline import SnowPipeline
 
 
 class Application:  # pylint: disable=unused-variable
@@ -26,13 +33,42 @@ class Application:  # pylint: disable=unused-variable
     """
 
     # Configuration file.
-    snowflake_connection: Optional[SnowflakeConnection] = None
-
     settings: Dict[str, Any] = {}
     snowflake_credentials: Dict[str, Any] = {}
 
-    def __init__(self) -> None:
-        """..."""
+    # Skip the requests already applied by the previous run (see `ExecutionLedger`).
+    resume: bool = False
+
+    # Function opening the connections (by default `snowflake.connector.connect`, a fake one for the benchmarks).
+    connect: Optional[Callable[..., Any]] = None
+
+    # Number of seconds spent in each phase of the last execution.
+    timings: Dict[str, float] = {}
+
+    # Profile each phase and write its profiles in the output directory (see `StageProfiler`).
+    profile: bool = False
+
+    # Configuration loaded and validated once, and shared by the classes of the run.
+    config: Configuration
+
+    def __init__(self, resume: bool = False, connect: Optional[Callable[..., Any]] = None, profile: bool = False, config: Optional[Configuration] = None) -> None:
+        """
+        Args:
+            resume (bool): The `resume` parameter indicates if the requests recorded as successful in the ledgers of the
+        previous run must be skipped.
+            connect (Callable): The `connect` parameter opens the connections (by default `snowflake.connector.connect`).
+            profile (bool): The `profile` parameter indicates if each phase must be profiled.
+            config (Configuration): The `config` parameter is the configuration of the run (by default the files are
+        read), e.g. `Configuration(user_configuration)` to embed the application.
+
+        Raises:
+            ConfigurationError: if the settings are invalid, before any connection with Snowflake.
+        """
+        self.resume = resume
+        self.connect = connect
+        self.profile = profile
+        self.timings = {}
+        self.config = config if config is not None else Configuration()
         self.__load_configuration()
         self.__init_logger()
 
@@ -42,31 +78,139 @@ class Application:  # pylint: disable=unused-variable
         the resulting requests or executes them depending on the value of the "run_dry" in settings.
         """
 
+        metrics: RunMetrics = RunMetrics()
+
         # On initialize notre base de données.
-        MySnowflake.initialize_database(self.snowflake_credentials)
+        MySnowflake.initialize_database(
+            self.snowflake_credentials,
+            SnowflakeOptions(
+                self.settings.get("connections", 8),
+                connect=self.connect,
+                async_window=self.settings.get("async_window", 0),
+                batch_size=self.settings.get("batch_size", 0),
+                retry_policy=RetryPolicy.from_settings(self.settings),
+                controller=ConcurrencyController.from_settings(self.settings),
+                metrics=metrics,
+                query_tag=self.settings.get("query_tag", True) is not False,
+                profiler=StageProfiler(self.profile, self.config.get_output_path),
+            ),
+        )
+
+        try:
+            self.__execute_phases()
+        finally:
+            metrics.write_report(self.config.get_output_path("run-report.json"), self.settings, MySnowflake.controller.history)
+            MySnowflake.pool.close()
+
+    def __execute_phases(self) -> None:
+        """..."""
+
+        if self.settings.get("pipeline_mode", False) is True:
+
+            if SnowPipeline.is_supported(self.settings):
+                with self.__measure("pipeline"):
+                    SnowPipeline(self.config).execute(self.resume)
+
+                return
+
+            logging.getLogger("app").warning("The pipeline mode needs inventory_mode=show, discovery_mode=object and incremental=False, the run will be performed phase by phase.")
+
+        with self.__measure("objects"):
+            snow_objects: SnowObjects = SnowObjects(self.config)
+            snow_objects.retrieve()
+            snow_objects.filter()
+            all_objects: pd.DataFrame = snow_objects.get_dataframe()
+
+        # In incremental mode, only the objects created or altered since the previous run are analyzed.
+        snapshot: SnowSnapshot = SnowSnapshot(self.config)
+        incremental: bool = self.settings.get("incremental", False) is True
+        changed_objects: pd.DataFrame = all_objects
+        previous_privileges: pd.DataFrame = pd.DataFrame([])
+
+        if incremental and snapshot.exists():
+            previous_objects, previous_privileges = snapshot.load()
+            changed_objects = snapshot.get_changed_objects(all_objects, previous_objects)
+
+        with self.__measure("privileges"):
+            snow_privilege: SnowPrivileges = SnowPrivileges(changed_objects, config=self.config)
+            snow_privilege.prepare()
+            all_privileges: pd.DataFrame = snow_privilege.get_dataframe()
+
+        with self.__measure("requests"):
+            snow_revoke_requests: SnowRevokeRequests = SnowRevokeRequests(all_privileges, all_objects, config=self.config)
+            snow_revoke_requests.prepare()
+
+            snow_new_grant_requests: SnowNewGrantRequest = SnowNewGrantRequest(changed_objects, self.config)
+            snow_new_grant_requests.prepare()
+
+        with self.__measure("execution"):
+            if self.settings.get("execution_order", "phases") == "waves":
+                results: List[RequestResult] = self.__execute_waves(snow_revoke_requests, snow_new_grant_requests)
+            else:
+                results = snow_revoke_requests.execute(self.resume) + snow_new_grant_requests.execute(self.resume)
+
+        # A dry run does not change the privileges, so the next run must analyze the same objects again. The objects of
+        # the requests which have failed are left out of the snapshot, so that the next run analyzes them again.
+        if incremental and self.settings["run_dry"] is False:
+            failed_requests: List[str] = [result.request for result in results if result.status == FAILED]
+            snapshot.save(all_objects, snapshot.merge_privileges(all_objects, changed_objects, previous_privileges, all_privileges), failed_requests)
+
+    @contextmanager
+    def __measure(self, phase: str) -> Iterator[None]:
+        """
+        The function measures a phase of the execution (see `RunMetrics`), profiles it with `--profile` (see
+        `StageProfiler`) and records its number of seconds in `timings`.
+        """
+
+        try:
+            with MySnowflake.metrics.phase(phase), MySnowflake.profiler.stage(phase):
+                yield
+        finally:
+            self.timings[phase] = MySnowflake.metrics.phases[phase].duration
+
+    def __execute_waves(self, snow_revoke_requests: SnowRevokeRequests, snow_new_grant_requests: SnowNewGrantRequest) -> List[RequestResult]:
+        """
+        The function executes the REVOKE, GRANT OWNERSHIP and GRANT requests together as a dependency graph (see
+        `WaveScheduler`) instead of phase by phase, and returns their results (none with run_dry).
+        """
+
+        config: Configuration = self.config
+        results: List[RequestResult] = []
+
+        scheduler: WaveScheduler = WaveScheduler()
+        scheduler.add(snow_revoke_requests.grant_requests, REVOKE)
+        scheduler.add(snow_revoke_requests.ownership_requests, OWNERSHIP)
+        scheduler.add(snow_new_grant_requests.requests, GRANT)
+
+        with open(config.get_output_path("output-waves.sql"), "w", encoding="utf-8") as file:
+
+            file.write("-- Ready ...\n")
+            file.write(";\n".join(scheduler.requests))
+
+            if self.settings["run_dry"] is False and len(scheduler) > 0:
+                ledger: ExecutionLedger = ExecutionLedger(config.get_output_path("ledger-waves.jsonl"), self.resume)
+
+                try:
+                    results = scheduler.execute(ledger)
+                finally:
+                    ledger.close()
+
+                write_dead_letter(config.get_output_path("dead-letter-waves.sql"), results)
 
-        snow_objects: SnowObjects = SnowObjects()
-        snow_objects.retrieve()
-        snow_objects.filter()
-        all_objects: pd.DataFrame = snow_objects.get_dataframe()
+                logging.getLogger("app").info("All requests were now performed.")
+            elif self.settings["run_dry"] is not False:
+                logging.getLogger("app").warning("No request will be performed as requested by the user (run_dry=True).")
 
-        snow_privilege: SnowPrivileges = SnowPrivileges(all_objects)
-        snow_privilege.prepare()
-        all_privileges: pd.DataFrame = snow_privilege.get_dataframe()
+            file.write("\n-- ... Done.")
 
-        snow_revoke_requests: SnowRevokeRequests = SnowRevokeRequests(all_privileges)
-        snow_revoke_requests.prepare()
-        snow_revoke_requests.execute()
+        logging.getLogger("app").info("The SQL requests generated will be availaible in the file 'output-waves.sql'.")
 
-        snow_new_grant_requests: SnowNewGrantRequest = SnowNewGrantRequest(all_objects)
-        snow_new_grant_requests.prepare()
-        snow_new_grant_requests.execute()
+        return results
 
     def __load_configuration(self) -> None:
         """..."""
-        config: Configuration = Configuration()
-        self.settings = config.get_user_configuration("settings")
-        self.snowflake_credentials = config.get_user_configuration("snowflake_credentials")
+        self.settings = self.config.validate()
+        self.snowflake_credentials = self.config.get_user_configuration("snowflake_credentials")
 
     def __init_logger(self) -> None:
         """..."""
@@ -0,0 +1,29 @@
+"""benchmark/__main__.py"""
+
+import argparse
+
+from snow_revoke_privileges.benchmark import account, accumulation, batching, concurrency, retry, waves
+
+if __name__ == "__main__":
+
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(prog="python -m snow_revoke_privileges.benchmark", description="Run a benchmark scenario offline.")
+    parser.add_argument("scenario", choices=["account", "accumulation", "batching", "concurrency", "retry", "waves"], help="the scenario to run")
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.scenario == "account":
+        account.run([1_000, 50_000, 500_000])
+
+    elif args.scenario == "accumulation":
+        accumulation.run([1_000, 10_000, 50_000, 100_000, 500_000])
+
+    elif args.scenario == "batching":
+        batching.run([1_000, 10_000], [0, 10, 100])
+
+    elif args.scenario == "retry":
+        retry.run(10_000, [0.01, 0.1], [0, 100])
+
+    elif args.scenario == "concurrency":
+        concurrency.run(5_000, [4, 16, 48])
+
+    elif args.scenario == "waves":
+        waves.run(50, [10, 40])
@@ -0,0 +1,109 @@
+"""benchmark/account.py"""
+
+import functools
+import glob
+import logging
+import os
+import tempfile
+from typing import Any, Dict, List, Set, Tuple
+
+import yaml
+
+from snow_revoke_privileges.application import Application
+from snow_revoke_privileges.benchmark.fake_snowflake import FakeBehavior, FakeConnection, FakeStatistics
+from snow_revoke_privileges.benchmark.synthetic_account import SyntheticAccount
+from snow_revoke_privileges.tools.configuration import CONFIG_VARIABLE, OUTPUT_VARIABLE
+
+# Phases of `Application.execute` printed, in their order of execution.
+PHASES: List[str] = ["objects", "privileges", "requests", "execution", "pipeline"]
+
+
+def create_settings(account: SyntheticAccount, **settings: Any) -> Dict[str, Any]:  # pylint: disable=unused-variable
+    """
+    The function creates the configuration of a run on all the databases of a synthetic account (the requests are
+    executed by the fake connections).
+    """
+
+    defaults: Dict[str, Any] = {
+        "run_dry": False,
+        "new_owner": account.new_owner,
+        "databases": list(account.all_databases["DATABASE_NAME"]),
+        "objects": ["DATABASE", "SCHEMA"] + list(account.objects),
+        "log_level": "warning",
+        "connections": 8,
+    }
+
+    return {"settings": {**defaults, **settings}, "snowflake_credentials": {"role": "BENCHMARK"}}
+
+
+def measure(account: SyntheticAccount, latency: float, **settings: Any) -> Tuple[Dict[str, float], FakeStatistics, Set[str]]:  # pylint: disable=unused-variable
+    """
+    The function executes the application on a synthetic account, with a configuration and an output directory
+    created in a temporary directory.
+
+    Returns:
+        the number of seconds spent in each phase, the statistics of the fake connections and the requests written
+        in the output files.
+    """
+
+    statistics: FakeStatistics = FakeStatistics()
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        config_path: str = os.path.join(directory, "config.yaml")
+
+        with open(config_path, "w", encoding="utf-8") as file:
+            yaml.safe_dump(create_settings(account, **settings), file)
+
+        os.environ[CONFIG_VARIABLE] = config_path
+        os.environ[OUTPUT_VARIABLE] = directory
+
+        try:
+            application: Application = Application(connect=functools.partial(FakeConnection, statistics, FakeBehavior(latency), account))
+            logging.getLogger("app").setLevel(logging.WARNING)
+            application.execute()
+        finally:
+            del os.environ[CONFIG_VARIABLE]
+            del os.environ[OUTPUT_VARIABLE]
+
+        requests: Set[str] = set()
+
+        for path in glob.glob(os.path.join(directory, "output-*.sql")):
+            with open(path, "r", encoding="utf-8") as file:
+                requests.update(line.rstrip(";\n") for line in file if not line.startswith("--") and line.strip() != "")
+
+    return application.timings, statistics, requests
+
+
+def run(sizes: List[int], latency: float = 0.001, object_mode_limit: int = 50_000) -> None:  # pylint: disable=unused-variable
+    """
+    The function prints the time spent in each phase of a run on synthetic accounts of several sizes, with the grants
+    retrieved object by object and role by role.
+
+    Args:
+      sizes (List[int]): The numbers of objects of the accounts.
+      latency (float): The number of seconds of each round-trip.
+      object_mode_limit (int): The maximum number of objects analyzed with discovery_mode=object (one SHOW GRANTS
+    request per object).
+    """
+
+    print(f"{'objects':>8} {'discovery':>10} " + " ".join(f"{phase + ' (s)':>15}" for phase in PHASES) + f" {'round-trips':>12} {'requests':>9}")
+
+    for size in sizes:
+
+        account: SyntheticAccount = SyntheticAccount.from_size(size)
+        outputs: Dict[str, Set[str]] = {}
+
+        for discovery_mode in ("object", "role"):
+
+            if discovery_mode == "object" and size > object_mode_limit:
+                continue
+
+            timings, statistics, requests = measure(account, latency, discovery_mode=discovery_mode, batch_size=100)
+            outputs[discovery_mode] = requests
+
+            durations: str = " ".join(f"{timings[phase]:>15.2f}" if phase in timings else f"{'-':>15}" for phase in PHASES)
+            print(f"{len(account):>8} {discovery_mode:>10} {durations} {statistics.round_trips:>12} {len(requests):>9}")
+
+        if len(outputs) == 2:
+            print(f"{'':>8} The requests of both discovery modes are {'identical' if outputs['object'] == outputs['role'] else 'different'}.")
@@ -0,0 +1,141 @@
+"""benchmark/accumulation.py"""
+
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import pandas as pd
+
+from snow_revoke_privileges.snow_privileges import SnowPrivileges
+from snow_revoke_privileges.tools.my_dataframe import CompactFrameBuilder, DataFrameBuilder, concat_dataframe
+
+# Number of grants returned for each object (SHOW GRANTS ON).
+GRANTS_PER_OBJECT: int = 4
+
+
+def create_privileges() -> pd.DataFrame:  # pylint: disable=unused-variable
+    """
+    The function creates the privileges of one object, with the columns built by `SnowPrivileges`.
+
+    Returns:
+      a pandas DataFrame containing `GRANTS_PER_OBJECT` privileges.
+    """
+
+    return pd.DataFrame(
+        {
+            "GRANTED_ON": ["TABLE"] * GRANTS_PER_OBJECT,
+            "GRANTED_TO": ["ROLE"] * GRANTS_PER_OBJECT,
+            "GRANTEE_NAME": [f"ROLE_{i}" for i in range(GRANTS_PER_OBJECT)],
+            "OWNERSHIP": [i == 0 for i in range(GRANTS_PER_OBJECT)],
+            "KEY_OBJECT": ["\"DB\".\"SCHEMA\".\"TABLE\""] * GRANTS_PER_OBJECT,
+            "OBJECT_TYPE": ["TABLE"] * GRANTS_PER_OBJECT,
+            "ARGUMENTS": [""] * GRANTS_PER_OBJECT,
+            "FUTURE": [False] * GRANTS_PER_OBJECT,
+        }
+    )
+
+
+def accumulate_with_concat(privileges: pd.DataFrame, objects: int) -> pd.DataFrame:  # pylint: disable=unused-variable
+    """
+    The function accumulates the privileges by concatenating the whole DataFrame for each object (former behavior).
+    """
+
+    all_privileges: pd.DataFrame = pd.DataFrame([])
+
+    for _ in range(objects):
+        all_privileges = concat_dataframe([all_privileges, privileges])
+
+    return all_privileges
+
+
+def accumulate_with_builder(privileges: pd.DataFrame, objects: int) -> pd.DataFrame:  # pylint: disable=unused-variable
+    """
+    The function accumulates the privileges with a `DataFrameBuilder` (one pandas DataFrame per object).
+    """
+
+    builder: DataFrameBuilder = DataFrameBuilder()
+
+    for _ in range(objects):
+        builder.append(privileges)
+
+    return builder.build()
+
+
+def accumulate_with_compact_builder(privileges: pd.DataFrame, objects: int) -> pd.DataFrame:  # pylint: disable=unused-variable
+    """
+    The function accumulates the privileges with a `CompactFrameBuilder` (current behavior): the strings are stored as
+    codes of a symbol table, and the key of the object is given once for all its privileges.
+    """
+
+    builder: CompactFrameBuilder = CompactFrameBuilder(SnowPrivileges.string_columns, SnowPrivileges.bool_columns)
+    columns: Dict[str, Any] = {column: privileges[column].tolist() for column in privileges.columns}
+
+    for position in range(objects):
+        builder.append_rows(len(privileges), {**columns, "KEY_OBJECT": f"\"DB\".\"SCHEMA\".\"TABLE_{position}\""})
+
+    return builder.build()
+
+
+def get_memory(all_privileges: pd.DataFrame) -> int:  # pylint: disable=unused-variable
+    """
+    The function returns the number of bytes used by a pandas DataFrame, counting the categories shared by several
+    categorical columns only once.
+    """
+
+    memory: int = 0
+    categories: Dict[int, int] = {}
+
+    for column in all_privileges.columns:
+        current_column: "pd.Series[Any]" = all_privileges[column]
+
+        if isinstance(current_column.dtype, pd.CategoricalDtype):
+            memory += current_column.cat.codes.memory_usage(index=False)  # pyright: ignore
+            categories[id(current_column.cat.categories)] = current_column.cat.categories.memory_usage(deep=True)  # pyright: ignore
+        else:
+            memory += current_column.memory_usage(index=False, deep=True)
+
+    return memory + sum(categories.values())
+
+
+def measure(accumulate: Callable[[pd.DataFrame, int], pd.DataFrame], grants: int) -> Tuple[float, int]:  # pylint: disable=unused-variable
+    """
+    The function measures the number of seconds needed to accumulate a given number of grants, and the number of bytes
+    of the pandas DataFrame obtained.
+    """
+
+    privileges: pd.DataFrame = create_privileges()
+
+    start: float = time.perf_counter()
+    all_privileges: pd.DataFrame = accumulate(privileges, grants // GRANTS_PER_OBJECT)
+    duration: float = time.perf_counter() - start
+
+    assert len(all_privileges) == grants
+
+    return (duration, get_memory(all_privileges))
+
+
+def run(sizes: List[int], max_concat_size: int = 50_000) -> None:  # pylint: disable=unused-variable
+    """
+    The function prints the time needed to accumulate each number of grants, with the compact builder, the builder of
+    pandas DataFrames and without builder, and the memory used by the privileges. The time per grant must remain stable
+    with the builders (linear scaling).
+
+    Args:
+      sizes (List[int]): The numbers of grants to accumulate.
+      max_concat_size (int): Above this number of grants, the former behavior is not measured (quadratic).
+    """
+
+    print(f"{'grants':>10} {'compact (s)':>12} {'MB':>7} {'builder (s)':>12} {'MB':>7} {'us/grant':>9} {'concat (s)':>11} {'us/grant':>9}")
+
+    for grants in sizes:
+
+        compact, compact_memory = measure(accumulate_with_compact_builder, grants)
+        builder, builder_memory = measure(accumulate_with_builder, grants)
+        line: str = f"{grants:>10} {compact:>12.3f} {compact_memory / 2**20:>7.1f} {builder:>12.3f} {builder_memory / 2**20:>7.1f} {builder / grants * 1e6:>9.2f}"
+
+        if grants <= max_concat_size:
+            concat, _ = measure(accumulate_with_concat, grants)
+            line += f" {concat:>11.3f} {concat / grants * 1e6:>9.2f}"
+        else:
+            line += f" {'-':>11} {'-':>9}"
+
+        print(line)
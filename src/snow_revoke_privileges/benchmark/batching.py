@@ -0,0 +1,68 @@
+"""benchmark/batching.py"""
+
+import functools
+import logging
+import time
+from typing import List, Tuple
+
+from snow_revoke_privileges.benchmark.fake_snowflake import FakeBehavior, FakeConnection, FakeStatistics
+from snow_revoke_privileges.tools.my_snowflake import MySnowflake, SnowflakeOptions
+from snow_revoke_privileges.tools.snowflake_batch_executor import SnowflakeBatchExecutor
+
+
+def create_requests(count: int, failure_rate: float) -> List[str]:  # pylint: disable=unused-variable
+    """
+    The function creates REVOKE requests, a part of them targeting a role whose name contains the failing marker.
+    """
+
+    period: int = int(1 / failure_rate) if failure_rate > 0 else 0
+
+    return [f"REVOKE SELECT ON TABLE \"DB\".\"SCHEMA\".\"TABLE_{i}\" FROM ROLE {'FAIL' if period > 0 and i % period == 0 else 'ROLE'}_{i % 10}" for i in range(count)]
+
+
+def measure(requests: List[str], batch_size: int, connections: int, latency: float) -> Tuple[float, FakeStatistics]:  # pylint: disable=unused-variable
+    """
+    The function measures the number of seconds needed to execute the requests with a given batch size.
+    """
+
+    statistics: FakeStatistics = FakeStatistics()
+
+    MySnowflake.initialize_database({"role": "BENCHMARK"}, SnowflakeOptions(connections, functools.partial(FakeConnection, statistics, FakeBehavior(latency)), batch_size=batch_size))
+
+    start: float = time.perf_counter()
+    SnowflakeBatchExecutor.execute_multi_requests(requests)
+    duration: float = time.perf_counter() - start
+
+    MySnowflake.pool.close()
+
+    # Each request which does not fail must have been executed (at least once when its batch was replayed).
+    assert set(statistics.statements) >= {request for request in requests if "FAIL" not in request}
+
+    return (duration, statistics)
+
+
+def run(counts: List[int], batch_sizes: List[int], connections: int = 8, latency: float = 0.02, failure_rate: float = 0.001) -> None:  # pylint: disable=unused-variable
+    """
+    The function prints the time and the number of round-trips needed to execute each number of requests, statement
+    by statement (batch size 0) and with multi-statement requests.
+
+    Args:
+      counts (List[int]): The numbers of requests to execute.
+      batch_sizes (List[int]): The numbers of statements of each multi-statement request.
+      connections (int): The number of fake connections.
+      latency (float): The number of seconds of each round-trip.
+      failure_rate (float): The part of the requests which fail.
+    """
+
+    # The failures are expected, their logs would hide the results.
+    logging.getLogger("app").setLevel(logging.CRITICAL + 1)
+
+    print(f"{'requests':>10} {'batch':>6} {'duration (s)':>13} {'requests/s':>11} {'round-trips':>12}")
+
+    for count in counts:
+
+        requests: List[str] = create_requests(count, failure_rate)
+
+        for batch_size in batch_sizes:
+            duration, statistics = measure(requests, batch_size, connections, latency)
+            print(f"{count:>10} {batch_size:>6} {duration:>13.3f} {count / duration:>11.0f} {statistics.round_trips:>12}")
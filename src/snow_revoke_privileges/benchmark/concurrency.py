@@ -0,0 +1,61 @@
+"""benchmark/concurrency.py"""
+
+import functools
+import logging
+import time
+from typing import List, Tuple
+
+from snow_revoke_privileges.benchmark.batching import create_requests
+from snow_revoke_privileges.benchmark.fake_snowflake import FakeBehavior, FakeConnection, FakeStatistics
+from snow_revoke_privileges.tools.concurrency_controller import ConcurrencyController
+from snow_revoke_privileges.tools.my_snowflake import MySnowflake, SnowflakeOptions
+from snow_revoke_privileges.tools.snowflake_batch_executor import SnowflakeBatchExecutor
+from snow_revoke_privileges.tools.retry_policy import RetryPolicy
+
+
+def measure(requests: List[str], controller: ConcurrencyController, capacity: int, latency: float) -> Tuple[float, FakeStatistics]:  # pylint: disable=unused-variable
+    """
+    The function measures the number of seconds needed to execute the requests on a fake warehouse of a given capacity.
+    """
+
+    statistics: FakeStatistics = FakeStatistics()
+    connect = functools.partial(FakeConnection, statistics, FakeBehavior(latency, capacity))
+
+    MySnowflake.initialize_database({"role": "BENCHMARK"}, SnowflakeOptions(controller.min_window, connect, retry_policy=RetryPolicy(10, 0.01, 0.5), controller=controller))
+
+    start: float = time.perf_counter()
+    SnowflakeBatchExecutor.execute_multi_requests(requests)
+    duration: float = time.perf_counter() - start
+
+    MySnowflake.pool.close()
+
+    return (duration, statistics)
+
+
+def run(count: int, capacities: List[int], latency: float = 0.01) -> None:  # pylint: disable=unused-variable
+    """
+    The function prints the time needed to execute the requests with fixed windows and with the adaptive one, for
+    warehouses of several capacities. The adaptive window must stay close to the best fixed window.
+
+    Args:
+      count (int): The number of requests to execute.
+      capacities (List[int]): The numbers of requests executed at the same time by the fake warehouse without queuing.
+      latency (float): The number of seconds of each round-trip.
+    """
+
+    # The transient errors are expected, their logs would hide the results.
+    logging.getLogger("app").setLevel(logging.CRITICAL + 1)
+
+    print(f"{'capacity':>9} {'window':>10} {'duration (s)':>13} {'requests/s':>11} {'throttled':>10} {'final window':>13}")
+
+    for capacity in capacities:
+
+        controllers: List[Tuple[str, ConcurrencyController]] = [
+            ("fixed 8", ConcurrencyController(8, 8)),
+            ("fixed 64", ConcurrencyController(64, 64)),
+            ("2 - 64", ConcurrencyController(2, 64)),
+        ]
+
+        for name, controller in controllers:
+            duration, statistics = measure(create_requests(count, 0), controller, capacity, latency)
+            print(f"{capacity:>9} {name:>10} {duration:>13.3f} {count / duration:>11.0f} {statistics.transient_errors:>10} {controller.window:>13}")
@@ -0,0 +1,305 @@
+"""benchmark/fake_snowflake.py"""
+
+import random
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+from snowflake.connector.errors import NotSupportedError, OperationalError, ProgrammingError, TooManyRequests
+
+from snow_revoke_privileges.benchmark.synthetic_account import SyntheticAccount
+
+
+class FakeBehavior(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `FakeBehavior` class contains the latency, the capacity and the errors injected in the fake connections.
+    """
+
+    # Number of seconds of each round-trip, and number of requests executed at the same time without queuing (0 for no limit).
+    latency: float = 0.0
+    capacity: int = 0
+
+    # Texts identifying the statements which fail and the statements ten times slower than the others.
+    failing_marker: str = "FAIL"
+    slow_marker: str = "SLOW"
+
+    # Part of the round-trips failing with a transient error.
+    transient_rate: float = 0.0
+
+
+class FakeStatistics:  # pylint: disable=unused-variable
+    """
+    The `FakeStatistics` class counts the round-trips and the statements received by all the fake connections.
+    """
+
+    round_trips: int
+    statements: List[str]
+    transient_errors: int
+
+    def __init__(self, seed: int = 0) -> None:
+        """..."""
+        self.round_trips = 0
+        self.statements = []
+        self.transient_errors = 0
+        self.running = 0
+        self.lock = threading.Lock()
+        self.random = random.Random(seed)
+
+    def enter(self) -> int:
+        """
+        The function records the start of a round-trip and returns the number of round-trips running.
+        """
+
+        with self.lock:
+            self.running += 1
+            return self.running
+
+    def leave(self) -> None:
+        """..."""
+
+        with self.lock:
+            self.running -= 1
+
+    def draw(self) -> float:
+        """..."""
+
+        with self.lock:
+            return self.random.random()
+
+    def record_transient_error(self) -> None:
+        """..."""
+
+        with self.lock:
+            self.round_trips += 1
+            self.transient_errors += 1
+
+    def record(self, statements: List[str]) -> None:
+        """..."""
+
+        with self.lock:
+            self.round_trips += 1
+            self.statements.extend(statements)
+
+
+class FakeCursor:  # pylint: disable=unused-variable
+    """
+    The `FakeCursor` class mimics a cursor of the Snowflake connector: each call to `execute` waits for the
+    latency of the connection (ten times longer for the statements containing the slow marker), fails with a transient
+    error (network or throttling) at the rate of the connection, and the statements containing the failing marker raise
+    a permanent error. When the connection has a synthetic account, the SHOW commands return its rows.
+    """
+
+    description: List[Tuple[str, ...]] = []
+    sfqid: Optional[str] = None
+
+    # Rows returned by the last request and not fetched yet.
+    rows: List[Tuple[Any, ...]] = []
+
+    def __init__(self, connection: "FakeConnection") -> None:
+        """..."""
+        self.connection = connection
+        self.description = []
+        self.rows = []
+
+    def execute(self, command: str, num_statements: Optional[int] = None, **kwargs: Any) -> "FakeCursor":  # pylint: disable=unused-argument
+        """..."""
+
+        statements: List[str] = self.split(command, num_statements)
+
+        self.sfqid = str(uuid.uuid4())
+        running: int = self.connection.statistics.enter()
+
+        try:
+            self.wait(running, any(self.connection.behavior.slow_marker in statement for statement in statements))
+        finally:
+            self.connection.statistics.leave()
+
+        self.run(statements)
+
+        return self
+
+    def execute_async(self, command: str, num_statements: Optional[int] = None, **kwargs: Any) -> Dict[str, Any]:  # pylint: disable=unused-argument
+        """
+        The function submits a request without waiting: the request is running until the latency of the connection has
+        elapsed (see `FakeConnection.get_query_status`), and its error is raised by `get_query_status_throw_if_error`.
+        """
+
+        statements: List[str] = self.split(command, num_statements)
+        slow: bool = any(self.connection.behavior.slow_marker in statement for statement in statements)
+
+        self.sfqid = str(uuid.uuid4())
+        error: Optional[Exception] = None
+
+        try:
+            self.run(statements)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            error = err
+
+        self.connection.submit(self.sfqid, self.connection.behavior.latency * (10 if slow else 1), error, self.description, self.rows)
+
+        return {"queryId": self.sfqid}
+
+    def split(self, command: str, num_statements: Optional[int]) -> List[str]:
+        """..."""
+
+        statements: List[str] = [statement.strip() for statement in command.rstrip("; \n").split(";\n")]
+
+        if num_statements is not None and num_statements != len(statements):
+            raise ProgrammingError(msg=f"Actual statement count {len(statements)} did not match the desired statement count {num_statements}.")
+
+        return statements
+
+    def run(self, statements: List[str]) -> None:
+        """
+        The function raises the errors injected, records the statements and computes the rows returned by the last
+        statement when the connection has a synthetic account.
+        """
+
+        draw: float = self.connection.statistics.draw()
+
+        if draw < self.connection.behavior.transient_rate:
+            self.connection.statistics.record_transient_error()
+
+            if draw < self.connection.behavior.transient_rate / 2:
+                raise TooManyRequests(msg="Too many requests, the cloud services are throttling.")
+
+            raise OperationalError(msg="Connection reset by peer.")
+
+        for position, statement in enumerate(statements):
+
+            # Like Snowflake, a multi-statement request stops at the first statement which fails.
+            if self.connection.behavior.failing_marker in statement:
+                self.connection.statistics.record(statements[:position])
+                raise ProgrammingError(msg=f"SQL compilation error: '{statement}'.")
+
+        self.description = []
+        self.rows = []
+
+        if self.connection.account is not None:
+            result: pd.DataFrame = self.connection.account.query(statements[-1])
+            self.description = [(str(column), ) for column in result.columns]
+            self.rows = list(result.itertuples(index=False, name=None))
+
+        self.connection.statistics.record(statements)
+
+    def wait(self, running: int, slow: bool = False) -> None:
+        """
+        The function waits for the latency of the connection. Beyond the capacity of the warehouse, the requests are
+        queued (the latency grows with the number of requests running) and then throttled.
+        """
+
+        capacity: int = self.connection.behavior.capacity
+
+        if capacity > 0 and running > capacity * 4:
+            time.sleep(self.connection.behavior.latency)
+            self.connection.statistics.record_transient_error()
+            raise TooManyRequests(msg="Too many requests, the cloud services are throttling.")
+
+        time.sleep(self.connection.behavior.latency * (max(1.0, running / capacity) if capacity > 0 else 1.0) * (10 if slow else 1))
+
+    def fetch_pandas_batches(self) -> Iterator[pd.DataFrame]:
+        """..."""
+        raise NotSupportedError
+
+    def fetchmany(self, size: int) -> List[Tuple[Any, ...]]:
+        """..."""
+
+        rows: List[Tuple[Any, ...]] = self.rows[:size]
+        self.rows = self.rows[size:]
+
+        return rows
+
+    def fetchall(self) -> List[Tuple[Any, ...]]:
+        """..."""
+
+        rows: List[Tuple[Any, ...]] = self.rows
+        self.rows = []
+
+        return rows
+
+    def get_results_from_sfqid(self, query_id: str) -> None:
+        """..."""
+        self.description, self.rows = self.connection.get_results(query_id)
+
+    def close(self) -> None:
+        """..."""
+
+
+class FakeConnection:  # pylint: disable=unused-variable
+    """
+    The `FakeConnection` class mimics a connection of the Snowflake connector, to run the benchmarks offline.
+    It can be given to `MySnowflake.initialize_database` as `connect` option (with `functools.partial`).
+    """
+
+    def __init__(self, statistics: FakeStatistics, behavior: Optional[FakeBehavior] = None, account: Optional[SyntheticAccount] = None, **config: Any) -> None:  # pylint: disable=unused-argument
+        """
+        Args:
+            statistics (FakeStatistics): The `statistics` parameter is shared by all the fake connections.
+            behavior (FakeBehavior): The `behavior` parameter is the latency, the capacity and the errors injected (none by default).
+            account (SyntheticAccount): The `account` parameter is the account answering the SHOW commands (none by default).
+        """
+
+        self.statistics = statistics
+        self.behavior = behavior if behavior is not None else FakeBehavior()
+        self.account = account
+        self.closed = False
+
+        # Requests submitted with `execute_async`: end of their latency, error, description and rows.
+        self.queries: Dict[str, Tuple[float, Optional[Exception], List[Tuple[str, ...]], List[Tuple[Any, ...]]]] = {}
+        self.lock = threading.Lock()
+
+    def cursor(self, cursor_class: Any = None) -> FakeCursor:  # pylint: disable=unused-argument
+        """..."""
+        return FakeCursor(self)
+
+    def is_closed(self) -> bool:
+        """..."""
+        return self.closed
+
+    def close(self) -> None:
+        """..."""
+        self.closed = True
+
+    def submit(self, query_id: str, latency: float, error: Optional[Exception], description: List[Tuple[str, ...]], rows: List[Tuple[Any, ...]]) -> None:
+        """..."""
+
+        with self.lock:
+            self.queries[query_id] = (time.monotonic() + latency, error, description, rows)
+
+    def get_query_status(self, query_id: str) -> str:
+        """..."""
+
+        with self.lock:
+            end, error, _, _ = self.queries[query_id]
+
+        if time.monotonic() < end:
+            return "RUNNING"
+
+        return "FAILED_WITH_ERROR" if error is not None else "SUCCESS"
+
+    def is_still_running(self, status: str) -> bool:
+        """..."""
+        return status == "RUNNING"
+
+    def get_query_status_throw_if_error(self, query_id: str) -> str:
+        """..."""
+
+        status: str = self.get_query_status(query_id)
+
+        with self.lock:
+            error: Optional[Exception] = self.queries[query_id][1]
+
+        if error is not None:
+            raise error
+
+        return status
+
+    def get_results(self, query_id: str) -> Tuple[List[Tuple[str, ...]], List[Tuple[Any, ...]]]:
+        """..."""
+
+        with self.lock:
+            _, _, description, rows = self.queries.pop(query_id)
+
+        return description, rows
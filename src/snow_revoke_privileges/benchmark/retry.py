@@ -0,0 +1,70 @@
+"""benchmark/retry.py"""
+
+import functools
+import logging
+import os
+import tempfile
+import time
+from typing import List
+
+from snow_revoke_privileges.benchmark.batching import create_requests
+from snow_revoke_privileges.benchmark.fake_snowflake import FakeBehavior, FakeConnection, FakeStatistics
+from snow_revoke_privileges.tools.execution_ledger import FAILED, RequestResult
+from snow_revoke_privileges.tools.my_snowflake import MySnowflake, SnowflakeOptions
+from snow_revoke_privileges.tools.snowflake_batch_executor import SnowflakeBatchExecutor
+from snow_revoke_privileges.tools.retry_policy import RetryPolicy, write_dead_letter
+
+
+def measure(requests: List[str], batch_size: int, transient_rate: float, max_attempts: int) -> None:  # pylint: disable=unused-variable
+    """
+    The function executes the requests on fake connections injecting transient errors, and checks that only the
+    requests failing with a permanent error end in the dead-letter file.
+    """
+
+    statistics: FakeStatistics = FakeStatistics()
+    connect = functools.partial(FakeConnection, statistics, FakeBehavior(transient_rate=transient_rate))
+    retry_policy: RetryPolicy = RetryPolicy(max_attempts, base_delay=0.001, max_delay=0.01)
+
+    MySnowflake.initialize_database({"role": "BENCHMARK"}, SnowflakeOptions(8, connect, batch_size=batch_size, retry_policy=retry_policy))
+
+    start: float = time.perf_counter()
+    results: List[RequestResult] = SnowflakeBatchExecutor.execute_multi_requests(requests)
+    duration: float = time.perf_counter() - start
+
+    MySnowflake.pool.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        dead_letters: int = write_dead_letter(os.path.join(directory, "dead-letter.sql"), results)
+
+    permanent: int = len([request for request in requests if "FAIL" in request])
+    failed: List[RequestResult] = [result for result in results if result.status == FAILED]
+
+    print(f"{transient_rate:>10.2f} {batch_size:>6} {max_attempts:>9} {duration:>13.3f} {statistics.transient_errors:>10} {dead_letters:>12} {permanent:>10}")
+
+    # With enough attempts, the transient errors never reach the dead-letter file.
+    if max_attempts >= 10:
+        assert all("FAIL" in result.request for result in failed)
+
+
+def run(count: int, transient_rates: List[float], batch_sizes: List[int]) -> None:  # pylint: disable=unused-variable
+    """
+    The function prints, for each rate of transient errors, the number of errors injected and the number of requests
+    written in the dead-letter file, without retry and with the retry policy.
+
+    Args:
+      count (int): The number of requests to execute.
+      transient_rates (List[float]): The parts of the round-trips failing with a transient error.
+      batch_sizes (List[int]): The numbers of statements of each multi-statement request.
+    """
+
+    # The failures are expected, their logs would hide the results.
+    logging.getLogger("app").setLevel(logging.CRITICAL + 1)
+
+    requests: List[str] = create_requests(count, 0.001)
+
+    print(f"{'transient':>10} {'batch':>6} {'attempts':>9} {'duration (s)':>13} {'injected':>10} {'dead-letter':>12} {'permanent':>10}")
+
+    for transient_rate in transient_rates:
+        for batch_size in batch_sizes:
+            for max_attempts in (1, 10):
+                measure(requests, batch_size, transient_rate, max_attempts)
@@ -0,0 +1,498 @@
+"""benchmark/synthetic_account.py"""
+
+import fnmatch
+import re
+import sqlite3
+from typing import Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+import numpy as np
+import pandas as pd
+from snowflake.connector.errors import ProgrammingError
+
+from snow_revoke_privileges.tools.my_snowflake import MySnowflake
+
+# Creation date returned for all the objects.
+CREATED_ON: str = "2024-01-01 00:00:00.000 +0000"
+
+# Types of object with arguments: they all take one NUMBER and return a NUMBER.
+ROUTINES: Tuple[str, ...] = ("FUNCTION", "PROCEDURE")
+
+# Views of ACCOUNT_USAGE listing the objects, with the prefix of their columns and the types of object they contain.
+OBJECT_VIEWS: Dict[str, Tuple[str, List[str]]] = {
+    "TABLES": ("TABLE", ["TABLE", "EXTERNAL TABLE", "MATERIALIZED VIEW"]),
+    "VIEWS": ("TABLE", ["VIEW"]),
+    "SEQUENCES": ("SEQUENCE", ["SEQUENCE"]),
+    "STAGES": ("STAGE", ["STAGE"]),
+    "FILE_FORMATS": ("FILE_FORMAT", ["FILE FORMAT"]),
+    "PIPES": ("PIPE", ["PIPE"]),
+    "FUNCTIONS": ("FUNCTION", ["FUNCTION"]),
+    "PROCEDURES": ("PROCEDURE", ["PROCEDURE"]),
+}
+
+
+class AccountShape(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `AccountShape` class contains the number of databases, of schemas in each database and of objects of each type
+    in each schema of a synthetic account.
+    """
+
+    databases: int
+    schemas: int
+    objects: Dict[str, int]
+
+
+class GrantProfile(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `GrantProfile` class contains the roles, the grants and the owners generated in a synthetic account.
+    """
+
+    # Number of roles receiving the grants, and number of roles with a privilege on each object and in each schema.
+    roles: int = 20
+    grants_per_object: int = 3
+    future_grants: int = 1
+
+    # Part of the objects already owned by the role set as `new_owner` in the configuration.
+    owned_ratio: float = 0.5
+    new_owner: str = "SYSADMIN"
+
+
+class SyntheticAccount:  # pylint: disable=unused-variable
+    """
+    The `SyntheticAccount` class generates a Snowflake account in memory (databases, schemas, objects of several types,
+    roles, current and future grants) and answers the SHOW commands run by this tool, so that a whole run can be
+    executed offline by `FakeConnection`. The grants and the owners are derived from the position of each object, so
+    that the same parameters always generate the same account.
+    """
+
+    shape: AccountShape
+    profile: GrantProfile
+
+    # One row per object (DATABASE_NAME, SCHEMA_NAME, OBJECT_TYPE, NAME, OWNER), and one per schema and database.
+    all_objects: pd.DataFrame
+    all_schemas: pd.DataFrame
+    all_databases: pd.DataFrame
+
+    show_command: Pattern[str] = re.compile(
+        r"^SHOW (?P<object_type>[A-Z ]+?)S(?: LIKE '(?P<like>[^']*)')?(?: IN (?:ACCOUNT|DATABASE (?P<database>\S+)|SCHEMA (?P<schema>\S+)))?"
+        r"(?: LIMIT (?P<limit>\d+)(?: FROM '(?P<start>[^']*)')?)?$"
+    )
+    grants_on_command: Pattern[str] = re.compile(r"^SHOW GRANTS ON (?P<object_type>[A-Z ]+?) (?P<name>\".*\")\s*(?P<arguments>\(.*\))?$")
+    future_grants_command: Pattern[str] = re.compile(r"^SHOW FUTURE GRANTS IN (?:DATABASE|SCHEMA) (?P<name>\S+)$")
+    grants_to_command: Pattern[str] = re.compile(r"^SHOW GRANTS TO (?:ROLE|DATABASE ROLE|SHARE) (?P<name>\S+)$")
+    account_usage_command: Pattern[str] = re.compile(r"^SELECT .+ FROM SNOWFLAKE\.ACCOUNT_USAGE\.(?P<view>[A-Z_]+) WHERE .+$", re.DOTALL)
+
+    def __init__(self, databases: int = 1, schemas: int = 10, objects: Optional[Dict[str, int]] = None, profile: Optional[GrantProfile] = None) -> None:
+        """
+        Args:
+            databases (int): The `databases` parameter is the number of databases.
+            schemas (int): The `schemas` parameter is the number of schemas in each database.
+            objects (Dict[str, int]): The `objects` parameter is the number of objects of each type in each schema.
+            profile (GrantProfile): The `profile` parameter describes the roles, the grants and the owners to generate.
+        """
+
+        profile = profile if profile is not None else GrantProfile()
+
+        self.shape = AccountShape(databases, schemas, objects if objects is not None else {"TABLE": 80, "VIEW": 20})
+        self.profile = profile._replace(grants_per_object=min(profile.grants_per_object, profile.roles), future_grants=min(profile.future_grants, profile.roles))
+
+        self.__generate()
+        self.grants_by_role: Optional[Dict[str, pd.DataFrame]] = None
+
+    @property
+    def objects(self) -> Dict[str, int]:
+        """..."""
+        return self.shape.objects
+
+    @property
+    def new_owner(self) -> str:
+        """..."""
+        return self.profile.new_owner
+
+    @staticmethod
+    def from_size(objects: int, profile: Optional[GrantProfile] = None) -> "SyntheticAccount":
+        """
+        The function creates an account containing about a given number of objects (tables and views), spread over
+        databases of up to 100 schemas of 100 objects.
+        """
+
+        schemas: int = max(1, objects // 100)
+        databases: int = max(1, schemas // 100)
+
+        return SyntheticAccount(databases, max(1, schemas // databases), {"TABLE": 80, "VIEW": 20}, profile)
+
+    def __len__(self) -> int:
+        """..."""
+        return len(self.all_objects)
+
+    def __generate(self) -> None:
+        """..."""
+
+        database_names: List[str] = [f"DB_{database:03d}" for database in range(self.shape.databases)]
+        schema_names: List[str] = [f"SCHEMA_{schema:04d}" for schema in range(self.shape.schemas)]
+
+        self.all_databases = pd.DataFrame({"DATABASE_NAME": database_names})
+        self.all_databases["OWNER"] = self.get_owners(len(self.all_databases), 1)
+
+        self.all_schemas = pd.DataFrame([(database, schema) for database in database_names for schema in schema_names], columns=["DATABASE_NAME", "SCHEMA_NAME"])
+        self.all_schemas["OWNER"] = self.get_owners(len(self.all_schemas), 2)
+
+        rows: List[Tuple[str, str, str, str]] = [
+            (database, schema, object_type, f"{object_type.replace(' ', '_')}_{position:06d}")
+            for database in database_names
+            for schema in schema_names
+            for object_type, count in self.objects.items()
+            for position in range(count)
+        ]
+
+        self.all_objects = pd.DataFrame(rows, columns=["DATABASE_NAME", "SCHEMA_NAME", "OBJECT_TYPE", "NAME"])
+        self.all_objects["OWNER"] = self.get_owners(len(self.all_objects), 3)
+
+        self.positions: Dict[str, int] = {
+            f"{database}.{schema}.{name}": position
+            for position, (database, schema, name) in enumerate(zip(self.all_objects["DATABASE_NAME"], self.all_objects["SCHEMA_NAME"], self.all_objects["NAME"]))
+        }
+
+    def get_owners(self, count: int, salt: int) -> List[str]:
+        """
+        The function returns the owner of each object: `new_owner` for a part of them, one of the roles otherwise.
+        """
+
+        positions: np.ndarray = np.arange(count)
+        owned: np.ndarray = ((positions*2654435761 + salt) % 1000) < self.profile.owned_ratio * 1000
+
+        return [self.new_owner if is_owned else self.get_role(int(position)) for position, is_owned in zip(positions, owned)]
+
+    def get_role(self, position: int) -> str:
+        """..."""
+        return f"ROLE_{position % self.profile.roles:03d}"
+
+    def get_grantees(self, position: int, count: int) -> List[str]:
+        """
+        The function returns the roles with a privilege on an object (all different).
+        """
+
+        stride: int = max(1, self.profile.roles // max(1, count))
+        return [self.get_role(position + rank*stride) for rank in range(count)]
+
+    def query(self, statement: str) -> pd.DataFrame:
+        """
+        The function answers a statement: the SHOW commands and the SELECT on the views of ACCOUNT_USAGE return the rows
+        of the account, the other statements (USE, SELECT 1, REVOKE, GRANT, ALTER SESSION) return nothing.
+
+        Args:
+            statement (str): The statement sent to the fake connection.
+
+        Returns:
+            a pandas DataFrame with the columns returned by Snowflake.
+        """
+
+        statement = statement.strip().rstrip(";")
+        view_match: Optional[re.Match[str]] = self.account_usage_command.match(statement)
+
+        if view_match is not None:
+            return self.select_account_usage(view_match)
+
+        if not statement.upper().startswith("SHOW "):
+            return pd.DataFrame([])
+
+        for command, function in (
+            (self.grants_on_command, self.show_grants_on),
+            (self.future_grants_command, self.show_future_grants),
+            (self.grants_to_command, self.show_grants_to),
+        ):
+            match: Optional[re.Match[str]] = command.match(statement)
+
+            if match is not None:
+                return function(match)
+
+        match = self.show_command.match(statement)
+
+        if match is None:
+            raise ProgrammingError(msg=f"SQL compilation error: '{statement}' is not supported by the synthetic account.")
+
+        return self.show_objects(match)
+
+    def select_account_usage(self, match: "re.Match[str]") -> pd.DataFrame:
+        """
+        The function answers a SELECT on a view of ACCOUNT_USAGE by running it with SQLite on the rows of the view.
+        """
+
+        view: str = match.group("view")
+        connection: sqlite3.Connection = sqlite3.connect(":memory:")
+
+        try:
+            self.get_view(view).to_sql(view, connection, index=False)
+            return pd.read_sql_query(match.string.replace(f"SNOWFLAKE.ACCOUNT_USAGE.{view}", view), connection)
+        finally:
+            connection.close()
+
+    def get_view(self, view: str) -> pd.DataFrame:
+        """
+        The function returns the rows of a view of ACCOUNT_USAGE (none of the objects of the account is deleted).
+        """
+
+        dates: Dict[str, Optional[str]] = {"CREATED": CREATED_ON, "LAST_ALTERED": CREATED_ON, "DELETED": None}
+
+        if view == "DATABASES":
+            return pd.DataFrame({"DATABASE_NAME": self.all_databases["DATABASE_NAME"], "DATABASE_OWNER": self.all_databases["OWNER"], "TYPE": "STANDARD", **dates})
+
+        if view == "SCHEMATA":
+            return pd.DataFrame({"SCHEMA_NAME": self.all_schemas["SCHEMA_NAME"], "CATALOG_NAME": self.all_schemas["DATABASE_NAME"], "SCHEMA_OWNER": self.all_schemas["OWNER"], **dates})
+
+        if view == "GRANTS_TO_ROLES":
+            grants: pd.DataFrame = self.get_all_grants()
+            parts: List[List[str]] = [MySnowflake.split_identifier(str(name)) for name in grants["name"]]
+
+            return pd.DataFrame(
+                {
+                    "PRIVILEGE": grants["privilege"],
+                    "GRANTED_ON": grants["granted_on"],
+                    "NAME": [part[-1] for part in parts],
+                    "TABLE_CATALOG": [part[0] if len(part) > 1 else None for part in parts],
+                    "TABLE_SCHEMA": [part[1] if len(part) > 1 else None for part in parts],
+                    "GRANTED_TO": grants["granted_to"],
+                    "GRANTEE_NAME": grants["grantee_name"],
+                    "DELETED_ON": None,
+                }
+            )
+
+        if view not in OBJECT_VIEWS:
+            raise ProgrammingError(msg=f"SQL compilation error: the view '{view}' is not supported by the synthetic account.")
+
+        prefix, object_types = OBJECT_VIEWS[view]
+        selected: pd.DataFrame = self.all_objects.loc[self.all_objects["OBJECT_TYPE"].isin(object_types)]
+        rows: pd.DataFrame = pd.DataFrame(
+            {f"{prefix}_NAME": selected["NAME"], f"{prefix}_SCHEMA": selected["SCHEMA_NAME"], f"{prefix}_CATALOG": selected["DATABASE_NAME"], f"{prefix}_OWNER": selected["OWNER"], **dates}
+        )
+
+        if view == "TABLES":
+            rows["TABLE_TYPE"] = selected["OBJECT_TYPE"].replace("TABLE", "BASE TABLE")
+
+        if prefix in ROUTINES:
+            rows["ARGUMENT_SIGNATURE"] = "(ARG NUMBER)"
+
+        return rows
+
+    def show_objects(self, match: "re.Match[str]") -> pd.DataFrame:
+        """
+        The function answers SHOW <TYPE>S [LIKE ...] [IN ...] [LIMIT ... [FROM ...]].
+        """
+
+        object_type: str = match.group("object_type")
+
+        # Like Snowflake, a SHOW command in a database which does not exist fails.
+        database_name: Optional[str] = MySnowflake.split_identifier(match.group("database"))[0] if match.group("database") is not None else None
+
+        if database_name is not None and database_name not in set(self.all_databases["DATABASE_NAME"]):
+            raise ProgrammingError(msg=f"SQL compilation error: Database '{database_name}' does not exist or not authorized.")
+
+        rows: pd.DataFrame = self.get_show_rows(object_type)
+
+        if database_name is not None and "database_name" in rows:
+            rows = rows.loc[rows["database_name"] == database_name]
+
+        if match.group("schema") is not None and "schema_name" in rows:
+            parts: List[str] = MySnowflake.split_identifier(match.group("schema"))
+            database, schema = parts[0], parts[1]
+
+            # Like Snowflake, a SHOW command in a schema which does not exist fails.
+            if not ((self.all_schemas["DATABASE_NAME"] == database) & (self.all_schemas["SCHEMA_NAME"] == schema)).any():
+                raise ProgrammingError(msg=f"SQL compilation error: Schema '{database}.{schema}' does not exist or not authorized.")
+
+            rows = rows.loc[(rows["database_name"] == database) & (rows["schema_name"] == schema)]
+
+        if match.group("like") is not None:
+            rows = rows.loc[[fnmatch.fnmatchcase(str(name), match.group("like").replace("%", "*").replace("_", "?")) for name in rows["name"]]]
+
+        # Like Snowflake, the rows are sorted by database, schema and name.
+        order: List[str] = [column for column in ("database_name", "schema_name", "name") if column in rows]
+        rows = rows.sort_values(order, kind="stable")
+
+        # Like Snowflake, the database of the functions and of the procedures is returned as catalog_name.
+        if object_type in ROUTINES:
+            rows = rows.rename(columns={"database_name": "catalog_name"})
+
+        return self.paginate(rows, match.group("limit"), match.group("start"))
+
+    def get_show_rows(self, object_type: str) -> pd.DataFrame:
+        """
+        The function returns all the rows of SHOW <TYPE>S in the account, before filtering them.
+        """
+
+        rows: pd.DataFrame
+
+        if object_type == "DATABASE":
+            rows = pd.DataFrame(
+                {"name": self.all_databases["DATABASE_NAME"], "kind": "STANDARD", "owner": self.all_databases["OWNER"], "owner_role_type": "ROLE", "created_on": CREATED_ON}
+            )
+        elif object_type == "SCHEMA":
+            rows = pd.DataFrame(
+                {"database_name": self.all_schemas["DATABASE_NAME"], "name": self.all_schemas["SCHEMA_NAME"], "owner": self.all_schemas["OWNER"], "owner_role_type": "ROLE", "created_on": CREATED_ON}
+            )
+        elif object_type in ("ROLE", "DATABASE ROLE", "SHARE"):
+            rows = self.show_grantees(object_type)
+        elif object_type in ROUTINES:
+            rows = self.show_routines(object_type)
+        else:
+            selected: pd.DataFrame = self.all_objects.loc[self.all_objects["OBJECT_TYPE"] == object_type]
+            rows = pd.DataFrame(
+                {
+                    "database_name": selected["DATABASE_NAME"],
+                    "schema_name": selected["SCHEMA_NAME"],
+                    "name": selected["NAME"],
+                    "owner": selected["OWNER"],
+                    "owner_role_type": "ROLE",
+                    "created_on": CREATED_ON,
+                }
+            )
+
+        return rows
+
+    def show_routines(self, object_type: str) -> pd.DataFrame:
+        """
+        The function returns the functions or the procedures with the columns of SHOW FUNCTIONS|PROCEDURES (their owner
+        is not returned).
+        """
+
+        selected: pd.DataFrame = self.all_objects.loc[self.all_objects["OBJECT_TYPE"] == object_type]
+
+        return pd.DataFrame(
+            {
+                "database_name": selected["DATABASE_NAME"],
+                "schema_name": selected["SCHEMA_NAME"],
+                "name": selected["NAME"],
+                "is_builtin": "N",
+                "arguments": [f"{name}(NUMBER) RETURN NUMBER" for name in selected["NAME"]],
+                "created_on": CREATED_ON,
+            }
+        )
+
+    @staticmethod
+    def get_routine_name(name: str) -> str:
+        """
+        The function returns the name of a function or a procedure with its signature, as in the output of SHOW GRANTS.
+        """
+
+        return MySnowflake.quote_identifier(f"{name}(ARG NUMBER):NUMBER")
+
+    def paginate(self, rows: pd.DataFrame, limit: Optional[str], start: Optional[str]) -> pd.DataFrame:
+        """..."""
+
+        # Like Snowflake, the page starts with the first row whose name is greater than or equal to the one given in
+        # FROM, whatever its database and its schema.
+        if start is not None:
+            rows = rows.loc[rows["name"] >= start]
+
+        if limit is not None:
+            rows = rows.head(int(limit))
+
+        return rows.reset_index(drop=True)
+
+    def show_grantees(self, object_type: str) -> pd.DataFrame:
+        """..."""
+
+        if object_type == "ROLE":
+            return pd.DataFrame({"name": [self.get_role(position) for position in range(self.profile.roles)] + [self.new_owner]})
+
+        return pd.DataFrame(columns=["name", "kind"])
+
+    def show_grants_on(self, match: "re.Match[str]") -> pd.DataFrame:
+        """
+        The function answers SHOW GRANTS ON <TYPE> <name>: the ownership and the privileges of the roles.
+        """
+
+        object_type: str = match.group("object_type")
+        parts: List[str] = MySnowflake.split_identifier(match.group("name"))
+
+        if object_type == "DATABASE":
+            position: int = int(self.all_databases.index[self.all_databases["DATABASE_NAME"] == parts[0]][0])
+            owner: str = str(self.all_databases.at[position, "OWNER"])
+            privilege: str = "USAGE"
+        elif object_type == "SCHEMA":
+            position = int(self.all_schemas.index[(self.all_schemas["DATABASE_NAME"] == parts[0]) & (self.all_schemas["SCHEMA_NAME"] == parts[1])][0])
+            owner = str(self.all_schemas.at[position, "OWNER"])
+            privilege = "USAGE"
+        else:
+            position = self.positions[".".join(parts)]
+            owner = str(self.all_objects.at[position, "OWNER"])
+            privilege = "USAGE" if object_type in ROUTINES else "SELECT"
+
+        name: str = ".".join(parts) if object_type not in ROUTINES else ".".join(parts[:-1] + [self.get_routine_name(parts[-1])])
+        grantees: List[str] = self.get_grantees(position, self.profile.grants_per_object)
+
+        return pd.DataFrame(
+            {
+                "created_on": CREATED_ON,
+                "privilege": ["OWNERSHIP"] + [privilege] * len(grantees),
+                "granted_on": object_type.replace(" ", "_"),
+                "name": name,
+                "granted_to": "ROLE",
+                "grantee_name": [owner] + grantees,
+                "grant_option": ["true"] + ["false"] * len(grantees),
+                "granted_by": owner,
+            }
+        )
+
+    def show_future_grants(self, match: "re.Match[str]") -> pd.DataFrame:
+        """
+        The function answers SHOW FUTURE GRANTS IN DATABASE|SCHEMA <name>: the schemas have future grants on tables.
+        """
+
+        parts: List[str] = MySnowflake.split_identifier(match.group("name"))
+        grantees: List[str] = self.get_grantees(len(parts[-1]), self.profile.future_grants) if len(parts) == 2 else []
+
+        return pd.DataFrame(
+            {
+                "created_on": CREATED_ON,
+                "privilege": "SELECT",
+                "grant_on": "TABLE",
+                "name": f"{'.'.join(parts)}.<TABLE>",
+                "grant_to": "ROLE",
+                "grantee_name": grantees,
+                "grant_option": "false",
+            }
+        )
+
+    def show_grants_to(self, match: "re.Match[str]") -> pd.DataFrame:
+        """
+        The function answers SHOW GRANTS TO ROLE <name> from an index of the grants built at the first call.
+        """
+
+        if self.grants_by_role is None:
+            self.grants_by_role = dict(tuple(self.get_all_grants().groupby("grantee_name", sort=False)))  # type: ignore
+
+        role: str = MySnowflake.split_identifier(match.group("name"))[0]
+        columns: List[str] = ["created_on", "privilege", "granted_on", "name", "granted_to", "grantee_name", "grant_option", "granted_by"]
+
+        return self.grants_by_role.get(role, pd.DataFrame(columns=columns)).reset_index(drop=True)
+
+    def get_all_grants(self) -> pd.DataFrame:
+        """
+        The function returns all the current grants of the account, in the format of SHOW GRANTS.
+        """
+
+        frames: List[pd.DataFrame] = []
+
+        routines: "pd.Series[bool]" = self.all_objects["OBJECT_TYPE"].isin(ROUTINES)
+        object_names: pd.Series = pd.Series(
+            [self.get_routine_name(name) if is_routine else name for name, is_routine in zip(self.all_objects["NAME"], routines)],
+            index=self.all_objects.index,
+        )
+
+        for object_type, names, owners, privilege in (
+            ("DATABASE", self.all_databases["DATABASE_NAME"], self.all_databases["OWNER"], "USAGE"),
+            ("SCHEMA", self.all_schemas["DATABASE_NAME"] + "." + self.all_schemas["SCHEMA_NAME"], self.all_schemas["OWNER"], "USAGE"),
+            ("", self.all_objects["DATABASE_NAME"] + "." + self.all_objects["SCHEMA_NAME"] + "." + object_names, self.all_objects["OWNER"], np.where(routines, "USAGE", "SELECT")),
+        ):
+            granted_on: pd.Series = pd.Series(object_type, index=names.index) if object_type != "" else self.all_objects["OBJECT_TYPE"].str.replace(" ", "_")
+            frames.append(pd.DataFrame({"privilege": "OWNERSHIP", "granted_on": granted_on, "name": names, "grantee_name": owners, "granted_by": owners}))
+
+            for rank in range(self.profile.grants_per_object):
+                stride: int = max(1, self.profile.roles // self.profile.grants_per_object)
+                grantees: List[str] = [self.get_role(position + rank*stride) for position in range(len(names))]
+                frames.append(pd.DataFrame({"privilege": privilege, "granted_on": granted_on, "name": names, "grantee_name": grantees, "granted_by": owners}))
+
+        grants: pd.DataFrame = pd.concat(frames, ignore_index=True)
+        grants = grants.assign(created_on=CREATED_ON, granted_to="ROLE", grant_option=np.where(grants["privilege"] == "OWNERSHIP", "true", "false"))
+
+        return grants.loc[:, ["created_on", "privilege", "granted_on", "name", "granted_to", "grantee_name", "grant_option", "granted_by"]]
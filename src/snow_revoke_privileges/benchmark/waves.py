@@ -0,0 +1,103 @@
+"""benchmark/waves.py"""
+
+import functools
+import logging
+import time
+from typing import Dict, List, Tuple
+
+from snow_revoke_privileges.benchmark.fake_snowflake import FakeBehavior, FakeConnection, FakeStatistics
+from snow_revoke_privileges.tools.my_snowflake import MySnowflake, SnowflakeOptions
+from snow_revoke_privileges.tools.snowflake_batch_executor import SnowflakeBatchExecutor
+from snow_revoke_privileges.tools.wave_scheduler import GRANT, OWNERSHIP, REVOKE, WaveScheduler
+
+
+def create_requests(schemas: int, tables: int) -> Dict[str, List[str]]:  # pylint: disable=unused-variable
+    """
+    The function creates the REVOKE, GRANT OWNERSHIP and GRANT requests of several schemas, the REVOKE of the last
+    schema being slow (e.g. a schema with many grants).
+    """
+
+    requests: Dict[str, List[str]] = {REVOKE: [], OWNERSHIP: [], GRANT: []}
+
+    for schema in range(schemas):
+
+        schema_key: str = f"\"DB\".\"SCHEMA_{schema}\""
+        role: str = "SLOW" if schema == schemas - 1 else "ROLE"
+
+        requests[REVOKE].extend(f"REVOKE ALL PRIVILEGES ON TABLE {schema_key}.\"TABLE_{i}\" FROM ROLE {role}_{i % 10}" for i in range(tables))
+        requests[OWNERSHIP].extend(f"GRANT OWNERSHIP ON TABLE {schema_key}.\"TABLE_{i}\" TO ROLE SYSADMIN -- instead of OWNER" for i in range(tables))
+        requests[GRANT].extend([f"GRANT USAGE ON SCHEMA {schema_key} TO ROLE SYSADMIN", f"GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA {schema_key} TO ROLE SYSADMIN"])
+
+    return requests
+
+
+def check_order(requests: Dict[str, List[str]], statements: List[str]) -> None:  # pylint: disable=unused-variable
+    """
+    The function checks that each GRANT OWNERSHIP was executed after the REVOKE on its table, and each GRANT on a
+    schema after the requests on its tables.
+    """
+
+    positions: Dict[str, int] = {statement: position for position, statement in enumerate(statements)}
+
+    for revoke, ownership in zip(requests[REVOKE], requests[OWNERSHIP]):
+        assert positions[revoke] < positions[ownership], ownership
+
+    for grant in requests[GRANT]:
+        schema_key: str = grant.split(" SCHEMA ")[1].split(" TO ")[0]
+        assert all(positions[request] < positions[grant] for request in requests[OWNERSHIP] if request.startswith(f"GRANT OWNERSHIP ON TABLE {schema_key}.")), grant
+
+
+def measure(requests: Dict[str, List[str]], waves: bool, connections: int, latency: float) -> Tuple[float, FakeStatistics]:  # pylint: disable=unused-variable
+    """
+    The function measures the number of seconds needed to execute the requests phase by phase or in waves.
+    """
+
+    statistics: FakeStatistics = FakeStatistics()
+
+    MySnowflake.initialize_database({"role": "BENCHMARK"}, SnowflakeOptions(connections, functools.partial(FakeConnection, statistics, FakeBehavior(latency))))
+
+    start: float = time.perf_counter()
+
+    if waves:
+        scheduler: WaveScheduler = WaveScheduler()
+
+        for phase in (REVOKE, OWNERSHIP, GRANT):
+            scheduler.add(requests[phase], phase)
+
+        scheduler.execute()
+    else:
+        for phase in (REVOKE, OWNERSHIP, GRANT):
+            SnowflakeBatchExecutor.execute_multi_requests(requests[phase])
+
+    duration: float = time.perf_counter() - start
+
+    MySnowflake.pool.close()
+
+    check_order(requests, statistics.statements)
+
+    return (duration, statistics)
+
+
+def run(schemas: int, tables: List[int], connections: int = 8, latency: float = 0.01) -> None:  # pylint: disable=unused-variable
+    """
+    The function prints the time needed to execute the requests of several schemas phase by phase and in waves.
+
+    Args:
+      schemas (int): The number of schemas.
+      tables (List[int]): The numbers of tables in each schema.
+      connections (int): The number of fake connections.
+      latency (float): The number of seconds of each round-trip (ten times more for the REVOKE of the last schema).
+    """
+
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    print(f"{'requests':>10} {'order':>7} {'duration (s)':>13} {'requests/s':>11}")
+
+    for count in tables:
+
+        requests: Dict[str, List[str]] = create_requests(schemas, count)
+        total: int = sum(len(phase_requests) for phase_requests in requests.values())
+
+        for waves in (False, True):
+            duration, _ = measure(requests, waves, connections, latency)
+            print(f"{total:>10} {'waves' if waves else 'phases':>7} {duration:>13.3f} {total / duration:>11.0f}")
@@ -0,0 +1,58 @@
+"""shards/__main__.py"""
+
+import argparse
+import logging
+import sys
+from typing import Any, Dict, List
+
+import coloredlogs  # pyright: ignore
+
+from snow_revoke_privileges.shards import merge, planner, worker
+from snow_revoke_privileges.tools.configuration import Configuration
+from snow_revoke_privileges.tools.shard_manifest import Shard, ShardManifest
+
+if __name__ == "__main__":
+
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(prog="python -m snow_revoke_privileges.shards", description="Spread a run on several accounts and databases across several workers.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    plan_parser: argparse.ArgumentParser = subparsers.add_parser("plan", help="split the fleet configuration into the shards of a manifest")
+    plan_parser.add_argument("fleet", help="the fleet configuration (see fleet-example.yaml)")
+    plan_parser.add_argument("manifest", help="the manifest written")
+    plan_parser.add_argument("--output", default=Configuration().get_output_path("shards"), help="the directory of the outputs of the shards")
+
+    run_parser: argparse.ArgumentParser = subparsers.add_parser("run", help="process shards of a manifest")
+    run_parser.add_argument("manifest", help="the manifest of the shards")
+    run_parser.add_argument("shard_ids", nargs="*", help="the shards processed (by default all the shards of the worker)")
+    run_parser.add_argument("--worker", default="0/1", help="the index of the worker among the workers, e.g. 2/8 (the shards are dealt in turn)")
+    run_parser.add_argument("--fleet", help="the fleet configuration (by default the one of the manifest)")
+    run_parser.add_argument("--output", help="the directory of the outputs of the shards (by default the one of the manifest)")
+    run_parser.add_argument("--resume", action="store_true", help="skip the requests recorded as successful in the ledgers of the previous run")
+    run_parser.add_argument("--profile", action="store_true", help="profile each phase and write its profiles in the output directory of the shard")
+
+    merge_parser: argparse.ArgumentParser = subparsers.add_parser("merge", help="merge the outputs and the run reports of the shards")
+    merge_parser.add_argument("manifest", help="the manifest of the shards")
+    merge_parser.add_argument("--output", help="the directory of the outputs of the shards (by default the one of the manifest)")
+
+    args: argparse.Namespace = parser.parse_args()
+
+    coloredlogs.install(fmt="%(asctime)s %(name)s %(levelname)s %(message)s", level="INFO", logger=logging.getLogger("app"))  # pyright: ignore
+
+    if args.command == "plan":
+        planner.plan(args.fleet, args.output).save(args.manifest)
+
+    elif args.command == "run":
+        manifest: ShardManifest = ShardManifest.load(args.manifest)
+        index, count = (int(value) for value in args.worker.split("/"))
+
+        try:
+            shards: List[Shard] = [manifest.get_shard(shard_id) for shard_id in args.shard_ids] if args.shard_ids else manifest.get_worker_shards(index, count)
+        except KeyError as err:
+            parser.error(str(err.args[0]))
+        failed: List[str] = worker.run(manifest, shards, worker.WorkerOptions(args.resume, args.profile, args.fleet, args.output))
+
+        sys.exit(1 if len(failed) > 0 else 0)
+
+    elif args.command == "merge":
+        report: Dict[str, Any] = merge.merge(ShardManifest.load(args.manifest), args.output)
+        sys.exit(1 if len(report["missing"]) > 0 else 0)
@@ -0,0 +1,115 @@
+"""shards/merge.py"""
+
+import glob
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from snow_revoke_privileges.tools.shard_manifest import ShardManifest
+
+# Output files of a shard merged in the output directory of the manifest.
+MERGED_FILES: List[str] = ["output-*.sql", "dead-letter-*.sql"]
+
+# Measures of the run reports added up for the totals of the merged report.
+SUMMED_MEASURES: List[str] = ["queries", "statements", "rows", "retries", "errors"]
+
+
+def merge(manifest: ShardManifest, output_directory: Optional[str] = None) -> Dict[str, Any]:  # pylint: disable=unused-variable
+    """
+    The function merges the outputs of the shards in the output directory of the manifest: the SQL files are
+    concatenated shard by shard (each part starting with the ID of its shard), and the run reports are gathered in a
+    single `run-report.json` with their totals.
+
+    Args:
+        manifest (ShardManifest): The manifest of the shards.
+        output_directory (str): The directory of the outputs of the shards (by default the one of the manifest).
+
+    Returns:
+        the merged run report.
+    """
+
+    root: str = output_directory if output_directory is not None else manifest.output_directory
+    directories: Dict[str, str] = {shard.shard_id: manifest.get_shard_directory(shard, root) for shard in manifest.shards}
+
+    os.makedirs(root, exist_ok=True)
+
+    for pattern in MERGED_FILES:
+        filenames: List[str] = sorted({os.path.basename(path) for directory in directories.values() for path in glob.glob(os.path.join(directory, pattern))})
+
+        for filename in filenames:
+            merge_sql_file(os.path.join(root, filename), {shard_id: os.path.join(directory, filename) for shard_id, directory in directories.items()})
+
+    reports: Dict[str, Dict[str, Any]] = {}
+
+    for shard_id, directory in directories.items():
+        path: str = os.path.join(directory, "run-report.json")
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                reports[shard_id] = json.load(file)
+
+    report: Dict[str, Any] = get_report(manifest, reports)
+
+    with open(os.path.join(root, "run-report.json"), "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+    if len(report["missing"]) > 0:
+        logging.getLogger("app").warning("The run report of %s shards is missing: %s.", len(report["missing"]), ", ".join(report["missing"]))
+
+    logging.getLogger("app").info("The outputs of %s shards were merged in the directory '%s'.", len(reports), root)
+
+    return report
+
+
+def merge_sql_file(path: str, parts: Dict[str, str]) -> None:  # pylint: disable=unused-variable
+    """
+    The function concatenates the SQL files of the shards which have one, in the order of the manifest.
+
+    Args:
+        path (str): The path of the merged file.
+        parts (Dict[str, str]): The path of the file of each shard.
+    """
+
+    with open(path, "w", encoding="utf-8") as merged_file:
+
+        for shard_id, part in parts.items():
+
+            if not os.path.exists(part):
+                continue
+
+            with open(part, "r", encoding="utf-8") as file:
+                content: str = file.read()
+
+            merged_file.write(f"-- Shard {shard_id}\n{content.rstrip()}\n\n")
+
+
+def get_report(manifest: ShardManifest, reports: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:  # pylint: disable=unused-variable
+    """
+    The function gathers the run reports of the shards. The duration of the totals is the one of the longest shard
+    (the shards run at the same time), the sum of the durations is given as `shard_duration`.
+    """
+
+    total: Dict[str, Any] = {measure: 0 for measure in SUMMED_MEASURES}
+    total.update({"duration": 0.0, "shard_duration": 0.0, "queries_by_kind": {}})
+
+    for report in reports.values():
+        shard_total: Dict[str, Any] = report.get("total", {})
+
+        for measure in SUMMED_MEASURES:
+            total[measure] += shard_total.get(measure, 0)
+
+        total["duration"] = max(total["duration"], shard_total.get("duration", 0.0))
+        total["shard_duration"] = round(total["shard_duration"] + shard_total.get("duration", 0.0), 3)
+
+        for kind, count in shard_total.get("queries_by_kind", {}).items():
+            total["queries_by_kind"][kind] = total["queries_by_kind"].get(kind, 0) + count
+
+    total["queries_by_kind"] = dict(sorted(total["queries_by_kind"].items()))
+
+    return {
+        "created_on": manifest.created_on,
+        "shards": [{"shard_id": shard.shard_id, "account": shard.account, "report": reports[shard.shard_id]} for shard in manifest.shards if shard.shard_id in reports],
+        "missing": [shard.shard_id for shard in manifest.shards if shard.shard_id not in reports],
+        "total": total,
+    }
@@ -0,0 +1,110 @@
+"""shards/planner.py"""
+
+import logging
+import os
+import re
+from typing import Any, Dict, List
+
+from snow_revoke_privileges.tools.configuration import Configuration, ConfigurationError, load_file
+from snow_revoke_privileges.tools.shard_manifest import Shard, ShardManifest
+
+# Ways of splitting the work of the accounts into shards (see fleet-example.yaml).
+SHARDING_MODES: List[str] = ["account", "database", "schema"]
+
+
+def get_shard_id(*parts: Any) -> str:  # pylint: disable=unused-variable
+    """
+    The function returns the ID of a shard, which is also the name of its output directory.
+    """
+
+    return "-".join(re.sub(r"[^A-Za-z0-9_.]", "_", str(part)) for part in parts)
+
+
+def plan(fleet: str, output_directory: str) -> ShardManifest:  # pylint: disable=unused-variable
+    """
+    The function splits the work of the accounts of the fleet configuration into shards, and checks the settings of
+    each shard before any connection with Snowflake.
+
+    Args:
+        fleet (str): The path of the fleet configuration (see fleet-example.yaml).
+        output_directory (str): The directory containing one output directory per shard.
+
+    Raises:
+        ConfigurationError: if the fleet configuration or the settings of a shard are invalid.
+
+    Returns:
+        the manifest of the shards.
+    """
+
+    content: Dict[str, Any] = load_file(fleet)
+    sharding: Dict[str, Any] = content.get("sharding", {}) or {}
+
+    mode: str = sharding.get("by", "database")
+    buckets: int = sharding.get("schema_buckets", 1)
+
+    if mode not in SHARDING_MODES:
+        raise ConfigurationError(f"The sharding mode must be one of {', '.join(SHARDING_MODES)} (found {mode}).")
+
+    if not isinstance(buckets, int) or isinstance(buckets, bool) or buckets < 1:
+        raise ConfigurationError(f"The number of schema buckets must be an integer greater than or equal to 1 (found {buckets}).")
+
+    shards: List[Shard] = []
+
+    for account in content.get("accounts", []) or []:
+
+        if not isinstance(account, dict) or "name" not in account:
+            raise ConfigurationError("Each account of the fleet configuration must have a name.")
+
+        settings: Dict[str, Any] = {**(content.get("settings", {}) or {}), **(account.get("settings", {}) or {})}
+
+        if mode == "account":
+            shards.append(Shard(get_shard_id(account["name"]), account["name"], settings))
+            continue
+
+        for database in settings.get("databases", []):
+
+            database_settings: Dict[str, Any] = {**settings, "databases": [database]}
+
+            if mode == "database" or buckets == 1:
+                shards.append(Shard(get_shard_id(account["name"], database), account["name"], database_settings))
+                continue
+
+            for bucket in range(buckets):
+                schema_settings: Dict[str, Any] = {**database_settings, "schema_shard": {"bucket": bucket, "buckets": buckets}}
+                shards.append(Shard(get_shard_id(account["name"], database, bucket), account["name"], schema_settings))
+
+    check(content, shards)
+
+    logging.getLogger("app").info("The fleet configuration was split into %s shards (sharding by %s).", len(shards), mode)
+
+    return ShardManifest(os.path.realpath(fleet), os.path.realpath(output_directory), shards)
+
+
+def check(content: Dict[str, Any], shards: List[Shard]) -> None:  # pylint: disable=unused-variable
+    """
+    The function checks that the shards are unique and that their settings match the schema of the settings.
+
+    Raises:
+        ConfigurationError: if a shard is invalid (the errors of each shard are given in the message).
+    """
+
+    if len(shards) == 0:
+        raise ConfigurationError("The fleet configuration does not contain any account or database.")
+
+    shard_ids: List[str] = [shard.shard_id for shard in shards]
+    duplicates: List[str] = sorted({shard_id for shard_id in shard_ids if shard_ids.count(shard_id) > 1})
+
+    if len(duplicates) > 0:
+        raise ConfigurationError(f"The shards {', '.join(duplicates)} are defined several times (the names of the accounts must be unique).")
+
+    credentials: Dict[str, Any] = {account["name"]: account.get("snowflake_credentials") for account in content["accounts"]}
+    errors: List[str] = []
+
+    for shard in shards:
+        try:
+            Configuration({"settings": shard.settings, "snowflake_credentials": credentials[shard.account]}).validate()
+        except ConfigurationError as err:
+            errors.append(f"{shard.shard_id}: {err}")
+
+    if len(errors) > 0:
+        raise ConfigurationError("The shards are invalid:\n" + "\n".join(errors))
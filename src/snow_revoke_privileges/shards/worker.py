@@ -0,0 +1,56 @@
+"""shards/worker.py"""
+
+import logging
+import os
+from typing import List, NamedTuple, Optional
+
+from snow_revoke_privileges.application import Application
+from snow_revoke_privileges.tools.configuration import Configuration
+from snow_revoke_privileges.tools.shard_manifest import Shard, ShardManifest
+
+
+class WorkerOptions(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `WorkerOptions` class contains the options of a worker given on the command line.
+    """
+
+    # Skip the requests recorded as successful in the ledgers of the previous run of each shard, profile each phase.
+    resume: bool = False
+    profile: bool = False
+
+    # Path of the fleet configuration and directory of the outputs of the shards (by default the ones of the manifest).
+    fleet: Optional[str] = None
+    output_directory: Optional[str] = None
+
+
+def run(manifest: ShardManifest, shards: List[Shard], options: Optional[WorkerOptions] = None) -> List[str]:  # pylint: disable=unused-variable
+    """
+    The function processes shards one after the other, each one with its own configuration and output directory. A
+    shard which fails does not stop the next ones.
+
+    Args:
+        manifest (ShardManifest): The manifest of the shards.
+        shards (List[Shard]): The shards processed by this worker.
+        options (WorkerOptions): The options of the worker (see `WorkerOptions`).
+
+    Returns:
+        the IDs of the shards which have failed.
+    """
+
+    options = options if options is not None else WorkerOptions()
+    failed: List[str] = []
+
+    for shard in shards:
+
+        config: Configuration = manifest.get_configuration(shard, options.fleet, options.output_directory)
+        os.makedirs(config.get_output_path(""), exist_ok=True)
+
+        logging.getLogger("app").info("The shard '%s' will be now processed.", shard.shard_id)
+
+        try:
+            Application(resume=options.resume, profile=options.profile, config=config).execute()
+        except Exception:  # pylint: disable=broad-exception-caught
+            logging.getLogger("app").exception("The shard '%s' has failed.", shard.shard_id)
+            failed.append(shard.shard_id)
+
+    return failed
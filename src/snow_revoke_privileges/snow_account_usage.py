@@ -0,0 +1,142 @@
+"""..."""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from snow_revoke_privileges.tools.my_snowflake import MySnowflake
+from snow_revoke_privileges.tools.configuration import Configuration
+
+
+class SnowAccountUsage:  # pylint: disable=unused-variable
+    """
+    The `SnowAccountUsage` class retrieves the objects and the grants with a few SELECT requests on the views
+    of ACCOUNT_USAGE instead of one SHOW request per type of object or per object.
+    """
+
+    settings: Dict[str, Any] = {}
+
+    # Views used to retrieve each type of object.
+    views: Dict[str, Dict[str, str]] = {}
+    schema: str = ""
+
+    # List of schemas that can be ignored.
+    schemas_to_ignore: List[str] = []
+
+    def __init__(self, fetch: Optional[Callable[[str], pd.DataFrame]] = None, schema: Optional[str] = None, config: Optional[Configuration] = None) -> None:
+        """
+        Args:
+            fetch (Callable): The `fetch` parameter is the function used to execute a SELECT request (by default `MySnowflake.fetch_pandas_all`).
+            schema (str): The `schema` parameter is the schema containing the views (by default the one set in application.yaml).
+            config (Configuration): The `config` parameter is the configuration of the run (by default the files are read).
+        """
+
+        self.fetch = fetch if fetch is not None else MySnowflake.fetch_pandas_all
+        self.config = config if config is not None else Configuration()
+        self.__load_configuration()
+
+        if schema is not None:
+            self.schema = schema
+
+    def __load_configuration(self) -> None:
+        """..."""
+
+        config: Configuration = self.config
+
+        self.settings = config.get_user_configuration("settings")
+        self.schemas_to_ignore = config.get_application_configuration("schemas_to_ignore")
+        self.views = config.get_application_configuration("account_usage_views")
+        self.schema = config.get_application_configuration("account_usage_schema")
+
+    def is_supported(self, object_type: str) -> bool:
+        """..."""
+        return object_type in self.views
+
+    def retrieve_objects(self, object_type: str) -> pd.DataFrame:
+        """
+        The function retrieves all the objects of a given type related to the databases selected in the configuration.
+
+        Args:
+            object_type (str): a string representing the type of database object to retrieve (e.g."TABLE", "VIEW"").
+
+        Returns:
+            a pandas DataFrame with the columns DATABASE_NAME, SCHEMA_NAME, OBJECT_NAME, ARGUMENTS, CREATED_ON, LAST_ALTERED and OWNER.
+        """
+
+        view: Dict[str, str] = self.views[object_type]
+
+        columns: List[str] = [
+            f"{view['database']} AS DATABASE_NAME",
+            f"{view.get('schema', 'NULL')} AS SCHEMA_NAME",
+            f"{view.get('name', 'NULL')} AS OBJECT_NAME",
+            f"{view.get('arguments', 'NULL')} AS ARGUMENTS",
+            f"{view.get('created', 'CREATED')} AS CREATED_ON",
+            f"{view.get('last_altered', 'LAST_ALTERED')} AS LAST_ALTERED",
+            f"{view.get('owner', 'NULL')} AS OWNER",
+        ]
+
+        conditions: List[str] = ["DELETED IS NULL", f"{view['database']} IN ({self.__get_databases()})"]
+
+        if "schema" in view and len(self.schemas_to_ignore) > 0:
+            conditions.append(f"{view['schema']} NOT IN ({', '.join(MySnowflake.quote_literal(schema) for schema in self.schemas_to_ignore)})")
+
+        if "filter" in view:
+            conditions.append(view["filter"])
+
+        snow_objects: pd.DataFrame = self.fetch(f"SELECT {', '.join(columns)} FROM {self.schema}.{view['view']} WHERE {' AND '.join(conditions)}")
+        logging.getLogger("app").debug("Found: A total of %s '%s' was found in %s.%s.", len(snow_objects), object_type.upper(), self.schema, view["view"])
+
+        if len(snow_objects) > 0 and "arguments" in view:
+            # The signature contains the name of each argument, whereas the SHOW command only returns their data type.
+            snow_objects["ARGUMENTS"] = [f"{name}{MySnowflake.get_signature(str(arguments), True)}" for name, arguments in zip(snow_objects["OBJECT_NAME"], snow_objects["ARGUMENTS"])]
+
+        return snow_objects
+
+    def retrieve_grants(self) -> pd.DataFrame:
+        """
+        The function retrieves all the current grants related to the databases selected in the configuration.
+
+        Returns:
+            a pandas DataFrame with the columns returned by a SHOW GRANTS command (privilege, granted_on, name, granted_to, grantee_name).
+        """
+
+        databases: str = self.__get_databases()
+
+        columns: List[str] = [
+            "PRIVILEGE AS \"privilege\"",
+            "GRANTED_ON AS \"granted_on\"",
+            "TABLE_CATALOG AS \"database_name\"",
+            "TABLE_SCHEMA AS \"schema_name\"",
+            "NAME AS \"name\"",
+            "GRANTED_TO AS \"granted_to\"",
+            "GRANTEE_NAME AS \"grantee_name\"",
+        ]
+
+        conditions: List[str] = ["DELETED_ON IS NULL", f"(TABLE_CATALOG IN ({databases}) OR (GRANTED_ON = 'DATABASE' AND NAME IN ({databases})))"]
+
+        grants: pd.DataFrame = self.fetch(f"SELECT {', '.join(columns)} FROM {self.schema}.GRANTS_TO_ROLES WHERE {' AND '.join(conditions)}")
+        logging.getLogger("app").debug("Found: A total of %s grants was found in %s.GRANTS_TO_ROLES.", len(grants), self.schema)
+
+        if len(grants) == 0:
+            return pd.DataFrame(columns=["privilege", "granted_on", "name", "granted_to", "grantee_name"])
+
+        grants["name"] = [self.__get_qualified_name(row) for row in grants.itertuples(index=False)]
+
+        return grants.loc[:, ["privilege", "granted_on", "name", "granted_to", "grantee_name"]]
+
+    def __get_qualified_name(self, row: Any) -> str:
+        """..."""
+
+        # The view returns the name of the object alone, the SHOW GRANTS command returns it qualified.
+        if row.granted_on == "DATABASE":
+            return MySnowflake.quote_identifier(str(row.name))
+
+        if row.granted_on == "SCHEMA":
+            return f"{MySnowflake.quote_identifier(str(row.database_name))}.{MySnowflake.quote_identifier(str(row.name))}"
+
+        return f"{MySnowflake.quote_identifier(str(row.database_name))}.{MySnowflake.quote_identifier(str(row.schema_name))}.{MySnowflake.quote_identifier(str(row.name))}"
+
+    def __get_databases(self) -> str:
+        """..."""
+        return ", ".join(MySnowflake.quote_literal(database) for database in self.settings["databases"])
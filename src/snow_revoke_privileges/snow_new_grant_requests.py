@@ -1,6 +1,6 @@
 """..."""
 
-from typing import List
+from typing import List, Optional, Tuple
 import os
 import logging
 
@@ -8,7 +8,11 @@ from pathlib import Path
 import pandas as pd
 
 from snow_revoke_privileges.tools.my_snowflake import MySnowflake
+from snow_revoke_privileges.tools.snowflake_batch_executor import SnowflakeBatchExecutor
 from snow_revoke_privileges.tools.configuration import Configuration
+from snow_revoke_privileges.tools.execution_ledger import ExecutionLedger, RequestResult
+from snow_revoke_privileges.tools.retry_policy import write_dead_letter
+from snow_revoke_privileges.tools.my_dataframe import to_string_column
 
 
 class SnowNewGrantRequest:  # pylint: disable=unused-variable
@@ -17,15 +21,21 @@ class SnowNewGrantRequest:  # pylint: disable=unused-variable
     all_objects: pd.DataFrame
     requests: List[str] = []
 
-    def __init__(self, all_objects: pd.DataFrame) -> None:
-        """..."""
+    def __init__(self, all_objects: pd.DataFrame, config: Optional[Configuration] = None) -> None:
+        """
+        Args:
+            all_objects (pd.DataFrame): The `all_objects` parameter contains the objects found by `SnowObjects`.
+            config (Configuration): The `config` parameter is the configuration of the run (by default the files are read).
+        """
         self.all_objects = all_objects
+        self.config = config if config is not None else Configuration()
+        self.requests = []
         self.__load_configuration()
 
     def __load_configuration(self) -> None:
         """..."""
 
-        config: Configuration = Configuration()
+        config: Configuration = self.config
 
         self.settings = config.get_user_configuration("settings")
         self.snowflake_credentials = config.get_user_configuration("snowflake_credentials")
@@ -33,46 +43,56 @@ class SnowNewGrantRequest:  # pylint: disable=unused-variable
     def prepare(self) -> None:
         """..."""
 
+        if len(self.all_objects) == 0:
+            return
+
         all_objects: List[str] = self.settings["objects"]
+        new_owner: str = f" TO ROLE {self.settings['new_owner']}"
 
-        databases: pd.DataFrame = self.all_objects.loc[self.all_objects["OBJECT_TYPE"] == "DATABASE"]  # noqa: E712 # pylint: disable=singleton-comparison
-        request: str = ""
+        databases: "pd.Series[str]" = to_string_column(self.all_objects.loc[self.all_objects["OBJECT_TYPE"] == "DATABASE", "KEY_OBJECT"])  # noqa: E712 # pylint: disable=singleton-comparison
+        self.requests.extend(("GRANT USAGE ON DATABASE " + databases + new_owner).tolist())
 
-        for _, database in databases.iterrows():  # type: ignore
-            request = f"GRANT USAGE ON DATABASE {database['KEY_OBJECT']} TO ROLE {self.settings['new_owner']}"
-            self.requests.append(request)
+        # Each schema receives the same list of requests, one after the other.
+        templates: List[Tuple[str, str]] = [("GRANT USAGE ON SCHEMA ", new_owner)]
 
-        schemas: pd.DataFrame = self.all_objects.loc[self.all_objects["OBJECT_TYPE"] == "SCHEMA"]  # noqa: E712 # pylint: disable=singleton-comparison
+        for current_object in all_objects:
 
-        for _, schema in schemas.iterrows():  # type: ignore
+            if current_object in ["EXTERNAL FUNCTION", "EXTERNAL TABLE", "DATABASE", "SCHEMA"]:
+                continue
 
-            request = f"GRANT USAGE ON SCHEMA {schema['KEY_OBJECT']} TO ROLE {self.settings['new_owner']}"
-            self.requests.append(request)
+            templates.append((f"GRANT ALL PRIVILEGES ON FUTURE {current_object.upper()}S IN SCHEMA ", new_owner))
+            templates.append((f"GRANT ALL PRIVILEGES ON ALL {current_object.upper()}S IN SCHEMA ", new_owner))
 
-            for current_object in all_objects:
+        schemas: "pd.Series[str]" = to_string_column(self.all_objects.loc[self.all_objects["OBJECT_TYPE"] == "SCHEMA", "KEY_OBJECT"])  # noqa: E712 # pylint: disable=singleton-comparison
+        schemas = schemas.repeat(len(templates)).reset_index(drop=True)
 
-                if current_object in ["EXTERNAL FUNCTION", "EXTERNAL TABLE", "DATABASE", "SCHEMA"]:
-                    continue
+        prefixes: "pd.Series[str]" = pd.Series([prefix for prefix, _ in templates] * (len(schemas) // len(templates)), dtype=object)
+        suffixes: "pd.Series[str]" = pd.Series([suffix for _, suffix in templates] * (len(schemas) // len(templates)), dtype=object)
 
-                request = f"GRANT ALL PRIVILEGES ON FUTURE {current_object.upper()}S IN SCHEMA {schema['KEY_OBJECT']} TO ROLE {self.settings['new_owner']}"
-                self.requests.append(request)
-                request = f"GRANT ALL PRIVILEGES ON ALL {current_object.upper()}S IN SCHEMA {schema['KEY_OBJECT']} TO ROLE {self.settings['new_owner']}"
-                self.requests.append(request)
+        self.requests.extend((prefixes + schemas + suffixes).tolist())
 
-    def execute(self) -> None:
-        """"..."""
+    def execute(self, resume: bool = False) -> List[RequestResult]:
+        """
+        Args:
+            resume (bool): The `resume` parameter indicates if the requests recorded as successful in the ledger of the
+        previous run must be skipped.
 
-        config: Configuration = Configuration()
+        Returns:
+            the results of the requests executed (none with run_dry).
+        """
+
+        config: Configuration = self.config
         filename: str = config.get_output_path("output-grant.sql")
 
         if os.path.exists(filename):
             os.remove(filename)
 
         Path(filename).touch()
+        results: List[RequestResult] = []
 
         if len(self.requests) == 0:
             logging.getLogger("app").info("All GRANT requests were now performed.")
-            return
+            return results
 
         with open(filename, "w", encoding="utf-8") as file:
 
@@ -81,9 +101,20 @@ class SnowNewGrantRequest:  # pylint: disable=unused-variable
 
             if self.settings["run_dry"] is False:
                 logging.getLogger("app").info("A total of %s GRANT requests will be performed.", len(self.requests))
-                MySnowflake.execute_multi_requests(self.requests)
+                ledger: ExecutionLedger = ExecutionLedger(config.get_output_path("ledger-grant.jsonl"), resume)
+
+                try:
+                    with MySnowflake.metrics.phase("execution.grant"):
+                        results = SnowflakeBatchExecutor.execute_multi_requests(self.requests, ledger)
+                finally:
+                    ledger.close()
+
+                write_dead_letter(config.get_output_path("dead-letter-grant.sql"), results)
+
                 logging.getLogger("app").info("All GRANT requests were now performed.")
             else:
                 logging.getLogger("app").warning("No GRANT request will be performed as requested by the user (run_dry=True).")
 
             file.write("\n-- ... Done.")
+
+        return results
@@ -1,16 +1,18 @@
 """..."""
 
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
 import pandas as pd
 
 from progress.bar import Bar  # pyright: ignore
 
 from snow_revoke_privileges.tools.my_snowflake import MySnowflake
 from snow_revoke_privileges.tools.configuration import Configuration
+from snow_revoke_privileges.tools.shard_manifest import get_schema_bucket
+from snow_revoke_privileges.snow_account_usage import SnowAccountUsage
 
 from snow_revoke_privileges.tools.my_dataframe import (
-    concat_dataframe,
+    DataFrameBuilder,
     create_column,
     rename_column,
     keep_columns,
@@ -18,35 +20,69 @@ from snow_revoke_privileges.tools.my_dataframe import (
 )
 
 
+class InventoryRules(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `InventoryRules` class contains the rules of the application configuration applied to the objects found.
+    """
+
+    # List of databases and schemas that can be ignored.
+    databases_to_ignore: List[str]
+    schemas_to_ignore: List[str]
+
+    # List of expected columns.
+    expected_columns: List[str]
+
+    # List of objects whose SHOW command does not support LIMIT ... FROM.
+    objects_without_pagination: List[str]
+
+
+class TargetContainers(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `TargetContainers` class contains the databases and the schemas analyzed, retrieved once per run.
+    """
+
+    # List of databases selected in the configuration which exist in the account.
+    databases: Optional[List[str]] = None
+
+    # Schemas of the target databases returned by SHOW SCHEMAS, selected by the configuration.
+    schemas: Optional[pd.DataFrame] = None
+
+
 class SnowObjects:  # pylint: disable=unused-variable
     """..."""
 
     all_objects: pd.DataFrame
     settings: Dict[str, Any] = {}
-    snowflake_credentials: Dict[str, Any] = {}
+    rules: InventoryRules
 
-    # List of databases and schemas that can be ignored.
-    databases_to_ignore: List[str] = []
-    schemas_to_ignore: List[str] = []
+    # Maximum number of rows returned by a SHOW command without pagination.
+    show_row_limit: int = 10000
 
-    # List of expected columns.
-    expected_columns: List[str] = []
+    targets: TargetContainers = TargetContainers()
 
-    def __init__(self) -> None:
-        """..."""
+    def __init__(self, config: Optional[Configuration] = None) -> None:
+        """
+        Args:
+            config (Configuration): The `config` parameter is the configuration of the run (by default the files are read).
+        """
         self.all_objects = pd.DataFrame([])
+        self.objects_builder = DataFrameBuilder()
+        self.config = config if config is not None else Configuration()
         self.__load_configuration()
+        self.snow_account_usage = SnowAccountUsage(config=self.config)
 
     def __load_configuration(self) -> None:
         """..."""
 
-        config: Configuration = Configuration()
+        config: Configuration = self.config
 
         self.settings = config.get_user_configuration("settings")
-        self.snowflake_credentials = config.get_user_configuration("snowflake_credentials")
-        self.databases_to_ignore = config.get_application_configuration("databases_to_ignore")
-        self.schemas_to_ignore = config.get_application_configuration("schemas_to_ignore")
-        self.expected_columns = config.get_application_configuration("expected_columns")
+        self.rules = InventoryRules(
+            config.get_application_configuration("databases_to_ignore"),
+            config.get_application_configuration("schemas_to_ignore"),
+            config.get_application_configuration("expected_columns"),
+            config.get_application_configuration("objects_without_pagination"),
+        )
 
     def filter(self) -> None:
         """..."""
@@ -64,13 +100,22 @@ class SnowObjects:  # pylint: disable=unused-variable
 
         logging.getLogger("app").info("The Snowflake account will be now analyzed to retrieve all SQL objects.")
 
-        database_objects = self.settings["objects"]
+        requests: List[Tuple[str, str]] = []
 
-        with Bar("Processing", max=len(database_objects)) as progress:
+        for database_object in self.settings["objects"]:
 
-            for database_object in database_objects:
+            if self.settings.get("inventory_mode", "show") == "account_usage" and self.snow_account_usage.is_supported(database_object):
                 self.retrieve_object(database_object)
-                progress.next()
+            else:
+                requests.extend((database_object, request) for request in self.get_requests(database_object))
+
+        self.retrieve_requests(requests)
+
+        self.all_objects = self.objects_builder.build()
+
+        # Nothing may be found, e.g. in a shard whose bucket does not contain any schema.
+        if len(self.all_objects) == 0:
+            self.all_objects = pd.DataFrame(columns=self.rules.expected_columns)
 
     def get_dataframe(self) -> pd.DataFrame:
         """..."""
@@ -87,17 +132,274 @@ class SnowObjects:  # pylint: disable=unused-variable
             a pandas DataFrame containing information about the specified database object.
         """
 
-        snow_objects: pd.DataFrame = MySnowflake.fetch_pandas_all(f"SHOW {object_type}S IN ACCOUNT", )
-        logging.getLogger("app").debug("Found: A total of %s '%s' was found in account.", len(snow_objects), object_type.upper())
+        if self.settings.get("inventory_mode", "show") == "account_usage" and self.snow_account_usage.is_supported(object_type):
+            self.append_objects(self.filter_schema_shard(self.prepare_columns(self.snow_account_usage.retrieve_objects(object_type), object_type)))
+            return
 
-        if len(snow_objects) == 0:
+        self.retrieve_requests([(object_type, request) for request in self.get_requests(object_type)])
+
+    def retrieve_requests(self, requests: List[Tuple[str, str]]) -> None:
+        """
+        The function executes the SHOW commands at the same time and appends the objects found, in the order of the requests.
+
+        Args:
+            requests (List[Tuple[str, str]]): The list of tuples (type of object, SHOW command).
+        """
+
+        results: List[pd.DataFrame] = [pd.DataFrame([])] * len(requests)
+        totals: Dict[str, int] = {}
+
+        with Bar("Processing", max=len(requests)) as progress:
+
+            for position, total, snow_objects in MySnowflake.imap_unordered(self.retrieve_request, list(enumerate(requests))):
+
+                object_type: str = requests[position][0]
+                totals[object_type] = totals.get(object_type, 0) + total
+                results[position] = snow_objects
+
+                progress.next()
+
+        for object_type, total in totals.items():
+            logging.getLogger("app").debug("Found: A total of %s '%s' was found in the scope.", total, object_type.upper())
+
+        for snow_objects in results:
+            self.append_objects(snow_objects)
+
+    def retrieve_request(self, positioned_request: Tuple[int, Tuple[str, str]]) -> Tuple[int, int, pd.DataFrame]:
+        """
+        The function executes one SHOW command and prepares the objects found.
+
+        Args:
+            positioned_request (Tuple[int, Tuple[str, str]]): The position of the request and the tuple (type of object, SHOW command).
+
+        Returns:
+            a tuple with the position of the request, the number of rows returned and the objects prepared.
+        """
+
+        position, (object_type, request) = positioned_request
+
+        total: int = 0
+        builder: DataFrameBuilder = DataFrameBuilder()
+
+        for snow_objects in self.fetch_objects(request, object_type):
+            total += len(snow_objects)
+            builder.append(self.prepare_objects(snow_objects, object_type))
+
+        return (position, total, builder.build())
+
+    def get_requests(self, object_type: str) -> List[str]:
+        """
+        The function prepares the SHOW commands retrieving a type of object, scoped to the databases (and schemas)
+        selected in the configuration when `scope_pushdown` is enabled.
+
+        Args:
+            object_type (str): a string representing the type of database object to retrieve (e.g."TABLE", "VIEW"").
+
+        Returns:
+            a list of SHOW commands.
+        """
+
+        if self.settings.get("scope_pushdown", True) is False or object_type == "DATABASE":
+            return [f"SHOW {object_type}S IN ACCOUNT"]
+
+        databases: List[str] = self.get_target_databases()
+        schemas: List[str] = self.settings.get("schemas", [])
+        pattern: Optional[str] = self.settings.get("object_name_pattern")
+
+        like: str = f" LIKE {MySnowflake.quote_literal(pattern)}" if pattern is not None and object_type != "SCHEMA" else ""
+
+        if object_type == "SCHEMA" or len(schemas) == 0:
+            return [f"SHOW {object_type}S{like} IN DATABASE {MySnowflake.quote_identifier(database)}" for database in databases]
+
+        # Like in `iterate_schemas`, only the schemas which exist are listed, since a SHOW command in a schema which does
+        # not exist fails. The schemas dispatched to another shard are not listed at all.
+        target_schemas: pd.DataFrame = self.get_target_schemas()
+
+        return [self.get_schema_request(object_type, str(database), str(schema)) for database, schema in zip(target_schemas["DATABASE_NAME"], target_schemas["SCHEMA_NAME"])]
+
+    def get_schema_request(self, object_type: str, database: str, schema: str) -> str:
+        """
+        The function prepares the SHOW command retrieving a type of object in one schema.
+        """
+
+        pattern: Optional[str] = self.settings.get("object_name_pattern")
+        like: str = f" LIKE {MySnowflake.quote_literal(pattern)}" if pattern is not None else ""
+
+        return f"SHOW {object_type}S{like} IN SCHEMA {MySnowflake.quote_identifier(database)}.{MySnowflake.quote_identifier(schema)}"
+
+    def iterate_schemas(self) -> Iterator[pd.DataFrame]:
+        """
+        The function retrieves the objects schema by schema instead of type by type, and yields the objects of each
+        database and of each schema as soon as all their SHOW commands have completed (see `SnowPipeline`). The objects
+        yielded are not kept.
+
+        Returns:
+            an iterator on pandas DataFrames, each one containing a database or the objects of a schema (with the schema).
+        """
+
+        object_types: List[str] = self.settings["objects"]
+
+        if "DATABASE" in object_types:
+            databases: pd.DataFrame = self.retrieve_containers("DATABASE")
+
+            for position in range(len(databases)):
+                yield databases.iloc[[position]]
+
+        schemas: pd.DataFrame = self.get_target_schemas()
+        contained_types: List[str] = [object_type for object_type in object_types if object_type not in ("DATABASE", "SCHEMA")]
+
+        # The requests are ordered by schema then by type, so that the position of a request identifies both. The
+        # schemas dispatched to another shard were already left out by `prepare_objects`, so they are not listed.
+        requests: List[Tuple[str, str]] = [
+            (object_type, self.get_schema_request(object_type, str(database), str(schema)))
+            for database, schema in zip(schemas["DATABASE_NAME"], schemas["SCHEMA_NAME"])
+            for object_type in contained_types
+        ]
+
+        if len(contained_types) == 0:
+            yield from (schemas.iloc[[position]] for position in range(len(schemas) if "SCHEMA" in object_types else 0))
             return
 
+        # The objects of a schema are kept in the order of the types, whatever the order of completion.
+        remaining: List[int] = [len(contained_types)] * len(schemas)
+        parts: List[List[pd.DataFrame]] = [[schemas.iloc[[position]] if "SCHEMA" in object_types else pd.DataFrame([])] + [pd.DataFrame([])] * len(contained_types) for position in range(len(schemas))]
+
+        for request_position, _, snow_objects in MySnowflake.imap_unordered(self.retrieve_request, list(enumerate(requests))):
+
+            position, slot = divmod(request_position, len(contained_types))
+            parts[position][1 + slot] = snow_objects
+            remaining[position] -= 1
+
+            if remaining[position] == 0:
+                schema_objects: pd.DataFrame = self.__build_schema(parts[position])
+                parts[position] = []
+
+                if len(schema_objects) > 0:
+                    yield schema_objects
+
+    @staticmethod
+    def __build_schema(parts: List[pd.DataFrame]) -> pd.DataFrame:
+        """..."""
+
+        builder: DataFrameBuilder = DataFrameBuilder()
+
+        for part in parts:
+            builder.append(part)
+
+        return builder.build()
+
+    def retrieve_containers(self, object_type: str) -> pd.DataFrame:
+        """
+        The function retrieves the databases or the schemas of the databases selected in the configuration.
+        """
+
+        builder: DataFrameBuilder = DataFrameBuilder()
+
+        for _, _, snow_objects in MySnowflake.imap_unordered(self.retrieve_request, list(enumerate((object_type, request) for request in self.get_requests(object_type)))):
+            builder.append(snow_objects)
+
+        containers: pd.DataFrame = builder.build()
+
+        if len(containers) == 0:
+            return pd.DataFrame(columns=["DATABASE_NAME", "SCHEMA_NAME"])
+
+        return containers.loc[containers["DATABASE_NAME"].isin(self.get_target_databases())].reset_index(drop=True)  # type: ignore
+
+    def get_target_databases(self) -> List[str]:
+        """
+        The function returns the databases selected in the configuration which exist in the account.
+        """
+
+        databases: Optional[List[str]] = self.targets.databases
+
+        if databases is None:
+
+            existing_databases: pd.DataFrame = MySnowflake.fetch_pandas_all("SHOW DATABASES")
+            existing_names: List[str] = [str(name) for name in existing_databases.get("name", [])]  # pyright: ignore
+
+            databases = [database for database in self.settings["databases"] if database in existing_names and database not in self.rules.databases_to_ignore]
+            self.targets = self.targets._replace(databases=databases)
+
+        return databases
+
+    def get_target_schemas(self) -> pd.DataFrame:
+        """
+        The function returns the schemas of the target databases which exist in the account and are selected in the
+        configuration (see `retrieve_containers`).
+        """
+
+        schemas: Optional[pd.DataFrame] = self.targets.schemas
+
+        if schemas is None:
+            schemas = self.retrieve_containers("SCHEMA")
+            self.targets = self.targets._replace(schemas=schemas)
+
+        return schemas
+
+    def fetch_objects(self, request: str, object_type: str) -> Iterator[pd.DataFrame]:
+        """
+        The function runs a SHOW command and yields its rows chunk by chunk, page by page when the type of object
+        supports the pagination.
+
+        Args:
+            request (str): The SHOW command to be executed.
+            object_type (str): a string representing the type of database object to retrieve (e.g."TABLE", "VIEW"").
+        """
+
+        page_size: int = self.settings.get("show_page_size", 10000)
+
+        if page_size > 0 and object_type not in self.rules.objects_without_pagination and self.is_paginable(request, object_type):
+            return MySnowflake.fetch_pandas_pages(request, page_size)
+
+        return self.fetch_unpaged_objects(request)
+
+    @staticmethod
+    def is_paginable(request: str, object_type: str) -> bool:
+        """
+        The function indicates if a SHOW command can be fetched page by page. `LIMIT ... FROM '<name>'` only compares
+        the names whereas the rows are sorted by database, schema and name, so the names must be unique in the scope
+        of the command: the databases of the account, the schemas of a database or the objects of a schema.
+        """
+
+        if object_type == "DATABASE":
+            return True
+
+        if object_type == "SCHEMA":
+            return " IN DATABASE " in request
+
+        return " IN SCHEMA " in request
+
+    def fetch_unpaged_objects(self, request: str) -> Iterator[pd.DataFrame]:
+        """
+        The function runs a SHOW command without pagination, and warns when its output may have been truncated.
+        """
+
+        rows: int = 0
+
+        for chunk in MySnowflake.fetch_pandas_chunks(request):
+            rows += len(chunk)
+            yield chunk
+
+        if rows >= self.show_row_limit:
+            logging.getLogger("app").warning("The output of '%s' reaches %s rows and may be truncated, the setting 'schemas' restricts the SHOW commands to some schemas.", request, rows)
+
+    def prepare_objects(self, snow_objects: pd.DataFrame, object_type: str) -> pd.DataFrame:
+        """
+        The function keeps the relevant objects returned by a SHOW command and prepares their columns.
+
+        Args:
+            snow_objects (pd.DataFrame): A pandas DataFrame containing the rows returned by the SHOW command.
+            object_type (str): The type of Snowflake object, such as "TABLE" or "VIEW".
+        """
+
         if object_type == "DATABASE":
             snow_objects = snow_objects.loc[snow_objects["kind"] == "STANDARD"]
             rename_column(snow_objects, {"name": "DATABASE_NAME"})
         elif object_type == "SCHEMA":
             rename_column(snow_objects, {"database_name": "DATABASE_NAME", "name": "SCHEMA_NAME"})
+
+            if len(self.settings.get("schemas", [])) > 0:
+                snow_objects = snow_objects.loc[snow_objects["SCHEMA_NAME"].isin(self.settings["schemas"])]  # type: ignore
         elif object_type in ("PROCEDURE", "FUNCTION"):
             snow_objects = snow_objects.loc[(snow_objects.loc[:, "is_builtin"] == "N")]  # type: ignore
             rename_column(snow_objects, {"arguments": "ARGUMENTS", "catalog_name": "DATABASE_NAME", "schema_name": "SCHEMA_NAME", "name": "OBJECT_NAME"})
@@ -105,9 +407,46 @@ class SnowObjects:  # pylint: disable=unused-variable
             rename_column(snow_objects, {"database_name": "DATABASE_NAME", "schema_name": "SCHEMA_NAME", "name": "OBJECT_NAME"})
 
         snow_objects = self.prepare_columns(snow_objects, object_type)  # type: ignore
-        snow_objects = snow_objects.loc[(~snow_objects.loc[:, "DATABASE_NAME"].isin(self.databases_to_ignore)) & (~snow_objects.loc[:, "SCHEMA_NAME"].isin(self.schemas_to_ignore))]  # type: ignore
 
-        self.append_objects(snow_objects)
+        if len(snow_objects) == 0:
+            return snow_objects
+
+        ignored: "pd.Series[bool]" = snow_objects.loc[:, "DATABASE_NAME"].isin(self.rules.databases_to_ignore) | snow_objects.loc[:, "SCHEMA_NAME"].isin(self.rules.schemas_to_ignore)
+        snow_objects = snow_objects.loc[~ignored]  # type: ignore
+
+        return self.filter_schema_shard(snow_objects)
+
+    def filter_schema_shard(self, snow_objects: pd.DataFrame) -> pd.DataFrame:
+        """
+        The function keeps the objects of the schemas dispatched to the bucket of the run when the schemas of a database
+        are split between several shards (`schema_shard`, see `ShardManifest`). The databases are kept by the first
+        bucket only, so that their grants are handled once.
+        """
+
+        if self.settings.get("schema_shard") is None or len(snow_objects) == 0:
+            return snow_objects
+
+        kept: List[bool] = [
+            self.is_in_schema_shard(str(database), str(schema), str(object_type))
+            for database, schema, object_type in zip(snow_objects["DATABASE_NAME"], snow_objects["SCHEMA_NAME"], snow_objects["OBJECT_TYPE"])
+        ]
+
+        return snow_objects.loc[kept]
+
+    def is_in_schema_shard(self, database: str, schema: str, object_type: str = "SCHEMA") -> bool:
+        """
+        The function indicates if a schema (or an object of the schema) is dispatched to the bucket of the run. Without
+        `schema_shard`, all the schemas are. The databases belong to the first bucket.
+        """
+
+        schema_shard: Optional[Dict[str, int]] = self.settings.get("schema_shard")
+
+        if schema_shard is None:
+            return True
+
+        bucket: int = 0 if object_type == "DATABASE" else get_schema_bucket(database, schema, schema_shard["buckets"])
+
+        return bucket == schema_shard["bucket"]
 
     def prepare_columns(self, snow_objects: pd.DataFrame, object_type: str) -> pd.DataFrame:
         """
@@ -118,14 +457,24 @@ class SnowObjects:  # pylint: disable=unused-variable
             object_type (str): The type of Snowflake object to create a column for, such as "TABLE" or "VIEW".
         """
 
-        create_column(snow_objects, {"ARGUMENTS": None, "OBJECT_TYPE": object_type, "OBJECT_NAME": None, "SCHEMA_NAME": None})
+        if len(snow_objects) == 0:
+            return snow_objects
+
+        # The dates are kept as watermarks for the incremental runs (see `SnowSnapshot`), and the owner (with its type,
+        # ROLE or DATABASE_ROLE) to avoid retrieving the grants of the objects whose ownership is already known (see
+        # `SnowPrivileges`).
+        rename_column(snow_objects, {"created_on": "CREATED_ON", "last_altered": "LAST_ALTERED", "owner": "OWNER", "owner_role_type": "OWNER_ROLE_TYPE"})
+
+        create_column(
+            snow_objects,
+            {"ARGUMENTS": None, "OBJECT_TYPE": object_type, "OBJECT_NAME": None, "SCHEMA_NAME": None, "CREATED_ON": None, "LAST_ALTERED": None, "OWNER": None, "OWNER_ROLE_TYPE": None},
+        )
         concat_column(snow_objects, "KEY_OBJECT", ["DATABASE_NAME", "SCHEMA_NAME", "OBJECT_NAME"], ".", "\"")
-        snow_objects = keep_columns(snow_objects, self.expected_columns)
+        snow_objects = keep_columns(snow_objects, self.rules.expected_columns)
 
         return snow_objects
 
     def append_objects(self, snow_objects: pd.DataFrame) -> None:
         """..."""
 
-        if len(snow_objects) > 0:
-            self.all_objects = concat_dataframe([self.all_objects, snow_objects])
+        self.objects_builder.append(snow_objects)
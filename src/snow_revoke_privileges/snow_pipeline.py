@@ -0,0 +1,266 @@
+"""..."""
+
+import logging
+import threading
+import time
+from queue import Empty, Full, Queue
+from typing import IO, Any, Dict, Iterator, List, NamedTuple, Optional
+
+import pandas as pd
+
+from snow_revoke_privileges.tools.snowflake_batch_executor import SnowflakeBatchExecutor
+from snow_revoke_privileges.tools.configuration import Configuration
+from snow_revoke_privileges.tools.execution_ledger import FAILED, ExecutionLedger, RequestResult
+from snow_revoke_privileges.tools.retry_policy import write_dead_letter
+from snow_revoke_privileges.tools.wave_scheduler import GRANT, OWNERSHIP, REVOKE, WaveScheduler
+from snow_revoke_privileges.snow_objects import SnowObjects
+from snow_revoke_privileges.snow_privileges import SnowPrivileges
+from snow_revoke_privileges.snow_revoke_requests import SnowRevokeRequests
+from snow_revoke_privileges.snow_new_grant_requests import SnowNewGrantRequest
+
+
+class PlannedSchema(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `PlannedSchema` class contains the requests prepared for a database or a schema, in their order of execution.
+    """
+
+    key: str
+    revoke_requests: List[str]
+    ownership_requests: List[str]
+    grant_requests: List[str]
+
+
+class SnowPipeline:  # pylint: disable=unused-variable
+    """
+    The `SnowPipeline` class streams a run schema by schema instead of phase by phase: a producer thread retrieves the
+    objects of a schema, their grants and prepares their requests, then puts them in a bounded queue consumed by the
+    executor. The first requests are executed long before the whole account is analyzed, and only the schemas waiting
+    in the queue are held in memory.
+    """
+
+    settings: Dict[str, Any] = {}
+
+    # Maximum number of schemas prepared in advance of the execution.
+    queue_size: int = 16
+
+    planned_schemas: "Queue[Optional[PlannedSchema]]"
+
+    # Error raised by the producer, raised again by the executor.
+    error: Optional[BaseException] = None
+
+    def __init__(self, config: Optional[Configuration] = None) -> None:
+        """
+        Args:
+            config (Configuration): The `config` parameter is the configuration of the run (by default the files are read).
+        """
+
+        self.config = config if config is not None else Configuration()
+        self.settings = self.config.get_user_configuration("settings")
+        self.queue_size = max(1, self.settings.get("pipeline_queue_size", 16))
+        self.planned_schemas = Queue(maxsize=self.queue_size)
+        self.stopped = threading.Event()
+        self.error = None
+
+    @staticmethod
+    def is_supported(settings: Dict[str, Any]) -> bool:
+        """
+        The function indicates if the settings allow to stream the run: the objects and their grants must be retrieved
+        with SHOW commands object by object, and the incremental mode needs the whole inventory.
+        """
+
+        return settings.get("inventory_mode", "show") == "show" and settings.get("discovery_mode", "object") == "object" and settings.get("incremental", False) is not True
+
+    def execute(self, resume: bool = False) -> None:
+        """
+        The function starts the producer and executes the requests as soon as they are prepared. The requests of a
+        schema keep their order: REVOKE, then GRANT OWNERSHIP, then GRANT.
+
+        Args:
+            resume (bool): The `resume` parameter indicates if the requests recorded as successful in the ledger of the
+        previous run must be skipped.
+        """
+
+        logging.getLogger("app").info("The Snowflake account will be now analyzed and updated schema by schema (pipeline_mode=True).")
+
+        config: Configuration = self.config
+        run_dry: bool = self.settings["run_dry"] is not False
+        ledger: Optional[ExecutionLedger] = None if run_dry else ExecutionLedger(config.get_output_path("ledger-pipeline.jsonl"), resume)
+
+        producer: threading.Thread = threading.Thread(target=self.produce, name="snow-pipeline", daemon=True)
+        failed: List[RequestResult] = []
+        start: float = time.perf_counter()
+        first_change: Optional[float] = None
+
+        with open(config.get_output_path("output-pipeline.sql"), "w", encoding="utf-8") as file:
+
+            file.write("-- Ready ...\n")
+            producer.start()
+
+            try:
+                for planned_schemas in self.iterate_planned_schemas():
+
+                    steps: List[List[str]] = self.get_ordered_requests(planned_schemas)
+
+                    for requests in steps:
+                        self.write_requests(file, requests)
+
+                    if ledger is not None and any(len(requests) > 0 for requests in steps):
+                        failed.extend(result for result in self.execute_steps(steps, ledger) if result.status == FAILED)
+                        first_change = first_change if first_change is not None else time.perf_counter() - start
+
+            finally:
+                self.stop()
+
+                if ledger is not None:
+                    ledger.close()
+
+            file.write("\n-- ... Done.")
+
+        producer.join()
+
+        if self.error is not None:
+            raise self.error
+
+        self.log_summary(run_dry, first_change, time.perf_counter() - start)
+
+        if ledger is not None:
+            write_dead_letter(config.get_output_path("dead-letter-pipeline.sql"), failed)
+
+    def produce(self) -> None:
+        """
+        The function retrieves and prepares the schemas one after the other, and puts them in the queue (it waits while
+        the queue is full). A `None` value marks the end of the schemas.
+        """
+
+        try:
+            for schema_objects in SnowObjects(self.config).iterate_schemas():
+
+                if self.stopped.is_set():
+                    return
+
+                self.put(self.plan(schema_objects))
+
+        except BaseException as err:  # pylint: disable=broad-exception-caught
+            self.error = err
+
+        finally:
+            self.put(None)
+
+    def plan(self, schema_objects: pd.DataFrame) -> PlannedSchema:
+        """
+        The function retrieves the grants of the objects of a database or of a schema and prepares their requests.
+
+        Args:
+            schema_objects (pd.DataFrame): A pandas DataFrame containing a database, or a schema with its objects.
+
+        Returns:
+            the requests prepared for the database or the schema.
+        """
+
+        snow_privileges: SnowPrivileges = SnowPrivileges(schema_objects, True, self.config)
+        snow_privileges.prepare_future_false()
+        snow_privileges.prepare_future_true()
+
+        snow_revoke_requests: SnowRevokeRequests = SnowRevokeRequests(snow_privileges.get_dataframe(), schema_objects, True, self.config)
+        snow_revoke_requests.prepare()
+
+        snow_new_grant_requests: SnowNewGrantRequest = SnowNewGrantRequest(schema_objects, self.config)
+        snow_new_grant_requests.prepare()
+
+        key: str = str(schema_objects["KEY_OBJECT"].iloc[0])
+        logging.getLogger("app").debug("The requests of %s were prepared.", key)
+
+        return PlannedSchema(key, snow_revoke_requests.grant_requests, snow_revoke_requests.ownership_requests, snow_new_grant_requests.requests)
+
+    def put(self, planned_schema: Optional[PlannedSchema]) -> None:
+        """..."""
+
+        while not self.stopped.is_set():
+            try:
+                self.planned_schemas.put(planned_schema, timeout=1)
+                return
+            except Full:
+                continue
+
+    def stop(self) -> None:
+        """
+        The function stops the producer, and empties the queue in case the producer is waiting for a free place.
+        """
+
+        self.stopped.set()
+
+        while True:
+            try:
+                self.planned_schemas.get_nowait()
+            except Empty:
+                return
+
+    def iterate_planned_schemas(self) -> Iterator[List[PlannedSchema]]:
+        """
+        The function yields the schemas prepared, grouped with the ones already waiting in the queue so that their
+        requests are executed at the same time.
+        """
+
+        while True:
+
+            planned_schema: Optional[PlannedSchema] = self.planned_schemas.get()
+            planned_schemas: List[PlannedSchema] = []
+
+            while planned_schema is not None:
+                planned_schemas.append(planned_schema)
+
+                try:
+                    planned_schema = self.planned_schemas.get_nowait()
+                except Empty:
+                    break
+
+            if len(planned_schemas) > 0:
+                yield planned_schemas
+
+            if planned_schema is None:
+                return
+
+    def get_ordered_requests(self, planned_schemas: List[PlannedSchema]) -> List[List[str]]:
+        """
+        The function returns the requests of several schemas in three steps (REVOKE, GRANT OWNERSHIP and GRANT): each
+        step is executed once the previous one has completed.
+        """
+
+        return [
+            [request for planned_schema in planned_schemas for request in planned_schema.revoke_requests],
+            [request for planned_schema in planned_schemas for request in planned_schema.ownership_requests],
+            [request for planned_schema in planned_schemas for request in planned_schema.grant_requests],
+        ]
+
+    def execute_steps(self, steps: List[List[str]], ledger: ExecutionLedger) -> List[RequestResult]:
+        """
+        The function executes the three steps one after the other, or as a dependency graph when `execution_order` is
+        set to `waves` (see `WaveScheduler`).
+        """
+
+        if self.settings.get("execution_order", "phases") == "waves":
+            scheduler: WaveScheduler = WaveScheduler()
+
+            for requests, phase in zip(steps, (REVOKE, OWNERSHIP, GRANT)):
+                scheduler.add(requests, phase)
+
+            return scheduler.execute(ledger)
+
+        return [result for requests in steps if len(requests) > 0 for result in SnowflakeBatchExecutor.execute_multi_requests(requests, ledger)]
+
+    def write_requests(self, file: IO[str], requests: List[str]) -> None:
+        """..."""
+
+        if len(requests) > 0:
+            file.write("".join(request + ";\n" for request in requests))
+            file.flush()
+
+    def log_summary(self, run_dry: bool, first_change: Optional[float], duration: float) -> None:
+        """..."""
+
+        if run_dry:
+            logging.getLogger("app").warning("No request was performed as requested by the user (run_dry=True).")
+        elif first_change is not None:
+            logging.getLogger("app").info("The first requests were performed after %.1f s, and all of them after %.1f s.", first_change, duration)
+
+        logging.getLogger("app").info("The SQL requests generated will be availaible in the file 'output-pipeline.sql'.")
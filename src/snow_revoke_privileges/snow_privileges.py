@@ -1,23 +1,41 @@
 """..."""
 
+import functools
 import logging
-from typing import Any, Dict, Optional
-
-from multiprocessing import Pool
+import sys
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 from progress.bar import Bar  # pyright: ignore
 import pandas as pd
 
 from snow_revoke_privileges.tools.my_snowflake import MySnowflake
 from snow_revoke_privileges.tools.configuration import Configuration
+from snow_revoke_privileges.snow_account_usage import SnowAccountUsage
 
 from snow_revoke_privileges.tools.my_dataframe import (
+    CompactFrameBuilder,
     concat_dataframe,
     create_column,
     drop_columns,
     rename_column,
+    to_string_column,
 )
 
+# Grant of an object (GRANTED_ON, GRANTED_TO, GRANTEE_NAME, OWNERSHIP).
+GrantRow = Tuple[Any, Any, Any, bool]
+
+
+class GrantTask(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `GrantTask` class describes the retrieval of the grants of an object. The threads of the pool receive these
+    small immutable records, in chunks, instead of the rows of `all_objects`.
+    """
+
+    request: str
+    object_name: str
+    object_type: str
+    arguments: str
+
 
 class SnowPrivileges:  # pylint: disable=unused-variable
     """..."""
@@ -26,145 +44,426 @@ class SnowPrivileges:  # pylint: disable=unused-variable
     all_privileges: pd.DataFrame
 
     settings: Dict[str, Any] = {}
-    progress: Optional[Bar] = None
 
-    def __init__(self, all_objects: pd.DataFrame) -> None:
-        """..."""
+    # Hide the progress bars (e.g. when the privileges are retrieved schema by schema by `SnowPipeline`).
+    quiet: bool = False
+
+    # List of object types sharing the namespace of the tables.
+    table_namespace: List[str] = []
+
+    # Columns of the privileges, stored as codes of a symbol table shared by the string columns (see `CompactFrameBuilder`).
+    string_columns: List[str] = ["GRANTED_ON", "GRANTED_TO", "GRANTEE_NAME", "KEY_OBJECT", "OBJECT_TYPE", "ARGUMENTS"]
+    bool_columns: List[str] = ["OWNERSHIP", "FUTURE"]
+    columns: List[str] = ["GRANTED_ON", "GRANTED_TO", "GRANTEE_NAME", "OWNERSHIP", "KEY_OBJECT", "OBJECT_TYPE", "ARGUMENTS", "FUTURE"]
+
+    def __init__(self, all_objects: pd.DataFrame, quiet: bool = False, config: Optional[Configuration] = None) -> None:
+        """
+        Args:
+            all_objects (pd.DataFrame): The `all_objects` parameter contains the objects found by `SnowObjects`.
+            quiet (bool): The `quiet` parameter indicates if the progress bars must be hidden.
+            config (Configuration): The `config` parameter is the configuration of the run (by default the files are read).
+        """
         self.all_objects = all_objects
+        self.config = config if config is not None else Configuration()
+        self.quiet = quiet
         self.all_privileges = pd.DataFrame([])
+        self.privileges_builder = CompactFrameBuilder(self.string_columns, self.bool_columns)
         self.__load_configuration()
 
     def prepare(self) -> None:
         """..."""
 
         logging.getLogger("app").info("The SQL objects concerned by 'GRANT' and 'OWNERSHIP' will be extracted from Snowflake.")
-        self.prepare_future_false()
 
-        logging.getLogger("app").info("The SQL objects (database & schemas) concerned by 'GRANT ON FUTURE' will be extracted from Snowflake.")
-        self.prepare_future_true()
+        with MySnowflake.metrics.phase("privileges.current"):
+            self.prepare_future_false()
+
+        with MySnowflake.metrics.phase("privileges.future"):
+            self.prepare_future_true()
+
+        self.all_privileges = self.__build_privileges()
 
     def prepare_future_false(self) -> None:
         """..."""
 
-        self.progress = Bar("Processing", max=len(self.all_objects))
+        if self.settings.get("inventory_mode", "show") == "account_usage":
+            self.prepare_by_account_usage()
+            return
 
-        with Pool(processes=8) as pool:
-            for privileges in pool.imap_unordered(self.prepare_future_false_task, self.all_objects.iterrows()):  # pyright: ignore
+        if self.settings.get("discovery_mode", "object") == "role":
+            self.prepare_by_role()
+            return
 
-                if privileges is not None:
-                    self.all_privileges = concat_dataframe([self.all_privileges, privileges])
+        self.__retrieve_grants(self.get_tasks(self.prefilter_objects(), False), False)
 
-                self.progress.next()
+    def prefilter_objects(self) -> pd.DataFrame:
+        """
+        The function decides from the owner found by `SnowObjects`, without any request, which objects need their
+        grants to be retrieved one by one:
+        with `owner_prefilter`, the objects owned by another role than `new_owner` are transferred with REVOKE CURRENT
+        GRANTS, which also revokes their other privileges, so only their ownership is needed and it is built from the
+        inventory. The grants of the databases, of the schemas, of the objects already owned by `new_owner` (other roles
+        may have privileges on them) and of the objects whose owner is unknown are always retrieved.
 
-        self.progress.finish()
+        Returns:
+            a pandas DataFrame containing the objects whose grants must be retrieved.
+        """
 
-    def prepare_future_false_task(self, row: Any) -> Optional[pd.DataFrame]:
-        """..."""
+        if self.settings.get("owner_prefilter", False) is not True or len(self.all_objects) == 0 or "OWNER" not in self.all_objects:
+            return self.all_objects
+
+        owners: "pd.Series[str]" = to_string_column(self.all_objects["OWNER"].fillna(""))
+        known: "pd.Series[bool]" = (owners != "") & ~self.all_objects["OBJECT_TYPE"].isin(["DATABASE", "SCHEMA"])  # type: ignore
+
+        owned: "pd.Series[bool]" = known & (owners == self.settings["new_owner"])
+        transferred: "pd.Series[bool]" = known & ~owned
+
+        if transferred.any():
+            self.privileges_builder.append(self.get_inventory_ownerships(self.all_objects.loc[transferred]))
+
+        logging.getLogger("app").info(
+            "A total of %s objects is already owned by %s and %s objects will be transferred without retrieving their grants.",
+            int(owned.sum()),
+            self.settings["new_owner"],
+            int(transferred.sum()),
+        )
+
+        return self.all_objects.loc[~transferred]
+
+    def get_inventory_ownerships(self, snow_objects: pd.DataFrame) -> pd.DataFrame:
+        """
+        The function builds the ownerships of objects from their owner, with the same columns as the ones built from
+        the SHOW GRANTS commands (the type of the owner is ROLE or DATABASE_ROLE, like `granted_to`).
+        """
+
+        object_types: "pd.Series[str]" = to_string_column(snow_objects["OBJECT_TYPE"])
+        owner_role_types: "pd.Series[str]" = to_string_column(snow_objects["OWNER_ROLE_TYPE"].fillna("ROLE")) if "OWNER_ROLE_TYPE" in snow_objects else pd.Series("ROLE", index=snow_objects.index)
+
+        return pd.DataFrame(
+            {
+                "GRANTED_ON": object_types.str.replace(" ", "_", regex=False),
+                "GRANTED_TO": owner_role_types,
+                "GRANTEE_NAME": to_string_column(snow_objects["OWNER"]),
+                "OWNERSHIP": True,
+                "KEY_OBJECT": to_string_column(snow_objects["KEY_OBJECT"]),
+                "OBJECT_TYPE": object_types,
+                "ARGUMENTS": [MySnowflake.get_arguments(str(arguments)) for arguments in snow_objects["ARGUMENTS"]],
+                "FUTURE": False,
+            }
+        ).reset_index(drop=True)
+
+    @staticmethod
+    def get_current_grants(privileges: pd.DataFrame, new_owner: str) -> List[GrantRow]:
+        """
+        The function returns the current grants of an object, except its ownership by `new_owner`, without creating a
+        pandas DataFrame for each object.
+        """
+
+        if len(privileges) == 0:
+            return []
 
-        current_object: pd.Series[Any] = row[1]  # pylint: disable=unsubscriptable-object
+        rows: Dict[GrantRow, None] = {}
 
-        object_type: str = str(current_object.get(key="OBJECT_TYPE"))
-        object_name: str = str(current_object.get(key="KEY_OBJECT"))
-        arguments: str = str(current_object.get(key="ARGUMENTS"))
+        columns: List[List[Any]] = [privileges[column].tolist() for column in ("privilege", "granted_on", "granted_to", "grantee_name")]
 
-        arguments = MySnowflake.get_arguments(arguments)
+        for privilege, granted_on, granted_to, grantee_name in zip(*columns):
 
-        privileges: pd.DataFrame = self.__request_retrieve_grants(object_type, object_name, False, arguments)
-        privileges["OWNERSHIP"] = privileges["privilege"] == "OWNERSHIP"
+            ownership: bool = privilege == "OWNERSHIP"
+
+            if not (ownership and grantee_name == new_owner):
+                rows[(granted_on, granted_to, grantee_name, ownership)] = None
+
+        return list(rows)
+
+    def prepare_by_role(self) -> None:
+        """
+        The function retrieves the grants with one SHOW GRANTS TO request per grantee (role, database role and share)
+        instead of one SHOW GRANTS ON request per object, then keeps only the grants related to the objects found.
+        """
+
+        requests: List[str] = self.__request_retrieve_grantees()
+        all_grants: List[pd.DataFrame] = []
+
+        logging.getLogger("app").debug("A total of %s grantees will be analyzed.", len(requests))
+
+        progress: Bar = self.__create_progress(len(requests))
+
+        for _, grants in MySnowflake.fetch_pandas_multi(requests):
+
+            if len(grants) > 0:
+                all_grants.append(grants)
+
+            progress.next()
+
+        progress.finish()
+
+        if len(all_grants) > 0:
+            self.privileges_builder.append(self.merge_grants(concat_dataframe(all_grants)))
+
+    def prepare_by_account_usage(self) -> None:
+        """
+        The function retrieves the grants with a single SELECT request on the view GRANTS_TO_ROLES of ACCOUNT_USAGE,
+        then keeps only the grants related to the objects found.
+        """
+
+        grants: pd.DataFrame = SnowAccountUsage(config=self.config).retrieve_grants()
+
+        if len(grants) > 0:
+            self.privileges_builder.append(self.merge_grants(grants))
+
+    def merge_grants(self, grants: pd.DataFrame) -> pd.DataFrame:
+        """
+        The function joins grants retrieved for several objects at once (e.g. by SHOW GRANTS TO ROLE) with the objects
+        found by `SnowObjects`, and returns them with the same columns as the ones built object by object.
+
+        Args:
+            grants (pd.DataFrame): A pandas DataFrame with the columns returned by a SHOW GRANTS command.
+
+        Returns:
+            a pandas DataFrame containing the privileges related to the objects found.
+        """
+
+        grants = grants.assign(OWNERSHIP=grants["privilege"] == "OWNERSHIP")
 
         # yapf: disable
 
-        index_to_drop: Any = privileges[
-            (privileges["OWNERSHIP"] == True) & (privileges["grantee_name"] == self.settings["new_owner"])  # noqa: E712 # pylint: disable=singleton-comparison
-        ].index  # pyright: ignore
+        grants = grants.loc[
+            ~((grants["OWNERSHIP"] == True) & (grants["grantee_name"] == self.settings["new_owner"]))  # noqa: E712 # pylint: disable=singleton-comparison
+        ]  # pyright: ignore
 
         # yapf: enable
 
-        privileges = privileges.drop(index_to_drop)  # pyright: ignore
+        with_arguments: "pd.Series[bool]" = grants["granted_on"].isin(["FUNCTION", "PROCEDURE", "EXTERNAL_FUNCTION"])  # type: ignore
 
-        if len(privileges) > 0:
+        grants = grants.assign(
+            KEY_OBJECT=[MySnowflake.get_key_object(name, arguments) for name, arguments in zip(grants["name"], with_arguments)],
+            SIGNATURE=[MySnowflake.get_signature(name, True) if arguments else "" for name, arguments in zip(grants["name"], with_arguments)],
+            NAMESPACE=[self.__get_namespace(granted_on.replace("_", " ")) for granted_on in grants["granted_on"]],
+        )
 
-            privileges = privileges.reset_index(drop=True)
+        objects: pd.DataFrame = self.all_objects.loc[:, ["KEY_OBJECT", "OBJECT_TYPE", "ARGUMENTS"]]
+        objects = objects.assign(ARGUMENTS=[MySnowflake.get_arguments(str(arguments)) for arguments in objects["ARGUMENTS"]])
+        objects = objects.assign(
+            SIGNATURE=[MySnowflake.get_signature(arguments) for arguments in objects["ARGUMENTS"]],
+            NAMESPACE=[self.__get_namespace(object_type) for object_type in objects["OBJECT_TYPE"]],
+        )
 
-            privileges = self.__prepare_dataframe(privileges, False, {"object_name": object_name, "object_type": object_type, "arguments": arguments})
-            return privileges
+        privileges: pd.DataFrame = grants.merge(objects, on=["KEY_OBJECT", "SIGNATURE", "NAMESPACE"], how="inner")  # type: ignore
+        privileges = drop_columns(privileges, ["created_on", "privilege", "name", "grant_option", "granted_by", "granted_by_role_type", "SIGNATURE", "NAMESPACE"])
+
+        rename_column(privileges, {"granted_on": "GRANTED_ON", "granted_to": "GRANTED_TO", "grantee_name": "GRANTEE_NAME"})
+        create_column(privileges, {"FUTURE": False})
 
-        return None
+        privileges = privileges.loc[:, ["GRANTED_ON", "GRANTED_TO", "GRANTEE_NAME", "OWNERSHIP", "KEY_OBJECT", "OBJECT_TYPE", "ARGUMENTS", "FUTURE"]]
+        privileges = privileges.drop_duplicates().reset_index(drop=True)
+
+        return privileges
 
     def prepare_future_true(self) -> None:
-        """..."""
+        """
+        The function retrieves the future grants of the databases and of the schemas, which lead to REVOKE ALL
+        PRIVILEGES ON FUTURE requests. They are only retrieved with `revoke_future_grants`.
+        """
+
+        if self.settings.get("revoke_future_grants", False) is not True:
+            return
+
+        logging.getLogger("app").info("The SQL objects (database & schemas) concerned by 'GRANT ON FUTURE' will be extracted from Snowflake.")
 
         only_database_schema: pd.DataFrame = self.all_objects.loc[self.all_objects["OBJECT_TYPE"].isin(["DATABASE", "SCHEMA"])]  # type: ignore
         only_database_schema = only_database_schema.reset_index(drop=True)
 
-        self.progress = Bar("Processing", max=len(only_database_schema))
+        self.__retrieve_grants(self.get_tasks(only_database_schema, True), True)
 
-        with Pool(processes=8) as pool:
-            for _ in pool.imap_unordered(self.prepare_future_true_task, only_database_schema.iterrows()):  # pyright: ignore
-                self.progress.next()
+    @staticmethod
+    def get_future_grants(privileges: pd.DataFrame) -> List[GrantRow]:
+        """
+        The function returns the future grants of a database or a schema.
+        """
 
-        self.progress.finish()
+        if len(privileges) == 0:
+            return []
 
-    def prepare_future_true_task(self, row: Any) -> Optional[pd.DataFrame]:
-        """..."""
+        columns: List[List[Any]] = [privileges[column].tolist() for column in ("grant_on", "grant_to", "grantee_name")]
 
-        current_object: pd.Series[Any] = row[1]  # pylint: disable=unsubscriptable-object
+        return list(dict.fromkeys(zip(*columns, [False] * len(privileges))))
 
-        object_type: str = str(current_object.get(key="OBJECT_TYPE"))
-        object_name: str = str(current_object.get(key="KEY_OBJECT"))
-        arguments: str = str(current_object.get(key="ARGUMENTS"))
+    @staticmethod
+    def retrieve_chunk(tasks: Tuple[GrantTask, ...], new_owner: str, future: bool) -> List[Tuple[GrantTask, List[GrantRow]]]:
+        """
+        The function retrieves the grants of a chunk of objects in a thread of the pool. It only depends on its
+        arguments, and returns the grants as tuples so that the pandas DataFrames never leave the thread.
 
-        arguments = MySnowflake.get_arguments(arguments)
+        Returns:
+            the grants of each object of the chunk.
+        """
 
-        privileges = self.__request_retrieve_grants(object_type, object_name, True)
+        results: List[Tuple[GrantTask, List[GrantRow]]] = []
 
-        if len(privileges) > 0:
-            privileges = self.__prepare_dataframe(privileges, True, {"object_name": object_name, "object_type": object_type, "arguments": arguments})
-            return privileges
+        for task in tasks:
+            privileges: pd.DataFrame = MySnowflake.fetch_pandas_all(task.request)
+            results.append((task, SnowPrivileges.get_future_grants(privileges) if future else SnowPrivileges.get_current_grants(privileges, new_owner)))
 
-        return None
+        return results
 
     def get_dataframe(self) -> pd.DataFrame:
         """..."""
+        self.all_privileges = self.__build_privileges()
         return self.all_privileges
 
-    def __prepare_dataframe(self, privileges: pd.DataFrame, future: bool, object_info: Dict[str, str]) -> pd.DataFrame:
-        """..."""
+    def __retrieve_grants(self, tasks: List[GrantTask], future: bool) -> None:
+        """
+        The function retrieves the grants of the objects and appends them.
+        """
+
+        progress: Bar = self.__create_progress(len(tasks))
+
+        for task, rows in self.__iterate_grants(tasks, future):
+            self.__append_grants(rows, task, future)
+            progress.next()
+
+        progress.finish()
+
+    def __iterate_grants(self, tasks: List[GrantTask], future: bool) -> Iterator[Tuple[GrantTask, List[GrantRow]]]:
+        """
+        The function yields the grants of each object in the order of completion: the requests are submitted in chunks
+        of tasks (see `MySnowflake.imap_chunks`), or one by one with the asynchronous execution.
+        """
+
+        new_owner: str = self.settings["new_owner"]
+
+        if MySnowflake.async_window > 0:
+            requests: Dict[str, GrantTask] = {task.request: task for task in tasks}
+
+            for request, privileges in MySnowflake.fetch_pandas_multi(requests):
+                task: GrantTask = requests[request]
+                yield (task, self.get_future_grants(privileges) if future else self.get_current_grants(privileges, new_owner))
+
+            return
+
+        retrieve_chunk = functools.partial(SnowPrivileges.retrieve_chunk, new_owner=new_owner, future=future)
+        yield from MySnowflake.imap_chunks(retrieve_chunk, tasks, self.settings.get("task_chunk_size", 0))
+
+    def __append_grants(self, rows: List[GrantRow], task: GrantTask, future: bool) -> int:
+        """
+        The function appends the grants (GRANTED_ON, GRANTED_TO, GRANTEE_NAME, OWNERSHIP) of an object.
+        """
+
+        if len(rows) == 0:
+            return 0
+
+        granted_on, granted_to, grantee_name, ownership = (list(column) for column in zip(*rows))
+
+        self.privileges_builder.append_rows(
+            len(rows),
+            {
+                "GRANTED_ON": granted_on,
+                "GRANTED_TO": granted_to,
+                "GRANTEE_NAME": grantee_name,
+                "OWNERSHIP": ownership,
+                "KEY_OBJECT": task.object_name,
+                "OBJECT_TYPE": task.object_type,
+                "ARGUMENTS": task.arguments,
+                "FUTURE": future,
+            },
+        )
+
+        return len(rows)
+
+    def __build_privileges(self) -> pd.DataFrame:
+        """
+        The function returns the privileges collected, whose string columns are categorical and share the categories
+        of the symbol table.
+        """
+
+        privileges: pd.DataFrame = self.privileges_builder.build()
+
+        if len(privileges) == 0:
+            return privileges
+
+        return privileges.loc[:, self.columns].drop_duplicates().reset_index(drop=True)
+
+    def get_tasks(self, all_objects: pd.DataFrame, future: bool) -> List[GrantTask]:
+        """
+        The function prepares the task retrieving the grants of each object, from the columns of the objects instead
+        of their rows.
+
+        Args:
+            all_objects (pd.DataFrame): A pandas DataFrame containing the objects.
+            future (bool): The `future` parameter indicates if the future grants must be retrieved instead of the current ones.
+
+        Returns:
+            a task per request, in the order of the objects.
+        """
+
+        if len(all_objects) == 0:
+            return []
 
-        object_name: str = object_info["object_name"]
-        object_type: str = object_info["object_type"]
-        arguments: str = object_info["arguments"]
+        tasks: Dict[str, GrantTask] = {}
 
-        privileges = drop_columns(privileges, ["created_on", "granted_by", "grant_option", "name", "granted_by_role_type"])
-        rename_column(privileges, {"grantee_name": "GRANTEE_NAME"})
-        create_column(privileges, {"KEY_OBJECT": object_name, "OBJECT_TYPE": object_type, "ARGUMENTS": arguments})
+        for object_type, object_name, arguments in zip(
+            to_string_column(all_objects["OBJECT_TYPE"]),
+            to_string_column(all_objects["KEY_OBJECT"]),
+            (MySnowflake.get_arguments(arguments) for arguments in to_string_column(all_objects["ARGUMENTS"])),
+        ):
+            request: str = self.__request_retrieve_grants(object_type, object_name, future, arguments)
+            tasks[request] = GrantTask(request, object_name, object_type, arguments)
+
+        return list(tasks.values())
+
+    def __request_retrieve_grants(self, object_type: str, object_name: str, future: bool, arguments: Optional[str] = "") -> str:
+        """..."""
 
         if future is True:
-            rename_column(privileges, {"grant_on": "GRANTED_ON", "grant_to": "GRANTED_TO"})
-            create_column(privileges, {"FUTURE": True, "OWNERSHIP": False})
-        else:
-            privileges = drop_columns(privileges, ["privilege"])
-            rename_column(privileges, {"granted_on": "GRANTED_ON", "granted_to": "GRANTED_TO"})
-            create_column(privileges, {"FUTURE": False})
+            return f"SHOW FUTURE GRANTS IN {object_type} {object_name}"
 
-        privileges = privileges.drop_duplicates()
+        return f"SHOW GRANTS ON {object_type} {object_name} {arguments}"
 
-        return privileges
+    def __create_progress(self, maximum: int) -> Bar:
+        """..."""
+        return Bar("Processing", max=maximum, file=None if self.quiet else sys.stderr)
 
-    def __request_retrieve_grants(self, object_type: str, object_name: str, future: bool, arguments: Optional[str] = "") -> pd.DataFrame:
+    def __get_namespace(self, object_type: str) -> str:
         """..."""
 
-        grants: pd.DataFrame
+        # Tables and views share the same namespace in a schema, so a name is enough to identify them.
+        if object_type in self.table_namespace:
+            return "TABLE"
 
-        if future is True:
-            grants = MySnowflake.fetch_pandas_all(f"SHOW FUTURE GRANTS IN {object_type} {object_name}")
-        else:
-            grants = MySnowflake.fetch_pandas_all(f"SHOW GRANTS ON {object_type} {object_name} {arguments}")
+        return object_type
+
+    def __request_retrieve_grantees(self) -> List[str]:
+        """..."""
+
+        requests: List[str] = []
+
+        roles: pd.DataFrame = MySnowflake.fetch_pandas_all("SHOW ROLES")
+
+        for role_name in roles.get("name", []):  # pyright: ignore
+            requests.append(f"SHOW GRANTS TO ROLE {MySnowflake.quote_identifier(str(role_name))}")  # pyright: ignore
+
+        # Only the databases found by `SnowObjects` are listed: SHOW DATABASE ROLES fails on the ones which do not
+        # exist, and the ones ignored have no object anyway.
+        existing_databases: Set[str] = {str(database_name) for database_name in self.all_objects["DATABASE_NAME"]} if len(self.all_objects) > 0 else set()
+
+        for database_name in [database_name for database_name in self.settings["databases"] if database_name in existing_databases]:
+
+            database_roles: pd.DataFrame = MySnowflake.fetch_pandas_all(f"SHOW DATABASE ROLES IN DATABASE {MySnowflake.quote_identifier(database_name)}")
+
+            for role_name in database_roles.get("name", []):  # pyright: ignore
+                key_role: str = f"{MySnowflake.quote_identifier(database_name)}.{MySnowflake.quote_identifier(str(role_name))}"  # pyright: ignore
+                requests.append(f"SHOW GRANTS TO DATABASE ROLE {key_role}")
+
+        shares: pd.DataFrame = MySnowflake.fetch_pandas_all("SHOW SHARES")
+
+        if len(shares) > 0:
+            for share_name in shares.loc[shares["kind"] == "OUTBOUND", "name"]:  # pyright: ignore
+                requests.append(f"SHOW GRANTS TO SHARE {MySnowflake.quote_identifier(str(share_name).rsplit('.', maxsplit=1)[-1])}")  # pyright: ignore
 
-        return grants
+        return requests
 
     def __load_configuration(self) -> None:
         """..."""
 
-        config: Configuration = Configuration()
-        self.settings = config.get_user_configuration("settings")
+        self.settings = self.config.get_user_configuration("settings")
+        self.table_namespace = self.config.get_application_configuration("table_namespace")
@@ -3,58 +3,86 @@
 import logging
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
 from snow_revoke_privileges.tools.my_snowflake import MySnowflake
+from snow_revoke_privileges.tools.snowflake_batch_executor import SnowflakeBatchExecutor
 from snow_revoke_privileges.tools.configuration import Configuration
+from snow_revoke_privileges.tools.execution_ledger import ExecutionLedger, RequestResult
+from snow_revoke_privileges.tools.retry_policy import write_dead_letter
+from snow_revoke_privileges.tools.my_dataframe import to_string_column
+from snow_revoke_privileges.snow_statement_planner import SnowStatementPlanner, get_transfer_clause
 
 
 class SnowRevokeRequests:  # pylint: disable=unused-variable
     """..."""
 
     settings: Dict[str, Any] = {}
-    snowflake_credentials: Dict[str, Any] = {}
 
     all_privileges: pd.DataFrame
 
     ownership_requests: List[str] = []
     grant_requests: List[str] = []
 
-    def __init__(self, all_privileges: pd.DataFrame) -> None:
-        """..."""
+    # Planner collapsing the requests by schema.
+    planner: SnowStatementPlanner
+
+    # Level of the messages logged while the requests are prepared (debug when they are prepared schema by schema).
+    log_level: int = logging.INFO
+
+    def __init__(self, all_privileges: pd.DataFrame, all_objects: Optional[pd.DataFrame] = None, quiet: bool = False, config: Optional[Configuration] = None) -> None:
+        """
+        Args:
+            all_privileges (pd.DataFrame): The `all_privileges` parameter contains the privileges found by `SnowPrivileges`.
+            all_objects (pd.DataFrame): The `all_objects` parameter contains the objects found by `SnowObjects`, needed to
+        collapse the statements by schema (no statement is collapsed without it).
+            quiet (bool): The `quiet` parameter indicates if the messages must be logged at the debug level.
+            config (Configuration): The `config` parameter is the configuration of the run (by default the files are read).
+        """
+        self.config = config if config is not None else Configuration()
         self.all_privileges = all_privileges
+        self.log_level = logging.DEBUG if quiet else logging.INFO
+        self.ownership_requests = []
+        self.grant_requests = []
+        self.planner = SnowStatementPlanner(all_objects if all_objects is not None else pd.DataFrame([]), self.config)
         self.__load_configuration()
 
     def __load_configuration(self) -> None:
         """..."""
 
-        config: Configuration = Configuration()
+        config: Configuration = self.config
 
         self.settings = config.get_user_configuration("settings")
-        self.snowflake_credentials = config.get_user_configuration("snowflake_credentials")
 
-    def execute(self) -> None:
-        """"..."""
+    def execute(self, resume: bool = False) -> List[RequestResult]:
+        """
+        Args:
+            resume (bool): The `resume` parameter indicates if the requests recorded as successful in the ledgers of the
+        previous run must be skipped.
+
+        Returns:
+            the results of the requests executed (none with run_dry).
+        """
 
-        self.__execute_part(self.grant_requests, "revoke")
-        self.__execute_part(self.ownership_requests, "grant ownership")
+        return self.__execute_part(self.grant_requests, "revoke", resume) + self.__execute_part(self.ownership_requests, "grant ownership", resume)
 
-    def __execute_part(self, requests: List[str], request_type: str) -> None:
+    def __execute_part(self, requests: List[str], request_type: str, resume: bool) -> List[RequestResult]:
         """"..."""
 
-        config: Configuration = Configuration()
+        config: Configuration = self.config
         filename: str = config.get_output_path(f"output-{request_type}.sql")
 
         if os.path.exists(filename):
             os.remove(filename)
 
         Path(filename).touch()
+        results: List[RequestResult] = []
 
         if len(requests) == 0:
             logging.getLogger("app").info("No %s requests must be performed.", request_type.upper())
-            return
+            return results
 
         with open(filename, "w", encoding="utf-8") as file:
 
@@ -63,7 +91,16 @@ class SnowRevokeRequests:  # pylint: disable=unused-variable
 
             if self.settings["run_dry"] is False:
                 logging.getLogger("app").info("A total of %s %s requests will be performed.", len(requests), request_type.upper())
-                MySnowflake.execute_multi_requests(requests)
+                ledger: ExecutionLedger = ExecutionLedger(config.get_output_path(f"ledger-{request_type}.jsonl"), resume)
+
+                try:
+                    with MySnowflake.metrics.phase(f"execution.{request_type.replace(' ', '_')}"):
+                        results = SnowflakeBatchExecutor.execute_multi_requests(requests, ledger)
+                finally:
+                    ledger.close()
+
+                write_dead_letter(config.get_output_path(f"dead-letter-{request_type}.sql"), results)
+
                 logging.getLogger("app").info("All %s requests were now performed.", request_type.upper())
             else:
                 logging.getLogger("app").warning("No %s request will be performed as requested by the user (run_dry=True).", request_type.upper())
@@ -72,6 +109,8 @@ class SnowRevokeRequests:  # pylint: disable=unused-variable
 
             logging.getLogger("app").info("The SQL requests generated will be availaible in the file 'output-%s.sql'.", request_type)
 
+        return results
+
     def prepare(self) -> None:
         """..."""
         self.__prepare_grants()
@@ -80,53 +119,86 @@ class SnowRevokeRequests:  # pylint: disable=unused-variable
     def __prepare_grants(self) -> None:
         """..."""
 
-        logging.getLogger("app").info("The requests related to the REVOKE will be generated now.")
+        logging.getLogger("app").log(self.log_level, "The requests related to the REVOKE will be generated now.")
 
-        current_privilege: Any
+        if len(self.all_privileges) == 0:
+            return
 
         privileges: pd.DataFrame = self.all_privileges.loc[self.all_privileges["OWNERSHIP"] == False]  # noqa: E712 # pylint: disable=singleton-comparison
+        attributes: Dict[str, "pd.Series[str]"] = self.__get_privilege_attributes(privileges)
 
-        for _, current_privilege in privileges.iterrows():  # type: ignore
+        current: "pd.Series[bool]" = privileges["FUTURE"] == False  # noqa: E712 # pylint: disable=singleton-comparison
+        future: "pd.Series[bool]" = privileges["FUTURE"] == True  # noqa: E712 # pylint: disable=singleton-comparison
 
-            request: str = ""
+        grantee: "pd.Series[str]" = " FROM " + attributes["granted_to"] + " " + attributes["grantee_name"]
 
-            (object_type, key_object, grantee_name, granted_on, granted_to, arguments) = self.__get_privilege_attributes(current_privilege)
+        # yapf: disable
 
-            if current_privilege["FUTURE"] is False:
-                request = f"REVOKE ALL PRIVILEGES ON {granted_on} {key_object}{arguments} FROM {granted_to} {grantee_name}"
-                self.grant_requests.append(request)
-            elif current_privilege["FUTURE"] is True:
-                request = f"REVOKE ALL PRIVILEGES ON FUTURE {granted_on}S IN {object_type} {key_object} FROM {granted_to} {grantee_name}"
-                self.grant_requests.append(request)
+        current_requests: "pd.Series[str]" = "REVOKE ALL PRIVILEGES ON " + attributes["granted_on"] + " " + attributes["key_object"] + attributes["arguments"] + grantee
+        future_requests: "pd.Series[str]" = "REVOKE ALL PRIVILEGES ON FUTURE " + attributes["granted_on"] + "S IN " + attributes["object_type"] + " " + attributes["key_object"] + grantee
+
+        # yapf: enable
+
+        collapsed, collapsed_requests = self.planner.plan_revokes(privileges.loc[current])
+        collapsed = collapsed.reindex(privileges.index, fill_value=False)
+
+        requests: "pd.Series[str]" = current_requests.where(current, future_requests).loc[(current & ~collapsed) | future]
+        self.grant_requests.extend(requests.tolist())
+        self.grant_requests.extend(collapsed_requests)
+
+        self.__log_collapsed("REVOKE", int(collapsed.sum()), len(collapsed_requests))
 
     def __prepare_ownerships(self) -> None:
         """..."""
 
-        logging.getLogger("app").info("The requests related to the GRANT OWNERSHIP will be generated now.")
+        logging.getLogger("app").log(self.log_level, "The requests related to the GRANT OWNERSHIP will be generated now.")
 
-        current_privilege: Any
+        if len(self.all_privileges) == 0:
+            return
 
         privileges: pd.DataFrame = self.all_privileges.loc[self.all_privileges["OWNERSHIP"] == True]  # noqa: E712 # pylint: disable=singleton-comparison
-        request: str = ""
+        attributes: Dict[str, "pd.Series[str]"] = self.__get_privilege_attributes(privileges)
 
-        for _, current_privilege in privileges.iterrows():  # type: ignore
+        # yapf: disable
 
-            (_, key_object, grantee_name, granted_on, granted_to, arguments) = self.__get_privilege_attributes(current_privilege)
+        requests: "pd.Series[str]" = (
+            "GRANT OWNERSHIP ON " + attributes["granted_on"] + " " + attributes["key_object"] + attributes["arguments"]
+            + f" TO ROLE {self.settings['new_owner']}{get_transfer_clause(self.settings)} -- instead of " + attributes["grantee_name"]
+        )
 
-            if granted_on in ["DATABASE", "SCHEMA"]:
-                continue
+        # yapf: enable
 
-            request = f"GRANT OWNERSHIP ON {granted_on} {key_object}{arguments} TO {granted_to} {self.settings['new_owner']} -- instead of {grantee_name}"
-            self.ownership_requests.append(request)
+        requests = requests.loc[~attributes["granted_on"].isin(["DATABASE", "SCHEMA"])]
 
-    def __get_privilege_attributes(self, privilege: Any) -> Tuple[str, str, str, str, str, str]:
+        collapsed, collapsed_requests = self.planner.plan_ownerships(privileges.loc[requests.index])
+        requests = requests.loc[~collapsed]
+
+        self.ownership_requests.extend(requests.tolist())
+        self.ownership_requests.extend(collapsed_requests)
+
+        self.__log_collapsed("GRANT OWNERSHIP", int(collapsed.sum()), len(collapsed_requests))
+
+    def __log_collapsed(self, request_type: str, collapsed: int, statements: int) -> None:
         """..."""
 
-        object_type: str = str(privilege.get(key="OBJECT_TYPE"))
-        key_object: str = str(privilege.get(key="KEY_OBJECT"))
-        grantee_name: str = str(privilege.get(key="GRANTEE_NAME"))
-        granted_on: str = str(privilege.get(key="GRANTED_ON")).replace("_", " ")
-        granted_to: str = str(privilege.get(key="GRANTED_TO"))
-        arguments: str = str(privilege.get(key="ARGUMENTS"))
+        if statements > 0:
+            logging.getLogger("app").log(
+                self.log_level,
+                "A total of %s %s requests was collapsed by schema into %s requests (%s requests saved).",
+                collapsed,
+                request_type,
+                statements,
+                collapsed - statements,
+            )
+
+    def __get_privilege_attributes(self, privileges: pd.DataFrame) -> Dict[str, "pd.Series[str]"]:
+        """..."""
 
-        return (object_type, key_object, grantee_name, granted_on, granted_to, arguments)
+        return {
+            "object_type": to_string_column(privileges["OBJECT_TYPE"]),
+            "key_object": to_string_column(privileges["KEY_OBJECT"]),
+            "grantee_name": to_string_column(privileges["GRANTEE_NAME"]),
+            "granted_on": to_string_column(privileges["GRANTED_ON"]).str.replace("_", " ", regex=False),
+            "granted_to": to_string_column(privileges["GRANTED_TO"]),
+            "arguments": to_string_column(privileges["ARGUMENTS"]),
+        }
@@ -0,0 +1,225 @@
+"""..."""
+
+import logging
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from snow_revoke_privileges.tools.my_snowflake import MySnowflake
+from snow_revoke_privileges.tools.configuration import Configuration
+from snow_revoke_privileges.tools.my_dataframe import DataFrameBuilder, to_string_column
+
+
+class SnowSnapshot:  # pylint: disable=unused-variable
+    """
+    The `SnowSnapshot` class stores the objects and the privileges found by a run in the output directory, so that the
+    next run (incremental mode) only retrieves the grants of the objects created or altered since then.
+    """
+
+    settings: Dict[str, Any] = {}
+
+    # Path of the snapshot files, without extension.
+    objects_path: str = ""
+    privileges_path: str = ""
+
+    # Columns used as watermarks to detect the objects created or altered.
+    watermarks: List[str] = ["CREATED_ON", "LAST_ALTERED"]
+
+    # Object (or database or schema for the requests ON ALL|FUTURE <TYPE>S IN ...) targeted by a request.
+    request_target: "re.Pattern[str]" = re.compile(r' ON (?:(?:ALL|FUTURE) [A-Z_ ]+S IN )?[A-Z_ ]+? (?P<name>"(?:[^"]|"")*"(?:\."(?:[^"]|"")*")*)')
+
+    def __init__(self, config: Optional[Configuration] = None) -> None:
+        """
+        Args:
+            config (Configuration): The `config` parameter is the configuration of the run (by default the files are read).
+        """
+
+        config = config if config is not None else Configuration()
+
+        self.settings = config.get_user_configuration("settings")
+        self.objects_path = config.get_output_path("snapshot-objects")
+        self.privileges_path = config.get_output_path("snapshot-privileges")
+
+    def exists(self) -> bool:
+        """..."""
+        return self.__get_file(self.objects_path) is not None and self.__get_file(self.privileges_path) is not None
+
+    def load(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        The function reads the objects and the privileges stored by the previous run.
+
+        Returns:
+            a tuple with the pandas DataFrames of the objects and of the privileges.
+        """
+
+        previous_objects: pd.DataFrame = self.__read(self.objects_path)
+        previous_privileges: pd.DataFrame = self.__read(self.privileges_path)
+
+        logging.getLogger("app").info("The snapshot of the previous run contains %s objects and %s privileges.", len(previous_objects), len(previous_privileges))
+
+        return (previous_objects, previous_privileges)
+
+    def save(self, all_objects: pd.DataFrame, all_privileges: pd.DataFrame, failed_requests: Optional[List[str]] = None) -> None:
+        """
+        The function stores the objects and the privileges, in the Parquet format when `pyarrow` is installed. The
+        objects targeted by the requests which have failed are left out, so that the next run analyzes them again.
+
+        Args:
+            all_objects (pd.DataFrame): A pandas DataFrame containing the objects found by `SnowObjects`.
+            all_privileges (pd.DataFrame): A pandas DataFrame containing the privileges found by `SnowPrivileges`.
+            failed_requests (List[str]): The requests which have failed despite the retries.
+        """
+
+        targets: List[str] = self.get_targets(failed_requests if failed_requests is not None else [])
+
+        if len(targets) > 0:
+            all_objects = all_objects.loc[~self.is_targeted(all_objects, targets).to_numpy()]
+            all_privileges = all_privileges.loc[~self.is_targeted(all_privileges, targets).to_numpy()]
+
+        all_objects = all_objects.assign(**{column: self.__get_dates(all_objects, column) for column in self.watermarks})
+
+        self.__write(all_objects, self.objects_path)
+        self.__write(all_privileges, self.privileges_path)
+
+        logging.getLogger("app").info("A snapshot of %s objects and %s privileges was saved for the next run.", len(all_objects), len(all_privileges))
+
+    def get_changed_objects(self, all_objects: pd.DataFrame, previous_objects: pd.DataFrame) -> pd.DataFrame:
+        """
+        The function keeps the objects which are new or whose watermarks changed since the previous snapshot (an object
+        dropped and created again gets a new creation date).
+
+        Args:
+            all_objects (pd.DataFrame): A pandas DataFrame containing the objects found by the current run.
+            previous_objects (pd.DataFrame): A pandas DataFrame containing the objects of the previous snapshot.
+
+        Returns:
+            a pandas DataFrame containing the objects whose grants must be retrieved again.
+        """
+
+        if len(all_objects) == 0 or len(previous_objects) == 0:
+            return all_objects
+
+        current: pd.DataFrame = pd.DataFrame({"KEY": self.get_object_keys(all_objects).to_numpy()})
+        previous: pd.DataFrame = pd.DataFrame({"KEY": self.get_object_keys(previous_objects).to_numpy()})
+
+        for column in self.watermarks:
+            current[column] = self.__get_dates(all_objects, column).to_numpy()
+            previous[column] = self.__get_dates(previous_objects, column).to_numpy()
+
+        compared: pd.DataFrame = current.merge(previous.drop_duplicates("KEY"), on="KEY", how="left", suffixes=("", "_PREVIOUS"), indicator=True)  # type: ignore
+
+        changed: "pd.Series[bool]" = compared["_merge"] == "left_only"
+
+        for column in self.watermarks:
+            # Two missing dates are equal (e.g. LAST_ALTERED is not returned by the SHOW commands).
+            changed |= (compared[column] != compared[f"{column}_PREVIOUS"]) & ~(compared[column].isna() & compared[f"{column}_PREVIOUS"].isna())
+
+        changed_objects: pd.DataFrame = all_objects.loc[changed.to_numpy()]
+
+        logging.getLogger("app").info("A total of %s objects was created or altered since the previous run.", len(changed_objects))
+
+        return changed_objects
+
+    def merge_privileges(self, all_objects: pd.DataFrame, changed_objects: pd.DataFrame, previous_privileges: pd.DataFrame, privileges: pd.DataFrame) -> pd.DataFrame:
+        """
+        The function builds the privileges of the new snapshot: the ones of the previous snapshot for the objects which
+        still exist and did not change, and the ones retrieved by the current run for the other objects.
+
+        Args:
+            all_objects (pd.DataFrame): A pandas DataFrame containing the objects found by the current run.
+            changed_objects (pd.DataFrame): A pandas DataFrame containing the objects created or altered.
+            previous_privileges (pd.DataFrame): A pandas DataFrame containing the privileges of the previous snapshot.
+            privileges (pd.DataFrame): A pandas DataFrame containing the privileges retrieved by the current run.
+
+        Returns:
+            a pandas DataFrame containing the privileges of all the objects.
+        """
+
+        builder: DataFrameBuilder = DataFrameBuilder()
+
+        if len(previous_privileges) > 0 and len(all_objects) > 0:
+            unchanged_keys: "pd.Index[str]" = pd.Index(self.get_object_keys(all_objects)).difference(pd.Index(self.get_object_keys(changed_objects)))
+            builder.append(previous_privileges.loc[self.get_privilege_keys(previous_privileges).isin(unchanged_keys)])  # type: ignore
+
+        builder.append(privileges)
+
+        return builder.build()
+
+    def get_targets(self, requests: List[str]) -> List[str]:
+        """
+        The function returns the names of the objects, schemas or databases targeted by requests (KEY_OBJECT format).
+        """
+
+        return sorted({match.group("name") for match in (self.request_target.search(request) for request in requests) if match is not None})
+
+    def is_targeted(self, current_dataframe: pd.DataFrame, targets: List[str]) -> "pd.Series[bool]":
+        """
+        The function indicates the objects (or the privileges) which are targeted, or whose schema or database is.
+        """
+
+        if len(current_dataframe) == 0:
+            return pd.Series([], dtype=bool)  # type: ignore
+
+        keys: "pd.Series[str]" = to_string_column(current_dataframe["KEY_OBJECT"])
+
+        return keys.isin(targets) | keys.str.startswith(tuple(f"{target}." for target in targets))
+
+    def get_object_keys(self, all_objects: pd.DataFrame) -> "pd.Series[str]":
+        """
+        The function identifies each object by its type, its name and its arguments (for the functions and procedures).
+        """
+
+        if len(all_objects) == 0:
+            return pd.Series([], dtype=str)  # type: ignore
+
+        arguments: List[str] = [MySnowflake.get_arguments(str(arguments)) for arguments in all_objects["ARGUMENTS"]]
+        return to_string_column(all_objects["OBJECT_TYPE"]) + " " + to_string_column(all_objects["KEY_OBJECT"]) + arguments
+
+    def get_privilege_keys(self, privileges: pd.DataFrame) -> "pd.Series[str]":
+        """
+        The function identifies the object of each privilege, in the same way as `get_object_keys`.
+        """
+
+        return to_string_column(privileges["OBJECT_TYPE"]) + " " + to_string_column(privileges["KEY_OBJECT"]) + to_string_column(privileges["ARGUMENTS"])
+
+    def __get_dates(self, all_objects: pd.DataFrame, column: str) -> "pd.Series[pd.Timestamp]":
+        """..."""
+
+        if column not in all_objects:
+            return pd.Series(pd.NaT, index=all_objects.index, dtype="datetime64[ns, UTC]")  # type: ignore
+
+        return pd.to_datetime(all_objects[column], utc=True, errors="coerce")  # type: ignore
+
+    def __get_file(self, path: str) -> Any:
+        """..."""
+
+        for extension in (".parquet", ".pkl"):
+            if os.path.exists(path + extension):
+                return path + extension
+
+        return None
+
+    def __read(self, path: str) -> pd.DataFrame:
+        """..."""
+
+        filename: str = self.__get_file(path)
+
+        if filename.endswith(".parquet"):
+            return pd.read_parquet(filename)
+
+        return pd.read_pickle(filename)  # type: ignore
+
+    def __write(self, current_dataframe: pd.DataFrame, path: str) -> None:
+        """..."""
+
+        for extension in (".parquet", ".pkl"):
+            if os.path.exists(path + extension):
+                os.remove(path + extension)
+
+        try:
+            current_dataframe.reset_index(drop=True).to_parquet(path + ".parquet", index=False)
+        except ImportError:
+            # Without `pyarrow` (or `fastparquet`), the snapshot is stored with pickle.
+            current_dataframe.reset_index(drop=True).to_pickle(path + ".pkl")
@@ -0,0 +1,160 @@
+"""..."""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from snow_revoke_privileges.tools.my_snowflake import MySnowflake
+from snow_revoke_privileges.tools.configuration import Configuration
+from snow_revoke_privileges.tools.my_dataframe import to_string_column
+
+
+def get_transfer_clause(settings: Dict[str, Any]) -> str:  # pylint: disable=unused-variable
+    """
+    The function returns the clause added to the GRANT OWNERSHIP requests: with `owner_prefilter`, the grants of the
+    objects transferred are not retrieved, so their current grants are revoked by the transfer itself.
+    """
+
+    return " REVOKE CURRENT GRANTS" if settings.get("owner_prefilter", False) is True else ""
+
+
+class SnowStatementPlanner:  # pylint: disable=unused-variable
+    """
+    The `SnowStatementPlanner` class detects the schemas where the same action applies to all the objects of a type,
+    and replaces the statements of these objects by a single `... ON ALL <TYPE>S IN SCHEMA ...` statement.
+    """
+
+    settings: Dict[str, Any] = {}
+
+    # List of object types which can be targeted with ON ALL <TYPE>S IN SCHEMA.
+    collapsible_objects: List[str] = []
+
+    # Minimum number of objects of a type in a schema to collapse their statements (0 to disable it).
+    threshold: int = 0
+
+    # Objects of the collapsible types with their schema, and the number of objects per schema and type.
+    objects: pd.DataFrame
+    totals: "pd.Series[int]"
+
+    def __init__(self, all_objects: pd.DataFrame, config: Optional[Configuration] = None) -> None:
+        """
+        Args:
+            all_objects (pd.DataFrame): The `all_objects` parameter contains the objects found by `SnowObjects`.
+            config (Configuration): The `config` parameter is the configuration of the run (by default the files are read).
+        """
+
+        self.config = config if config is not None else Configuration()
+        self.__load_configuration()
+
+        # The statements ON ALL also target the objects which were not retrieved, so the inventory must be complete.
+        if self.settings.get("object_name_pattern") is not None:
+            self.threshold = 0
+
+        self.objects = pd.DataFrame(columns=["OBJECT_ID", "OBJECT_TYPE", "SCHEMA_KEY"])
+        self.totals = pd.Series([], dtype=int)  # type: ignore
+
+        if self.threshold <= 0 or len(all_objects) == 0:
+            return
+
+        objects: pd.DataFrame = all_objects.loc[all_objects["OBJECT_TYPE"].isin(self.collapsible_objects)]  # type: ignore
+
+        self.objects = pd.DataFrame(
+            {
+                "OBJECT_ID": to_string_column(objects["KEY_OBJECT"]) + [MySnowflake.get_arguments(str(arguments)) for arguments in objects["ARGUMENTS"]],
+                "OBJECT_TYPE": to_string_column(objects["OBJECT_TYPE"]),
+                "SCHEMA_KEY": "\"" + to_string_column(objects["DATABASE_NAME"]) + "\".\"" + to_string_column(objects["SCHEMA_NAME"]) + "\"",
+            }
+        ).drop_duplicates()
+
+        self.totals = self.objects.groupby(["SCHEMA_KEY", "OBJECT_TYPE"]).size()
+
+    def __load_configuration(self) -> None:
+        """..."""
+
+        config: Configuration = self.config
+
+        self.settings = config.get_user_configuration("settings")
+        self.collapsible_objects = config.get_application_configuration("collapsible_objects")
+        self.threshold = self.settings.get("collapse_threshold", 0)
+
+    def plan_revokes(self, privileges: pd.DataFrame) -> Tuple["pd.Series[bool]", List[str]]:
+        """
+        The function collapses the current privileges of a grantee when the grantee has privileges on all the objects
+        of a type in a schema.
+
+        Args:
+            privileges (pd.DataFrame): A pandas DataFrame containing the current privileges to revoke.
+
+        Returns:
+            a tuple with the mask of the privileges covered by a collapsed statement and the collapsed statements.
+        """
+
+        collapsed, groups = self.__plan(privileges, ["GRANTED_TO", "GRANTEE_NAME"])
+
+        requests: List[str] = [f"REVOKE ALL PRIVILEGES ON ALL {object_type}S IN SCHEMA {schema_key} FROM {granted_to} {grantee_name}" for schema_key, object_type, granted_to, grantee_name in groups]
+
+        return (collapsed, requests)
+
+    def plan_ownerships(self, privileges: pd.DataFrame) -> Tuple["pd.Series[bool]", List[str]]:
+        """
+        The function collapses the ownerships to transfer when all the objects of a type in a schema must be transferred.
+
+        Args:
+            privileges (pd.DataFrame): A pandas DataFrame containing the ownerships to transfer.
+
+        Returns:
+            a tuple with the mask of the ownerships covered by a collapsed statement and the collapsed statements.
+        """
+
+        collapsed, groups = self.__plan(privileges, ["GRANTED_TO"])
+
+        new_owner: str = f"{self.settings['new_owner']}{get_transfer_clause(self.settings)}"
+
+        requests: List[str] = [
+            f"GRANT OWNERSHIP ON ALL {object_type}S IN SCHEMA {schema_key} TO ROLE {new_owner} -- {self.totals[(schema_key, object_type)]} objects"
+            for schema_key, object_type, _ in groups
+        ]
+
+        return (collapsed, requests)
+
+    def __plan(self, privileges: pd.DataFrame, grantee_columns: List[str]) -> Tuple["pd.Series[bool]", List[Tuple[str, ...]]]:
+        """
+        The function finds the groups (schema, type of object, grantee) covering all the objects of a type in a schema.
+
+        Args:
+            privileges (pd.DataFrame): A pandas DataFrame containing the privileges.
+            grantee_columns (List[str]): The columns identifying the grantee in a group.
+
+        Returns:
+            a tuple with the mask of the privileges belonging to these groups and the list of groups.
+        """
+
+        collapsed: "pd.Series[bool]" = pd.Series(False, index=privileges.index)
+
+        if len(self.objects) == 0 or len(privileges) == 0:
+            return (collapsed, [])
+
+        columns: Dict[str, "pd.Series[str]"] = {
+            "OBJECT_ID": to_string_column(privileges["KEY_OBJECT"]) + to_string_column(privileges["ARGUMENTS"]),
+            "OBJECT_TYPE": to_string_column(privileges["OBJECT_TYPE"]),
+        }
+
+        for column in grantee_columns:
+            columns[column] = to_string_column(privileges[column])
+
+        candidates: pd.DataFrame = pd.DataFrame(columns).reset_index()
+        candidates = candidates.merge(self.objects, on=["OBJECT_ID", "OBJECT_TYPE"], how="inner")  # type: ignore
+
+        keys: List[str] = ["SCHEMA_KEY", "OBJECT_TYPE"] + grantee_columns
+        covered: "pd.Series[int]" = candidates.groupby(keys)["OBJECT_ID"].nunique()  # type: ignore
+
+        totals: "pd.Series[int]" = self.totals.reindex(covered.index.droplevel(grantee_columns)).set_axis(covered.index)  # type: ignore
+        groups: "pd.Index[Any]" = covered.index[(covered == totals) & (totals >= self.threshold)]
+
+        if len(groups) == 0:
+            return (collapsed, [])
+
+        in_groups: "pd.Series[bool]" = pd.MultiIndex.from_frame(candidates[keys]).isin(groups)  # type: ignore
+        collapsed.loc[candidates.loc[in_groups, "index"].unique()] = True  # type: ignore
+
+        return (collapsed, [tuple(group) for group in groups])
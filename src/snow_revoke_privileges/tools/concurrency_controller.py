@@ -0,0 +1,181 @@
+"""tools/concurrency_controller.py"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class ConcurrencySettings(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `ConcurrencySettings` class contains the bounds of the window and the tolerance to the latency of a controller.
+    """
+
+    min_window: int
+    max_window: int
+
+    # The latency degrades when the average latency of a round exceeds the best one multiplied by this factor.
+    latency_tolerance: float
+
+
+class RoundMeasures(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `RoundMeasures` class contains the latencies and the number of transient errors of the requests of a round.
+    """
+
+    latencies: List[float]
+    errors: int
+
+
+class ConcurrencyController:  # pylint: disable=unused-variable
+    """
+    The `ConcurrencyController` class limits the number of requests executed at the same time with an AIMD window
+    (additive increase, multiplicative decrease): after each round of requests, the window grows by one while the
+    latency and the errors stay healthy, and is halved when the latency degrades or a transient error (throttling,
+    network) is reported.
+    """
+
+    settings: ConcurrencySettings
+    window: int
+
+    # Number of the requests running.
+    in_flight: int
+
+    # Measures of the current round, and best average latency of a round.
+    round: RoundMeasures
+    best_latency: Optional[float]
+
+    # Successive values of the window with the time of the change (for the logs and the run report).
+    history: List[Tuple[float, int]]
+
+    def __init__(self, min_window: int = 8, max_window: int = 8, initial_window: Optional[int] = None, latency_tolerance: float = 2.0) -> None:
+        """
+        Args:
+            min_window (int): The `min_window` parameter is the minimum number of requests executed at the same time.
+            max_window (int): The `max_window` parameter is the maximum number of requests executed at the same time.
+            initial_window (int): The `initial_window` parameter is the first window (by default `min_window`).
+            latency_tolerance (float): The `latency_tolerance` parameter is the factor beyond which the latency is degraded.
+        """
+
+        self.settings = ConcurrencySettings(max(1, min_window), max(1, min_window, max_window), latency_tolerance)
+        self.window = min(self.max_window, max(self.min_window, initial_window if initial_window is not None else self.min_window))
+
+        self.in_flight = 0
+        self.history = [(time.monotonic(), self.window)]
+        self.condition = threading.Condition()
+
+        self.round = RoundMeasures([], 0)
+        self.best_latency = None
+
+    @property
+    def min_window(self) -> int:
+        """..."""
+        return self.settings.min_window
+
+    @property
+    def max_window(self) -> int:
+        """..."""
+        return self.settings.max_window
+
+    @staticmethod
+    def from_settings(settings: Dict[str, Any]) -> "ConcurrencyController":
+        """
+        The function creates a controller from the `concurrency` section of the settings (see config-example.yaml). Without
+        this section, the window is fixed to the number of `connections`.
+        """
+
+        connections: int = settings.get("connections", 8)
+        concurrency: Dict[str, Any] = settings.get("concurrency", {}) or {}
+
+        return ConcurrencyController(concurrency.get("min", connections), concurrency.get("max", connections), concurrency.get("initial"))
+
+    def acquire(self) -> None:
+        """
+        The function waits until a request can be executed without exceeding the window.
+        """
+
+        with self.condition:
+            while self.in_flight >= self.window:
+                self.condition.wait()
+
+            self.in_flight += 1
+
+    def release(self, latency: float, failed: bool = False) -> None:
+        """
+        The function records the end of a request and adjusts the window at the end of each round.
+
+        Args:
+            latency (float): The number of seconds needed by the request.
+            failed (bool): True if the request has failed with a transient error.
+        """
+
+        with self.condition:
+            self.in_flight -= 1
+            self.record_latency(latency, failed)
+
+    def record_latency(self, latency: float, failed: bool = False) -> None:
+        """
+        The function records a request executed without `acquire` (e.g. by the asynchronous execution, see
+        `get_scaled_window`) and adjusts the window at the end of each round.
+
+        Args:
+            latency (float): The number of seconds needed by the request.
+            failed (bool): True if the request has failed with a transient error.
+        """
+
+        with self.condition:
+            self.round.latencies.append(latency)
+
+            if failed:
+                self.round = self.round._replace(errors=self.round.errors + 1)
+
+            if len(self.round.latencies) >= self.window:
+                self.__adjust()
+
+            self.condition.notify_all()
+
+    def get_scaled_window(self, maximum: int) -> int:
+        """
+        The function scales a number of requests like the window between its bounds: `maximum` when the window is at
+        its maximum, and proportionally less when it has been reduced (e.g. the requests kept in flight by the
+        asynchronous execution).
+        """
+
+        with self.condition:
+            return max(1, maximum * self.window // self.max_window)
+
+    def record_error(self, error: BaseException) -> None:  # pylint: disable=unused-argument
+        """
+        The function records a transient error reported while a request is retried (see `RetryPolicy`).
+        """
+
+        with self.condition:
+            self.round = self.round._replace(errors=self.round.errors + 1)
+
+    def __adjust(self) -> None:
+        """..."""
+
+        latency: float = sum(self.round.latencies) / len(self.round.latencies)
+        degraded: bool = self.best_latency is not None and latency > self.best_latency * self.settings.latency_tolerance
+
+        if self.best_latency is None or latency < self.best_latency:
+            self.best_latency = latency
+
+        window: int = self.window
+
+        if self.round.errors > 0 or degraded:
+            window = max(self.min_window, self.window // 2)
+        else:
+            window = min(self.max_window, self.window + 1)
+
+        if window != self.window:
+            logging.getLogger("app").debug(
+                "The concurrency window is now %s (average latency: %.3f s, transient errors: %s).",
+                window,
+                latency,
+                self.round.errors,
+            )
+            self.window = window
+            self.history.append((time.monotonic(), window))
+
+        self.round = RoundMeasures([], 0)
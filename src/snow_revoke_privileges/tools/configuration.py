@@ -1,16 +1,91 @@
 """..."""
 
-import json
+import copy
+import logging
 import os
-from typing import Any, Dict
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 import yaml
 
+# Environment variables overriding the path of the user configuration file and of the output directory.
+CONFIG_VARIABLE: str = "SNOW_REVOKE_PRIVILEGES_CONFIG"
+OUTPUT_VARIABLE: str = "SNOW_REVOKE_PRIVILEGES_OUTPUT"
+
+# Types of the settings declared in the `settings_schema` section of application.yaml.
+SETTING_TYPES: Dict[str, Tuple[type, ...]] = {
+    "bool": (bool,),
+    "int": (int,),
+    "float": (int, float),
+    "str": (str,),
+    "list": (list,),
+    "dict": (dict,),
+}
+
+# Content of the configuration files already parsed, with their modification time and size.
+CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+CACHE_LOCK: threading.Lock = threading.Lock()
+
+
+class ConfigurationError(ValueError):  # pylint: disable=unused-variable
+    """
+    The `ConfigurationError` exception is raised when the user configuration does not match the schema of the settings.
+    """
+
+
+def load_file(path: str) -> Dict[str, Any]:  # pylint: disable=unused-variable
+    """
+    The function returns the content of a YAML file, parsed once per process: the file is only parsed again when its
+    modification time or its size change (e.g. in a long-lived process embedding the application).
+    """
+
+    stat: os.stat_result = os.stat(path)
+    version: Tuple[int, int] = (stat.st_mtime_ns, stat.st_size)
+
+    with CACHE_LOCK:
+        cached: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = CACHE.get(path)
+
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+    with open(path, "r", encoding="UTF-8") as file:
+        content: Dict[str, Any] = yaml.safe_load(file) or {}
+
+    with CACHE_LOCK:
+        CACHE[path] = (version, content)
+
+    return content
+
 
 class Configuration:  # pylint: disable=unused-variable
-    """..."""
+    """
+    The `Configuration` class gives access to the user configuration (config.yaml) and to the application configuration
+    (application.yaml). The files are parsed once per process (see `load_file`), and each value returned is a copy
+    which can be modified by the caller.
+    """
+
+    # User configuration given directly instead of config.yaml (e.g. when the application is embedded).
+    user_configuration: Optional[Dict[str, Any]] = None
+
+    # Output directory given directly instead of the default one (e.g. one directory per shard).
+    output_directory: Optional[str] = None
+
+    def __init__(self, user_configuration: Optional[Dict[str, Any]] = None, output_directory: Optional[str] = None) -> None:
+        """
+        Args:
+            user_configuration (Dict[str, Any]): The `user_configuration` parameter replaces the content of config.yaml
+        (the sections `settings` and `snowflake_credentials`).
+            output_directory (str): The `output_directory` parameter replaces the output directory (and the environment
+        variable `SNOW_REVOKE_PRIVILEGES_OUTPUT`).
+        """
+        self.user_configuration = user_configuration
+        self.output_directory = output_directory
 
     def get_user_configuration(self, key: str) -> Any:
         """..."""
+
+        if self.user_configuration is not None:
+            return copy.deepcopy(self.user_configuration[key])
+
         return self.get_configuration(key, "config.yaml")
 
     def get_application_configuration(self, key: str) -> Any:
@@ -23,15 +98,115 @@ class Configuration:  # pylint: disable=unused-variable
         config_file_path: str = f"{os.path.dirname(__file__)}{os.sep}..{os.sep}config{os.sep}{filename}"
         config_file_path = os.path.realpath(config_file_path)
 
-        with open(config_file_path, "r", encoding="UTF-8") as file:
-            config: Dict[str, Dict[str, Any]] = json.loads(str(json.dumps(yaml.safe_load(file))))
+        if filename == "config.yaml" and os.environ.get(CONFIG_VARIABLE):
+            config_file_path = os.environ[CONFIG_VARIABLE]
 
-        return config[key]
+        return copy.deepcopy(load_file(config_file_path)[key])
 
     def get_output_path(self, filename: str) -> Any:
         """..."""
 
+        if self.output_directory is not None:
+            return os.path.join(self.output_directory, filename)
+
         output_path: str = f"{os.path.dirname(__file__)}{os.sep}..{os.sep}output{os.sep}{filename}"
         output_path = os.path.realpath(output_path)
 
+        if os.environ.get(OUTPUT_VARIABLE):
+            output_path = os.path.join(os.environ[OUTPUT_VARIABLE], filename)
+
         return output_path
+
+    def validate(self) -> Dict[str, Any]:
+        """
+        The function checks the settings of the user configuration against the `settings_schema` section of
+        application.yaml (mandatory settings, types, allowed values and minimums), before any connection with Snowflake.
+
+        Raises:
+            ConfigurationError: if the configuration file cannot be read or if some settings are invalid (all the
+        errors are given in the message).
+
+        Returns:
+            the settings checked.
+        """
+
+        try:
+            settings: Any = self.get_user_configuration("settings")
+            snowflake_credentials: Any = self.get_user_configuration("snowflake_credentials")
+        except (OSError, KeyError, yaml.YAMLError) as err:
+            raise ConfigurationError(f"The user configuration cannot be loaded: {err!r}.") from err
+
+        if not isinstance(settings, dict) or not isinstance(snowflake_credentials, dict):
+            raise ConfigurationError("The sections 'settings' and 'snowflake_credentials' of the user configuration must be mappings.")
+
+        errors: List[str] = self.__check_settings("", settings, self.get_application_configuration("settings_schema"))
+
+        # The SHOW commands do not return when an object was last altered, so a snapshot cannot detect the objects altered.
+        if settings.get("incremental") is True and settings.get("inventory_mode", "show") != "account_usage":
+            errors.append("'incremental' needs 'inventory_mode' set to account_usage (the SHOW commands do not return when an object was last altered)")
+
+        schema_shard: Any = settings.get("schema_shard")
+        bucket, buckets = (schema_shard.get("bucket"), schema_shard.get("buckets")) if isinstance(schema_shard, dict) else (None, None)
+
+        if isinstance(bucket, int) and isinstance(buckets, int) and bucket >= buckets:
+            errors.append(f"'schema_shard.bucket' must be lower than 'schema_shard.buckets' (found {bucket})")
+
+        if len(errors) > 0:
+            raise ConfigurationError("The settings of the user configuration are invalid: " + "; ".join(errors) + ".")
+
+        return settings
+
+    @staticmethod
+    def __check_settings(prefix: str, settings: Dict[str, Any], schema: Dict[str, Dict[str, Any]]) -> List[str]:
+        """
+        The function returns the errors of the settings of a mapping against its schema (an empty list if they are
+        valid), the names of the nested settings being prefixed with the name of their mapping (e.g. `retry.max_attempts`).
+        """
+
+        errors: List[str] = []
+
+        for name, rules in schema.items():
+            if name not in settings or settings[name] is None:
+                if rules.get("required", False) is True:
+                    errors.append(f"'{prefix}{name}' is mandatory")
+                continue
+
+            errors.extend(Configuration.__check_setting(f"{prefix}{name}", settings[name], rules))
+
+        unknown_settings: List[str] = sorted(f"{prefix}{name}" for name in set(settings) - set(schema))
+
+        if len(unknown_settings) > 0:
+            logging.getLogger("app").warning("The settings %s are unknown and will be ignored.", ", ".join(unknown_settings))
+
+        return errors
+
+    @staticmethod
+    def __check_setting(name: str, value: Any, rules: Dict[str, Any]) -> List[str]:
+        """
+        The function returns the errors of a setting (an empty list if it is valid).
+        """
+
+        types: Tuple[type, ...] = SETTING_TYPES[rules["type"]]
+
+        # A boolean is also an integer for Python.
+        if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+            return [f"'{name}' must be of type {rules['type']} (found {type(value).__name__})"]
+
+        errors: List[str] = []
+
+        # The values are compared exactly, as the classes of the run do, unless the setting ignores the case.
+        compared_value: Any = str(value).lower() if rules.get("ignore_case", False) is True else value
+
+        if "values" in rules and compared_value not in rules["values"]:
+            errors.append(f"'{name}' must be one of {', '.join(rules['values'])} (found {value})")
+
+        if "min" in rules and value < rules["min"]:
+            errors.append(f"'{name}' must be greater than or equal to {rules['min']} (found {value})")
+
+        if isinstance(value, list) and not all(isinstance(item, str) for item in value):
+            errors.append(f"'{name}' must be a list of strings")
+
+        if isinstance(value, dict) and "keys" in rules:
+            errors.extend(Configuration.__check_settings(f"{name}.", value, rules["keys"]))
+
+        return errors
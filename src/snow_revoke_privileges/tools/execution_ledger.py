@@ -0,0 +1,140 @@
+"""tools/execution_ledger.py"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import IO, Any, List, NamedTuple, Optional, Set
+
+
+class RequestResult(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `RequestResult` class describes the execution of a SQL request.
+    """
+
+    request: str
+    status: str
+    query_id: Optional[str]
+    duration: float
+    error: Optional[str] = None
+
+
+# Status of the requests recorded in the ledger.
+SUCCESS: str = "SUCCESS"
+FAILED: str = "FAILED"
+
+
+class ExecutionLedger:  # pylint: disable=unused-variable
+    """
+    The `ExecutionLedger` class appends the result of each SQL request to a JSON Lines file as soon as it completes,
+    so that an interrupted run can be resumed without executing again the requests which have already succeeded.
+    """
+
+    path: str
+    applied: Set[str]
+
+    def __init__(self, path: str, resume: bool = False) -> None:
+        """
+        Args:
+            path (str): The `path` parameter is the path of the ledger file.
+            resume (bool): The `resume` parameter indicates if the ledger of the previous run must be kept (otherwise a new one is started).
+        """
+
+        self.path = path
+        self.applied = set()
+        self.lock = threading.Lock()
+        self.file: Optional[IO[str]] = None
+
+        if resume:
+            self.applied = self.load()
+        elif os.path.exists(path):
+            os.remove(path)
+
+    @staticmethod
+    def get_hash(request: str) -> str:
+        """..."""
+        return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+    def load(self) -> Set[str]:
+        """
+        The function reads the ledger and returns the hash of the requests which have succeeded. A line truncated by an
+        interruption is ignored, and the requests which have failed are executed again.
+        """
+
+        applied: Set[str] = set()
+        failed: Set[str] = set()
+
+        if not os.path.exists(self.path):
+            return applied
+
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line in file:
+
+                try:
+                    entry: Any = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if entry.get("status") == SUCCESS:
+                    applied.add(str(entry.get("hash")))
+                elif entry.get("status") == FAILED:
+                    failed.add(str(entry.get("hash")))
+
+        if len(failed - applied) > 0:
+            logging.getLogger("app").info("A total of %s requests has failed during the previous run and will be executed again.", len(failed - applied))
+
+        return applied
+
+    def get_pending_requests(self, requests: List[str]) -> List[str]:
+        """
+        The function removes the requests already recorded as successful in the ledger.
+
+        Args:
+            requests (List[str]): The SQL requests to execute.
+
+        Returns:
+            the SQL requests which have not been applied yet.
+        """
+
+        pending: List[str] = [request for request in requests if self.get_hash(request) not in self.applied]
+
+        if len(pending) < len(requests):
+            logging.getLogger("app").info("A total of %s requests was already applied by a previous run and will be skipped.", len(requests) - len(pending))
+
+        return pending
+
+    def record(self, result: RequestResult) -> None:
+        """
+        The function appends the result of a SQL request to the ledger and flushes it immediately.
+
+        Args:
+            result (RequestResult): The result of the SQL request.
+        """
+
+        entry: str = json.dumps({
+            "hash": self.get_hash(result.request),
+            "status": result.status,
+            "query_id": result.query_id,
+            "duration": round(result.duration, 3),
+            "error": result.error,
+        })
+
+        with self.lock:
+
+            if self.file is None:
+                self.file = open(self.path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+
+            self.file.write(entry + "\n")
+            self.file.flush()
+
+            if result.status == SUCCESS:
+                self.applied.add(self.get_hash(result.request))
+
+    def close(self) -> None:
+        """..."""
+
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
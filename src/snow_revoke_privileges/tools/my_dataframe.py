@@ -1,6 +1,9 @@
 """tools/my_dataframe.py"""
 
-from typing import Any, Dict, List
+import array
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
 import pandas as pd
 
 
@@ -17,9 +20,39 @@ def concat_dataframe(list_dataframes: List[pd.DataFrame]) -> pd.DataFrame:  # py
     concatenating the list of pandas DataFrames passed as an argument to the function.
     """
 
+    list_dataframes = unify_categories(list_dataframes)
     return pd.concat(list_dataframes).reset_index(drop=True)  # type: ignore
 
 
+def unify_categories(list_dataframes: List[pd.DataFrame]) -> List[pd.DataFrame]:  # pylint: disable=unused-variable
+    """
+    The function gives the same categories to the categorical columns shared by all the pandas DataFrames, so
+    that their concatenation keeps these columns categorical instead of falling back to Python objects.
+
+    Args:
+      list_dataframes (List[pd.DataFrame]): A list of pandas DataFrames that will be concatenated.
+
+    Returns:
+      the list of pandas DataFrames with aligned categories.
+    """
+
+    if len(list_dataframes) < 2:
+        return list_dataframes
+
+    columns: List[str] = [column for column in list_dataframes[0].columns if all(column in dataframe and isinstance(dataframe[column].dtype, pd.CategoricalDtype) for dataframe in list_dataframes)]
+
+    if len(columns) == 0:
+        return list_dataframes
+
+    categories: Dict[str, List[Any]] = {
+        column:
+            list(dict.fromkeys(category for dataframe in list_dataframes for category in dataframe[column].cat.categories))  # pyright: ignore
+        for column in columns
+    }
+
+    return [dataframe.assign(**{column: dataframe[column].cat.set_categories(categories[column]) for column in columns}) for dataframe in list_dataframes]  # pyright: ignore
+
+
 def concat_column(current_dataframe: pd.DataFrame, column_dst: str, columns_src: List[str], separator: str = ".", enclosure: str = "") -> None:  # pylint: disable=unused-variable
     """
     The function concatenates multiple columns in a pandas DataFrame into a single column using a
@@ -143,3 +176,244 @@ def create_dataframe(data: List[Any], column_names: List[str]) -> pd.DataFrame:
     current_dataframe: pd.DataFrame = pd.DataFrame(data)
     set_column_names(current_dataframe, column_names)
     return current_dataframe
+
+
+class DataFrameBuilder:  # pylint: disable=unused-variable
+    """
+    The `DataFrameBuilder` class collects pandas DataFrames and concatenates them only once when the result is
+    requested, instead of copying the whole accumulated DataFrame each time a new one is appended.
+    """
+
+    chunks: List[pd.DataFrame]
+    rows: int
+
+    def __init__(self) -> None:
+        """..."""
+        self.chunks = []
+        self.rows = 0
+
+    def __len__(self) -> int:
+        """..."""
+        return self.rows
+
+    def append(self, current_dataframe: pd.DataFrame) -> None:
+        """
+        The function appends a pandas DataFrame to the ones already collected, without copying them.
+
+        Args:
+          current_dataframe (pd.DataFrame): A pandas DataFrame to append (ignored if it is empty).
+        """
+
+        if len(current_dataframe) > 0:
+            self.chunks.append(current_dataframe)
+            self.rows += len(current_dataframe)
+
+    def build(self) -> pd.DataFrame:
+        """
+        The function concatenates all the pandas DataFrames collected so far.
+
+        Returns:
+          a pandas DataFrame with a new index. The result is kept so that calling the function again is free.
+        """
+
+        if len(self.chunks) == 0:
+            return pd.DataFrame([])
+
+        if len(self.chunks) > 1:
+            self.chunks = [concat_dataframe(self.chunks)]
+
+        return self.chunks[0]
+
+
+class SymbolTable:  # pylint: disable=unused-variable
+    """
+    The `SymbolTable` class interns the strings repeated across the rows of the privileges (keys of objects, types,
+    grantees) and gives each distinct string an integer code, so that each string is stored once whatever the number
+    of rows referencing it.
+    """
+
+    symbols: List[str]
+    codes: Dict[str, int]
+
+    def __init__(self) -> None:
+        """..."""
+        self.symbols = []
+        self.codes = {}
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """..."""
+        return len(self.symbols)
+
+    def encode(self, values: Iterable[Any]) -> List[int]:
+        """
+        The function returns the code of each value, and adds the values seen for the first time to the table. The
+        missing values get the code -1.
+
+        Args:
+          values (Iterable[Any]): The values to encode (converted into strings).
+
+        Returns:
+          the list of the codes.
+        """
+
+        codes: List[int] = []
+
+        with self.lock:
+            for value in values:
+
+                if value is None or value is pd.NA or (isinstance(value, float) and np.isnan(value)):
+                    codes.append(-1)
+                    continue
+
+                symbol: str = str(value)
+                code: Optional[int] = self.codes.get(symbol)
+
+                if code is None:
+                    code = len(self.symbols)
+                    self.codes[symbol] = code
+                    self.symbols.append(symbol)
+
+                codes.append(code)
+
+        return codes
+
+    def get_dtype(self) -> pd.CategoricalDtype:
+        """
+        The function returns a categorical type whose categories are the strings of the table, in the order of their codes.
+        """
+
+        with self.lock:
+            return pd.CategoricalDtype(pd.Index(self.symbols, dtype=object))
+
+
+class CompactFrameBuilder:  # pylint: disable=unused-variable
+    """
+    The `CompactFrameBuilder` class collects rows without creating a pandas DataFrame for each of them: the strings
+    are stored as 32-bit codes of a `SymbolTable` and the booleans as bytes. The pandas DataFrame built at the end
+    has categorical columns sharing the same categories, instead of one Python string per cell.
+    """
+
+    string_columns: List[str]
+    bool_columns: List[str]
+    symbols: SymbolTable
+
+    def __init__(self, string_columns: List[str], bool_columns: List[str], symbols: Optional[SymbolTable] = None) -> None:
+        """
+        Args:
+          string_columns (List[str]): The columns containing strings.
+          bool_columns (List[str]): The columns containing booleans.
+          symbols (SymbolTable): The table encoding the strings (a new one by default).
+        """
+
+        self.string_columns = string_columns
+        self.bool_columns = bool_columns
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.data: Dict[str, "array.array[int]"] = {column: array.array("i") for column in string_columns}
+        self.data.update({column: array.array("b") for column in bool_columns})
+        self.rows = 0
+
+    def __len__(self) -> int:
+        """..."""
+        return self.rows
+
+    def append_rows(self, rows: int, columns: Dict[str, Any]) -> None:
+        """
+        The function appends rows given column by column: a column is either a list of `rows` values or a single
+        value repeated on all the rows (e.g. the key of the object whose grants were retrieved).
+
+        Args:
+          rows (int): The number of rows appended.
+          columns (Dict[str, Any]): The values of each column of the builder.
+        """
+
+        if rows == 0:
+            return
+
+        for column in self.string_columns:
+            values: Any = columns[column]
+
+            if isinstance(values, (list, tuple)):
+                self.data[column].extend(self.symbols.encode(values))
+            else:
+                self.data[column].extend(self.symbols.encode([values]) * rows)
+
+        for column in self.bool_columns:
+            values = columns[column]
+            self.data[column].extend([bool(value) for value in values] if isinstance(values, (list, tuple)) else [bool(values)] * rows)
+
+        self.rows += rows
+
+    def append(self, current_dataframe: pd.DataFrame) -> None:
+        """
+        The function appends the rows of a pandas DataFrame containing the columns of the builder.
+        """
+
+        self.append_rows(len(current_dataframe), {column: current_dataframe[column].tolist() for column in self.string_columns + self.bool_columns})
+
+    def build(self) -> pd.DataFrame:
+        """
+        The function returns the rows collected as a pandas DataFrame, with the columns in their order of declaration.
+        """
+
+        if self.rows == 0:
+            return pd.DataFrame([])
+
+        dtype: pd.CategoricalDtype = self.symbols.get_dtype()
+        columns: Dict[str, Any] = {}
+
+        for column in self.string_columns:
+            columns[column] = pd.Categorical.from_codes(np.frombuffer(self.data[column], dtype=np.int32), dtype=dtype)  # type: ignore
+
+        for column in self.bool_columns:
+            columns[column] = np.frombuffer(self.data[column], dtype=np.int8).astype(bool)
+
+        return pd.DataFrame(columns)
+
+
+def encode_strings(current_dataframe: pd.DataFrame, max_ratio: float = 0.5) -> pd.DataFrame:  # pylint: disable=unused-variable
+    """
+    The function converts the string columns with few distinct values (e.g. type of object, privilege, grantee)
+    into categorical columns, which store each distinct string once and a small integer code per row.
+
+    Args:
+      current_dataframe (pd.DataFrame): A pandas DataFrame whose string columns will be encoded.
+      max_ratio (float): The maximum ratio between the number of distinct values and the number of rows for a
+    column to be encoded.
+
+    Returns:
+      a pandas DataFrame with the encoded columns. The columns containing missing values are kept as they are,
+    so that their conversion into strings is unchanged.
+    """
+
+    rows: int = len(current_dataframe)
+
+    if rows == 0:
+        return current_dataframe
+
+    for column in current_dataframe.columns:
+
+        current_column: "pd.Series[Any]" = current_dataframe[column]
+
+        if isinstance(current_column.dtype, pd.CategoricalDtype) or not pd.api.types.is_string_dtype(current_column) or current_column.hasnans:
+            continue
+
+        if current_column.nunique() <= rows * max_ratio:
+            current_dataframe[column] = current_column.astype(object).astype("category")
+
+    return current_dataframe
+
+
+def to_string_column(current_column: "pd.Series[Any]") -> "pd.Series[str]":  # pylint: disable=unused-variable
+    """
+    The function converts each value of a pandas Series into a string, exactly as `str()` would do it
+    (missing values become 'None' or 'nan').
+
+    Args:
+      current_column (pd.Series): A pandas Series containing the values to convert.
+
+    Returns:
+      a pandas Series of strings with the same index.
+    """
+
+    return current_column.astype(object).map(str)  # type: ignore
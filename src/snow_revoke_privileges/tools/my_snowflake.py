@@ -2,39 +2,281 @@
 
 import logging
 import re
-from typing import Any, Dict, List, Optional
-
-from multiprocessing import Pool
-
-from progress.bar import Bar  # pyright: ignore
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, TypeVar
 
 import pandas as pd
 
-import snowflake.connector as sc
-from snowflake.connector import SnowflakeConnection
-
-from snow_revoke_privileges.tools.my_dataframe import create_dataframe
+from snowflake.connector.cursor import SnowflakeCursor
+from snowflake.connector.errors import NotSupportedError, ProgrammingError
+
+from snow_revoke_privileges.tools.my_dataframe import concat_dataframe, encode_strings
+from snow_revoke_privileges.tools.retry_policy import RetryPolicy
+from snow_revoke_privileges.tools.concurrency_controller import ConcurrencyController
+from snow_revoke_privileges.tools.run_metrics import RunMetrics
+from snow_revoke_privileges.tools.stage_profiler import StageProfiler
+from snow_revoke_privileges.tools.snowflake_async_executor import ExecutionContext, SnowflakeAsyncExecutor
+from snow_revoke_privileges.tools.snowflake_pool import SnowflakeConnectionPool
+
+TaskInput = TypeVar("TaskInput")
+TaskOutput = TypeVar("TaskOutput")
+
+
+class SnowflakeOptions(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `SnowflakeOptions` class gathers the options of the connections and of the execution of the requests given
+    to `MySnowflake.initialize_database`.
+
+    Attributes:
+        size (int): The number of connections, and so the number of requests executed at the same time.
+        connect (Callable): The function opening a connection (by default `snowflake.connector.connect`).
+        async_window (int): The number of requests in flight with the asynchronous execution (0 to disable it).
+        batch_size (int): The number of statements sent in each multi-statement request (0 or 1 to disable it).
+        retry_policy (RetryPolicy): The policy applied to the transient errors (by default 5 attempts).
+        controller (ConcurrencyController): The controller adapting the number of requests executed at the same time
+    (by default fixed to `size`). The pool opens up to its maximum window.
+        metrics (RunMetrics): The measures of the requests of the run (by default a new one).
+        query_tag (bool): Indicates if the sessions are tagged with the run ID and the current phase.
+        profiler (StageProfiler): The profiler of the tasks executed by the threads of the pool (by default disabled).
+    """
+
+    size: int = 8
+    connect: Optional[Callable[..., Any]] = None
+    async_window: int = 0
+    batch_size: int = 0
+    retry_policy: Optional[RetryPolicy] = None
+    controller: Optional[ConcurrencyController] = None
+    metrics: Optional[RunMetrics] = None
+    query_tag: bool = False
+    profiler: Optional[StageProfiler] = None
 
 
 class MySnowflake:
     """..."""
 
-    snow_cnn: SnowflakeConnection
+    pool: SnowflakeConnectionPool
+
+    # Maximum number of requests in flight with the asynchronous execution (0 to disable it).
+    async_window: int = 0
+
+    # Number of statements sent in each multi-statement request (0 or 1 to disable it).
+    batch_size: int = 0
+
+    # Policy applied to the requests which fail with a transient error.
+    retry_policy: RetryPolicy = RetryPolicy()
+
+    # Controller of the number of requests executed at the same time by `imap_unordered`.
+    controller: ConcurrencyController = ConcurrencyController()
+
+    # Measures of the run, phase by phase (see `RunMetrics`).
+    metrics: RunMetrics = RunMetrics()
+
+    # Profiler of the tasks executed by `imap_unordered` (disabled by default, see `StageProfiler`).
+    profiler: StageProfiler = StageProfiler()
 
     @staticmethod
-    def initialize_database(config: Dict[str, Any]) -> None:
+    def initialize_database(config: Dict[str, Any], options: Optional[SnowflakeOptions] = None) -> None:
         """
-        The function initializes a Snowflake database connection using credentials and admin role specified
+        The function initializes a pool of Snowflake database connections using credentials and admin role specified
         in the configuration.
+
+        Args:
+            config (Dict[str, Any]): The `config` parameter contains the credentials given to the connector.
+            options (SnowflakeOptions): The `options` parameter contains the options of the connections and of the
+        execution of the requests (by default 8 connections executing the requests one by one).
+        """
+
+        options = options if options is not None else SnowflakeOptions()
+
+        MySnowflake.controller = options.controller if options.controller is not None else ConcurrencyController(options.size, options.size)
+        MySnowflake.pool = SnowflakeConnectionPool(config, max(options.size, MySnowflake.controller.max_window), options.connect)
+        MySnowflake.async_window = options.async_window
+        MySnowflake.batch_size = options.batch_size
+        MySnowflake.retry_policy = options.retry_policy if options.retry_policy is not None else RetryPolicy()
+        MySnowflake.retry_policy.listener = MySnowflake.__record_error
+        MySnowflake.metrics = options.metrics if options.metrics is not None else RunMetrics()
+        MySnowflake.pool.query_tag = MySnowflake.__get_query_tag if options.query_tag else None
+        MySnowflake.profiler = options.profiler if options.profiler is not None else StageProfiler()
+
+        # The first connection is opened now to check the credentials.
+        MySnowflake.retry_policy.call(MySnowflake.__check_connection)
+
+    @staticmethod
+    def get_execution_context() -> ExecutionContext:
+        """
+        The function returns the metrics, the concurrency controller and the retry policy of the pool, to which the
+        asynchronous execution reports the requests.
+        """
+
+        return ExecutionContext(MySnowflake.metrics, MySnowflake.controller, MySnowflake.retry_policy)
+
+    @staticmethod
+    def __record_error(error: BaseException) -> None:
+        """
+        The function reports a transient error followed by a new attempt to the concurrency controller and to the metrics.
+        """
+
+        MySnowflake.controller.record_error(error)
+        MySnowflake.metrics.record_retry(error)
+
+    @staticmethod
+    def __get_query_tag() -> str:
+        """
+        The function returns the QUERY_TAG of the current phase of the run as a SQL string literal.
+        """
+
+        return MySnowflake.quote_literal(MySnowflake.metrics.get_query_tag())
+
+    @staticmethod
+    def __check_connection() -> None:
+        """..."""
+
+        with MySnowflake.pool.connection():
+            logging.getLogger("app").debug("Connection with Snowflake: OK")
+
+    @staticmethod
+    def imap_unordered(task: Callable[[TaskInput], TaskOutput], items: Iterable[TaskInput]) -> Iterator[TaskOutput]:
+        """
+        The function executes a task for each item with as many threads as connections in the pool, and yields
+        the results as soon as they are available.
+
+        Args:
+            task (Callable): The `task` parameter is the function executed for each item.
+            items (Iterable): The `items` parameter contains the items to process.
+
+        Returns:
+            an iterator on the results of the task, in the order of completion.
+        """
+
+        controller: ConcurrencyController = MySnowflake.controller
+        pending: Set[Future[TaskOutput]] = set()
+
+        with ThreadPoolExecutor(max_workers=controller.max_window) as executor:
+
+            # The items are submitted progressively, as soon as the window of the controller allows it.
+            for item in items:
+                controller.acquire()
+                pending.add(executor.submit(MySnowflake.__run_controlled, task, item))
+
+                done: Set[Future[TaskOutput]] = {future for future in pending if future.done()}
+                pending -= done
+
+                for future in done:
+                    yield future.result()
+
+            for future in as_completed(pending):
+                yield future.result()
+
+    @staticmethod
+    def imap_released(task: Callable[[TaskInput], TaskOutput], release: Callable[[], List[TaskInput]]) -> Iterator[TaskOutput]:
+        """
+        The function executes a task for the items released progressively (e.g. the requests whose dependencies have
+        completed) with as many threads as connections in the pool, and yields the results as soon as they are
+        available. Unlike `imap_unordered` with a generator waiting for the next items, the results already available
+        are yielded while the tasks running have not released new items.
+
+        Args:
+            task (Callable): The `task` parameter is the function executed for each item.
+            release (Callable): The `release` parameter returns the items ready to be processed, without waiting. It is
+        called again each time a task completes, and the iteration ends when no task is running and no item is released.
+
+        Returns:
+            an iterator on the results of the task, in the order of completion.
+        """
+
+        controller: ConcurrencyController = MySnowflake.controller
+        pending: Set[Future[TaskOutput]] = set()
+
+        with ThreadPoolExecutor(max_workers=controller.max_window) as executor:
+
+            while True:
+
+                # The items are submitted as soon as the window of the controller allows it.
+                for item in release():
+                    controller.acquire()
+                    pending.add(executor.submit(MySnowflake.__run_controlled, task, item))
+
+                if len(pending) == 0:
+                    return
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    yield future.result()
+
+    @staticmethod
+    def imap_chunks(task: Callable[[Tuple[TaskInput, ...]], List[TaskOutput]], items: List[TaskInput], chunk_size: int = 0) -> Iterator[TaskOutput]:
         """
+        The function executes a task for each chunk of items with `imap_unordered`, so that a thread receives several
+        items at once, and yields the results of the items as soon as their chunk is completed.
 
-        cnx: SnowflakeConnection = sc.connect(**config)  # type: ignore
-        cur = cnx.cursor(sc.DictCursor)
-        cur.execute(f"USE ROLE {config['role']};")
+        Args:
+            task (Callable): The `task` parameter is the function executed for each chunk, returning a list of results.
+            items (List): The `items` parameter contains the items to process.
+            chunk_size (int): The `chunk_size` parameter is the number of items of each chunk (0 to compute it from the
+        number of items, see `get_chunk_size`).
+
+        Returns:
+            an iterator on the results of the task, in the order of completion of the chunks.
+        """
 
-        logging.getLogger("app").debug("Connection with Snowflake: OK")
+        size: int = chunk_size if chunk_size > 0 else MySnowflake.get_chunk_size(len(items))
+        chunks: List[Tuple[TaskInput, ...]] = [tuple(items[i:i + size]) for i in range(0, len(items), size)]
 
-        MySnowflake.snow_cnn = cnx
+        for results in MySnowflake.imap_unordered(task, chunks):
+            yield from results
+
+    @staticmethod
+    def get_chunk_size(count: int, max_size: int = 16) -> int:
+        """
+        The function returns the number of items of each chunk: about four chunks per thread of the window (as
+        `multiprocessing.Pool.map`), and at most `max_size` items so that the small accounts still use all the
+        connections and the latency measured by the concurrency controller stays meaningful.
+        """
+
+        return max(1, min(max_size, count // (MySnowflake.controller.max_window * 4)))
+
+    @staticmethod
+    def __run_controlled(task: Callable[[TaskInput], TaskOutput], item: TaskInput) -> TaskOutput:
+        """
+        The function executes a task (profiled with `--profile`) and reports its latency to the concurrency controller.
+        """
+
+        start: float = time.perf_counter()
+        failed: bool = False
+
+        try:
+            return MySnowflake.profiler.run(task, item)
+        except Exception as err:
+            failed = MySnowflake.retry_policy.is_transient(err)
+            raise
+        finally:
+            MySnowflake.controller.release(time.perf_counter() - start, failed)
+
+    @staticmethod
+    def fetch_pandas_multi(requests: Iterable[str]) -> Iterator[Tuple[str, pd.DataFrame]]:  # pylint: disable=unused-variable
+        """
+        The function fetches the data of several SQL queries at the same time and yields each query with its
+        pandas DataFrame in the order of completion.
+
+        Args:
+            requests (Iterable[str]): The SQL queries to be executed on the Snowflake database.
+
+        Returns:
+            an iterator on the tuples (request, pandas DataFrame).
+        """
+
+        if MySnowflake.async_window <= 0:
+            yield from MySnowflake.imap_unordered(lambda request: (request, MySnowflake.fetch_pandas_all(request)), requests)
+            return
+
+        for result, data, error in SnowflakeAsyncExecutor(MySnowflake.pool, MySnowflake.async_window, MySnowflake.get_execution_context(), MySnowflake.__read_cursor).run(requests):
+
+            if error is not None:
+                raise error
+
+            yield (result.request, data if data is not None else pd.DataFrame([]))
 
     @staticmethod
     def fetch_pandas_all(request: str) -> pd.DataFrame:  # pylint: disable=unused-variable
@@ -43,64 +285,195 @@ class MySnowflake:
         pandas DataFrame.
 
         Args:
-        cnx (SnowflakeConnection): The parameter `cnx` is a SnowflakeConnection object, which represents a
-        connection to a Snowflake database. It is used to execute SQL queries and fetch results from the
-        database.
-        request (str): The SQL query to be executed on the Snowflake database.
+        request (str): The SQL query to be executed on the Snowflake database, with a connection of the pool.
 
         Returns:
         a pandas DataFrame created from the results of a SQL query executed on a Snowflake database
         connection.
         """
 
-        cur = MySnowflake.snow_cnn.cursor(sc.DictCursor)
+        return MySnowflake.retry_policy.call(MySnowflake.__fetch_pandas_all, request)
 
-        try:
-            cur.execute(request)
-            all_rows: List[Dict[Any, Any]] = cur.fetchall()  # type: ignore
-            field_names: List[str] = [i[0] for i in cur.description]
-        finally:
-            cur.close()
+    @staticmethod
+    def __fetch_pandas_all(request: str) -> pd.DataFrame:
+        """..."""
+
+        start: float = time.perf_counter()
+        rows: Optional[int] = None
+
+        with MySnowflake.pool.connection() as cnx:
+            cur = cnx.cursor()
+
+            try:
+                cur.execute(request)
+                result: pd.DataFrame = MySnowflake.concat_batches(cur, list(MySnowflake.fetch_cursor_batches(cur)))
+                rows = len(result)
+            finally:
+                cur.close()
+                MySnowflake.metrics.record_query(request, time.perf_counter() - start, rows or 0, rows is None)
+
+        return result
+
+    @staticmethod
+    def fetch_pandas_chunks(request: str, chunk_size: int = 10000) -> Iterator[pd.DataFrame]:  # pylint: disable=unused-variable
+        """
+        The function fetches data from a Snowflake database using a provided SQL query and yields it as pandas
+        DataFrames of at most `chunk_size` rows, so that all the rows are never held in memory at once.
 
-        return create_dataframe(all_rows, field_names)
+        Args:
+        request (str): The SQL query to be executed on the Snowflake database.
+        chunk_size (int): The maximum number of rows of each pandas DataFrame.
+
+        Returns:
+        an iterator on pandas DataFrames.
+        """
+
+        start: float = time.perf_counter()
+        rows: int = 0
+        failed: bool = False
+
+        with MySnowflake.pool.connection() as cnx:
+            cur = cnx.cursor()
+
+            try:
+                # Only the execution is retried: the chunks already yielded cannot be taken back.
+                MySnowflake.retry_policy.call(cur.execute, request)
+
+                for chunk in MySnowflake.fetch_cursor_batches(cur, chunk_size):
+                    rows += len(chunk)
+                    yield chunk
+
+            except Exception:
+                failed = True
+                raise
+            finally:
+                cur.close()
+                MySnowflake.metrics.record_query(request, time.perf_counter() - start, rows, failed)
 
     @staticmethod
-    def execute_single_request(request: str) -> None:  # pylint: disable=unused-variable
+    def fetch_cursor_batches(cur: SnowflakeCursor, chunk_size: int = 10000) -> Iterator[pd.DataFrame]:  # pylint: disable=unused-variable
         """
-        The function executes a single SQL request using a Snowflake connection and a cursor.
+        The function yields the rows of an executed query as typed pandas DataFrames built from the Arrow batches
+        returned by Snowflake. The results which are not in the Arrow format (e.g. SHOW commands) or a connector
+        without `pyarrow` fall back to plain tuples fetched `chunk_size` rows at a time, never to one dictionary per row.
+        The repeated strings (types, privileges, grantees, ...) are dictionary-encoded.
 
         Args:
-        cnx (SnowflakeConnection): The parameter `cnx` is of type `SnowflakeConnection`, which is a
-        connection object used to connect to a Snowflake database. It is likely created using the
-        `snowflake.connector.connect()` method.
-        request (str): The `request` parameter is a string that contains a SQL query to be executed on a
-        Snowflake database. The function `execute_single_request` takes this query as input and executes it
-        using the provided `cnx` connection object. The result of the query execution is not returned by
-        this function.
+        cur (SnowflakeCursor): A cursor on which the query has been executed.
+        chunk_size (int): The maximum number of rows of each pandas DataFrame when the Arrow format is not available.
+
+        Returns:
+        an iterator on pandas DataFrames.
         """
 
+        batches: Iterator[pd.DataFrame]
+
         try:
-            cur = MySnowflake.snow_cnn.cursor(sc.DictCursor)
-            cur.execute(request)
-        except Exception as err:  # pylint: disable=broad-exception-caught
-            logging.getLogger("app").fatal("SQL request : '%s' has failed (%s).", request, type(err))
+            batches = cur.fetch_pandas_batches()
+        except (NotSupportedError, ProgrammingError):
+            batches = MySnowflake.fetch_tuple_batches(cur, chunk_size)
+
+        for batch in batches:
+            if len(batch) > 0:
+                yield encode_strings(batch)
 
     @staticmethod
-    def execute_multi_requests(requests: List[str]) -> None:  # pylint: disable=unused-variable
+    def concat_batches(cur: SnowflakeCursor, batches: List[pd.DataFrame]) -> pd.DataFrame:  # pylint: disable=unused-variable
+        """
+        The function concatenates the pandas DataFrames returned by `fetch_cursor_batches`, and returns an empty
+        pandas DataFrame with the columns of the query when no row has been returned.
         """
-        The function executes multiple SQL requests using a Snowflake connection object.
+
+        if len(batches) == 0:
+            return pd.DataFrame(columns=[i[0] for i in cur.description])
+
+        if len(batches) == 1:
+            return batches[0]
+
+        return concat_dataframe(batches)
+
+    @staticmethod
+    def __read_cursor(cur: SnowflakeCursor) -> pd.DataFrame:
+        """
+        The function reads all the rows of an executed query as a single pandas DataFrame.
+        """
+
+        return MySnowflake.concat_batches(cur, list(MySnowflake.fetch_cursor_batches(cur)))
+
+    @staticmethod
+    def fetch_tuple_batches(cur: SnowflakeCursor, chunk_size: int = 10000) -> Iterator[pd.DataFrame]:  # pylint: disable=unused-variable
+        """..."""
+
+        field_names: List[str] = [i[0] for i in cur.description]
+
+        while True:
+            rows: List[Tuple[Any, ...]] = cur.fetchmany(chunk_size)  # type: ignore
+
+            if len(rows) == 0:
+                break
+
+            yield pd.DataFrame.from_records(rows, columns=field_names)
+
+    @staticmethod
+    def fetch_pandas_pages(request: str, page_size: int = 10000, name_column: str = "name") -> Iterator[pd.DataFrame]:  # pylint: disable=unused-variable
+        """
+        The function fetches the rows of a SHOW command page by page with `LIMIT <page_size> FROM '<last name>'`,
+        so that the output is not truncated by the limit of the SHOW commands, and yields them as pandas DataFrames.
+        The rows are sorted by database, schema and name but FROM only compares the names: the names must be unique
+        in the scope of the command (e.g. SHOW TABLES IN SCHEMA), otherwise rows are skipped or returned twice.
 
         Args:
-        cnx (SnowflakeConnection): The parameter "cnx" is of type SnowflakeConnection, which is likely a
-        connection object to a Snowflake database.
-        requests (List[str]): A list of SQL queries to be executed on a Snowflake database connection.
+        request (str): The SHOW command to be executed on the Snowflake database (without LIMIT).
+        page_size (int): The maximum number of rows requested for each page.
+        name_column (str): The column containing the name of the objects, used as cursor between two pages.
+
+        Returns:
+        an iterator on pandas DataFrames.
         """
 
-        with Bar("Executing request in Snowflake", max=len(requests)) as progress:
+        last_name: Optional[str] = None
+        boundary_rows: Set[Tuple[Any, ...]] = set()
+
+        while True:
+
+            paginated_request: str = f"{request} LIMIT {page_size}"
+
+            if last_name is not None:
+                paginated_request += f" FROM {MySnowflake.quote_literal(last_name)}"
 
-            with Pool(processes=8) as pool:
-                for _ in pool.imap_unordered(MySnowflake.execute_single_request, requests):  # pyright: ignore
-                    progress.next()
+            page_rows: int = 0
+            new_rows: int = 0
+            page_last_name: Optional[str] = None
+            page_boundary_rows: Set[Tuple[Any, ...]] = set()
+
+            for chunk in MySnowflake.fetch_pandas_chunks(paginated_request, page_size):
+
+                page_rows += len(chunk)
+                rows: List[Tuple[Any, ...]] = list(chunk.itertuples(index=False, name=None))
+                name_position: int = list(chunk.columns).index(name_column)
+
+                # The page starts with the last object of the previous page, which must not be returned twice.
+                chunk = chunk.loc[[row not in boundary_rows for row in rows]]
+                new_rows += len(chunk)
+
+                if str(rows[-1][name_position]) != page_last_name:
+                    page_boundary_rows = set()
+
+                page_last_name = str(rows[-1][name_position])
+                page_boundary_rows.update(row for row in rows if str(row[name_position]) == page_last_name)
+
+                if len(chunk) > 0:
+                    yield chunk
+
+            if page_rows < page_size:
+                return
+
+            if new_rows == 0:
+                logging.getLogger("app").warning("The pagination of '%s' has stopped on '%s' without any new row.", request, last_name)
+                return
+
+            last_name = page_last_name
+            boundary_rows = page_boundary_rows
 
     @staticmethod
     def get_arguments(arguments: Optional[str]) -> str:
@@ -124,3 +497,133 @@ class MySnowflake:
             return str(matches.groups(1)[0])
 
         return ""
+
+    @staticmethod
+    def quote_identifier(name: str) -> str:
+        """
+        The function encloses an identifier in double quotes so that it can be used as is in a SQL request.
+
+        Args:
+            name (str): The `name` parameter is the raw identifier (e.g. a role name) as returned by a SHOW command.
+
+        Returns:
+            a string containing the quoted identifier.
+        """
+
+        return "\"" + name.replace("\"", "\"\"") + "\""
+
+    @staticmethod
+    def quote_literal(value: str) -> str:
+        """
+        The function encloses a value in single quotes so that it can be used as a string literal in a SQL request.
+
+        Args:
+            value (str): The `value` parameter is the raw value (e.g. a database name).
+
+        Returns:
+            a string containing the quoted value.
+        """
+
+        return "'" + value.replace("'", "''") + "'"
+
+    @staticmethod
+    def split_identifier(name: str) -> List[str]:
+        """
+        The function splits a qualified name returned by a SHOW GRANTS command (e.g. `DB.SCHEMA."My Table"`) into its unquoted parts.
+
+        Args:
+            name (str): The `name` parameter is a qualified name where each part may be enclosed in double quotes.
+
+        Returns:
+            a list of strings containing each part of the qualified name.
+        """
+
+        parts: List[str] = []
+        current: str = ""
+        quoted: bool = False
+        position: int = 0
+
+        while position < len(name):
+            character: str = name[position]
+
+            if character == "\"" and quoted and name[position + 1:position + 2] == "\"":
+                current += "\""
+                position += 1
+            elif character == "\"":
+                quoted = not quoted
+            elif character == "." and not quoted:
+                parts.append(current)
+                current = ""
+            else:
+                current += character
+
+            position += 1
+
+        parts.append(current)
+
+        return parts
+
+    @staticmethod
+    def get_key_object(name: str, with_arguments: bool = False) -> str:
+        """
+        The function converts a qualified name returned by a SHOW GRANTS command into the `KEY_OBJECT` format used by `SnowObjects`.
+
+        Args:
+            name (str): The `name` parameter is a qualified name such as `DB.SCHEMA.TABLE` or `DB.SCHEMA."FUNC(A VARCHAR):VARCHAR"`.
+            with_arguments (bool): The `with_arguments` parameter indicates if the name ends with the signature of a procedure or a function.
+
+        Returns:
+            a string containing the key of the object (e.g. `"DB"."SCHEMA"."TABLE"`).
+        """
+
+        parts: List[str] = MySnowflake.split_identifier(name)
+
+        if with_arguments:
+            parts[-1] = parts[-1].split("(", 1)[0]
+
+        return ".".join(f"\"{part}\"" for part in parts)
+
+    @staticmethod
+    def get_signature(arguments: Optional[str], named: bool = False) -> str:
+        """
+        The function normalizes the arguments of a procedure or a function so that the same signature can be compared whatever the SHOW command used.
+
+        Args:
+            arguments (str): The `arguments` parameter is a string such as `(VARCHAR, NUMBER)` or `FUNC(A VARCHAR, B NUMBER(38,0)):VARCHAR`.
+            named (bool): The `named` parameter indicates if each argument is prefixed by its name (as in the SHOW GRANTS output).
+
+        Returns:
+            a string containing only the data types of the arguments (e.g. `(VARCHAR,NUMBER)`), or an empty string.
+        """
+
+        if arguments is None or "(" not in arguments:
+            return ""
+
+        start: int = arguments.index("(")
+        depth: int = 0
+        current: str = ""
+        data_types: List[str] = []
+
+        for character in arguments[start + 1:]:
+            if character == "(":
+                depth += 1
+            elif character == ")" and depth == 0:
+                break
+            elif character == ")":
+                depth -= 1
+            elif character == "," and depth == 0:
+                data_types.append(current)
+                current = ""
+            elif depth == 0:
+                current += character
+
+        data_types.append(current)
+        signature: List[str] = []
+
+        for data_type in data_types:
+            tokens: List[str] = data_type.split()
+
+            if len(tokens) > 0:
+                signature.append(" ".join(tokens[1:] if named else tokens).upper())
+
+        return f"({','.join(signature)})"
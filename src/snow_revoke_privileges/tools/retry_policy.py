@@ -0,0 +1,166 @@
+"""tools/retry_policy.py"""
+
+import logging
+import os
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from snowflake.connector.errors import (
+    BadGatewayError,
+    DatabaseError,
+    GatewayTimeoutError,
+    InterfaceError,
+    InternalServerError,
+    OperationalError,
+    OtherHTTPRetryableError,
+    RequestExceedMaxRetryError,
+    RequestTimeoutError,
+    ServiceUnavailableError,
+    TooManyRequests,
+)
+
+from snow_revoke_privileges.tools.execution_ledger import FAILED, RequestResult
+
+Result = TypeVar("Result")
+
+
+class RetryPolicy:  # pylint: disable=unused-variable
+    """
+    The `RetryPolicy` class executes a call again when it fails with a transient error (network, cloud services
+    unavailable, throttling, query cancelled by a timeout), waiting longer after each attempt (exponential backoff
+    with jitter). The permanent errors (e.g. a SQL compilation error) are raised immediately.
+    """
+
+    # Errors of the connector which are always transient.
+    transient_errors: Tuple[type, ...] = (
+        BadGatewayError,
+        GatewayTimeoutError,
+        InterfaceError,
+        InternalServerError,
+        OperationalError,
+        OtherHTTPRetryableError,
+        RequestExceedMaxRetryError,
+        RequestTimeoutError,
+        ServiceUnavailableError,
+        TooManyRequests,
+    )
+
+    # Snowflake error codes and parts of messages identifying the other transient errors.
+    transient_errnos: List[int] = [604, 625, 630]
+    throttling_messages: List[str] = ["throttl", "too many requests", "concurrency limit", "try again"]
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 0.5, max_delay: float = 30.0, sleep: Optional[Callable[[float], None]] = None) -> None:
+        """
+        Args:
+            max_attempts (int): The `max_attempts` parameter is the maximum number of executions of a call (1 to disable the retries).
+            base_delay (float): The `base_delay` parameter is the number of seconds waited after the first failure.
+            max_delay (float): The `max_delay` parameter is the maximum number of seconds waited between two attempts.
+            sleep (Callable): The `sleep` parameter is the function used to wait (by default `time.sleep`).
+        """
+
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep if sleep is not None else time.sleep
+
+        # Function notified of each transient error (e.g. `ConcurrencyController.record_error`).
+        self.listener: Optional[Callable[[BaseException], None]] = None
+
+    @staticmethod
+    def from_settings(settings: Dict[str, Any]) -> "RetryPolicy":
+        """
+        The function creates a retry policy from the `retry` section of the settings (see config-example.yaml).
+        """
+
+        retry: Dict[str, Any] = settings.get("retry", {}) or {}
+        return RetryPolicy(retry.get("max_attempts", 5), retry.get("base_delay", 0.5), retry.get("max_delay", 30.0))
+
+    def is_throttling(self, error: BaseException) -> bool:
+        """..."""
+        return isinstance(error, TooManyRequests) or any(message in str(error).lower() for message in self.throttling_messages)
+
+    def is_transient(self, error: BaseException) -> bool:
+        """
+        The function indicates if an error is transient, i.e. if the same call may succeed later.
+        """
+
+        if isinstance(error, self.transient_errors) or self.is_throttling(error):
+            return True
+
+        return isinstance(error, DatabaseError) and getattr(error, "errno", None) in self.transient_errnos
+
+    def get_delay(self, attempt: int, error: BaseException) -> float:
+        """
+        The function returns the number of seconds to wait after a given failed attempt (starting at 1). The delay is
+        doubled when Snowflake is throttling the requests, and a random part avoids retrying all the calls at the same time.
+        """
+
+        delay: float = min(self.max_delay, self.base_delay * 2**(attempt - 1) * (2 if self.is_throttling(error) else 1))
+        return delay/2 + random.uniform(0, delay / 2)
+
+    def call(self, function: Callable[..., Result], *args: Any) -> Result:
+        """
+        The function calls a function until it succeeds, it raises a permanent error or the maximum number of attempts
+        is reached (the last error is then raised).
+
+        Args:
+            function (Callable): The function to call.
+            args (Any): The arguments given to the function.
+
+        Returns:
+            the value returned by the function.
+        """
+
+        attempt: int = 1
+
+        while True:
+
+            try:
+                return function(*args)
+
+            except Exception as err:  # pylint: disable=broad-exception-caught
+
+                if attempt >= self.max_attempts or not self.is_transient(err):
+                    raise
+
+                if self.listener is not None:
+                    self.listener(err)
+
+                delay: float = self.get_delay(attempt, err)
+
+                logging.getLogger("app").debug("Attempt %s/%s has failed with a transient error (%s), new attempt in %.2f s.", attempt, self.max_attempts, type(err).__name__, delay)
+                self.sleep(delay)
+
+                attempt += 1
+
+
+def write_dead_letter(path: str, results: List[RequestResult]) -> int:  # pylint: disable=unused-variable
+    """
+    The function writes the requests which have failed despite the retries in a SQL file, with their error as comment,
+    so that they can be examined and executed again by hand.
+
+    Args:
+        path (str): The path of the SQL file (removed when no request has failed).
+        results (List[RequestResult]): The results of the requests executed.
+
+    Returns:
+        the number of requests written.
+    """
+
+    failed: List[RequestResult] = [result for result in results if result.status == FAILED]
+
+    if os.path.exists(path):
+        os.remove(path)
+
+    if len(failed) == 0:
+        return 0
+
+    with open(path, "w", encoding="utf-8") as file:
+        for result in failed:
+            error: str = str(result.error).replace("\n", " ")
+            file.write(f"-- {error}\n{result.request};\n")
+
+    logging.getLogger("app").error("A total of %s requests has failed, they are available in the file '%s'.", len(failed), path)
+
+    return len(failed)
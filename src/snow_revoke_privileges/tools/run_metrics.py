@@ -0,0 +1,264 @@
+"""tools/run_metrics.py"""
+
+import datetime
+import json
+import logging
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # The module is not available on Windows: the peak RSS is not reported.
+    resource = None  # type: ignore
+
+# Words kept after SHOW to name the kind of a request (e.g. `SHOW GRANTS ON TABLE`, `SHOW TABLES`).
+SHOW_STOP_WORDS: Tuple[str, ...] = ("LIKE", "IN", "LIMIT", "FROM", "STARTS")
+
+
+class RequestCounts(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `RequestCounts` class contains the numbers of round-trips, statements, rows fetched, retries and errors of a phase.
+    """
+
+    queries: int = 0
+    statements: int = 0
+    rows: int = 0
+    retries: int = 0
+    errors: int = 0
+
+
+class PhaseMetrics:  # pylint: disable=unused-variable
+    """
+    The `PhaseMetrics` class contains the measures of a phase of the run. The requests are counted in the innermost
+    phase running when they are executed, the duration of a phase includes the one of its inner phases.
+    """
+
+    name: str
+    duration: float
+    counts: RequestCounts
+    latencies: List[float]
+    queries_by_kind: Dict[str, int]
+
+    # Peak resident set size of the process (in bytes) at the end of the phase.
+    peak_rss: Optional[int]
+
+    def __init__(self, name: str) -> None:
+        """..."""
+
+        self.name = name
+        self.duration = 0.0
+        self.counts = RequestCounts()
+        self.latencies = []
+        self.queries_by_kind = {}
+        self.peak_rss = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """..."""
+
+        latencies: np.ndarray = np.array(self.latencies if len(self.latencies) > 0 else [0.0])
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+
+        return {
+            "name": self.name,
+            "duration": round(self.duration, 3),
+            **self.counts._asdict(),
+            "latency": {"p50": round(float(p50), 4), "p90": round(float(p90), 4), "p99": round(float(p99), 4), "max": round(float(latencies.max()), 4)},
+            "peak_rss_mb": round(self.peak_rss / 2**20, 1) if self.peak_rss is not None else None,
+            "queries_by_kind": dict(sorted(self.queries_by_kind.items())),
+        }
+
+
+class RunMetrics:  # pylint: disable=unused-variable
+    """
+    The `RunMetrics` class measures a run phase by phase (duration, requests sent to Snowflake, rows fetched,
+    retries, latencies and memory), provides the QUERY_TAG of the requests so that they can be found in QUERY_HISTORY,
+    and writes the JSON run report of the output directory.
+    """
+
+    run_id: str
+    started_at: str
+    phases: Dict[str, PhaseMetrics]
+
+    def __init__(self, run_id: Optional[str] = None) -> None:
+        """
+        Args:
+            run_id (str): The `run_id` parameter identifies the run in the report and the query tags (by default a random one).
+        """
+
+        self.run_id = run_id if run_id is not None else uuid.uuid4().hex[:12]
+        self.started_at = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+        self.start = time.perf_counter()
+
+        self.phases = {"run": PhaseMetrics("run")}
+        self.stack: List[str] = ["run"]
+        self.lock = threading.Lock()
+
+    @property
+    def current_phase(self) -> str:
+        """..."""
+        return self.stack[-1]
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseMetrics]:
+        """
+        The function measures a phase for the duration of the `with` block. The phases are started by the main thread,
+        the requests executed by the threads of the pool meanwhile are counted in this phase.
+        """
+
+        with self.lock:
+            metrics: PhaseMetrics = self.phases.setdefault(name, PhaseMetrics(name))
+            self.stack.append(name)
+
+        start: float = time.perf_counter()
+
+        try:
+            yield metrics
+        finally:
+            with self.lock:
+                self.stack.remove(name)
+                metrics.duration += time.perf_counter() - start
+                metrics.peak_rss = self.get_peak_rss()
+
+            logging.getLogger("app").debug("The phase '%s' took %.2f s (%s requests).", name, metrics.duration, metrics.counts.queries)
+
+    @staticmethod
+    def get_peak_rss() -> Optional[int]:
+        """
+        The function returns the peak resident set size of the process in bytes (None when it is not available).
+        """
+
+        if resource is None:
+            return None
+
+        peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        # Linux returns kilobytes, macOS returns bytes.
+        return peak if sys.platform == "darwin" else peak * 1024
+
+    @staticmethod
+    def get_kind(request: str) -> str:
+        """
+        The function returns the kind of a request: its first words for a SHOW command (e.g. `SHOW GRANTS ON TABLE`),
+        `GRANT OWNERSHIP` or its first word otherwise.
+        """
+
+        words: List[str] = [word.rstrip(";") for word in request.split(None, 6)[:6]]
+
+        if len(words) == 0:
+            return ""
+
+        if words[0].upper() == "SHOW":
+            kind: List[str] = []
+
+            for word in words:
+                if word.upper() in SHOW_STOP_WORDS or not word.replace("_", "").isalpha():
+                    break
+
+                kind.append(word.upper())
+
+            return " ".join(kind)
+
+        if len(words) > 1 and words[0].upper() == "GRANT" and words[1].upper() == "OWNERSHIP":
+            return "GRANT OWNERSHIP"
+
+        return words[0].upper()
+
+    def record_query(self, request: str, latency: float, rows: int = 0, failed: bool = False, statements: int = 1) -> None:
+        """
+        The function records a round-trip with Snowflake in the current phase.
+
+        Args:
+            request (str): The SQL request sent (the first statement names the kind of a multi-statement request).
+            latency (float): The number of seconds of the round-trip (execution and fetch).
+            rows (int): The number of rows fetched.
+            failed (bool): True if the request has failed.
+            statements (int): The number of statements of the request.
+        """
+
+        kind: str = self.get_kind(request)
+
+        with self.lock:
+            metrics: PhaseMetrics = self.phases[self.stack[-1]]
+            metrics.counts = metrics.counts._replace(
+                queries=metrics.counts.queries + 1,
+                statements=metrics.counts.statements + statements,
+                rows=metrics.counts.rows + rows,
+                errors=metrics.counts.errors + (1 if failed else 0),
+            )
+            metrics.latencies.append(latency)
+            metrics.queries_by_kind[kind] = metrics.queries_by_kind.get(kind, 0) + 1
+
+    def record_retry(self, error: BaseException) -> None:  # pylint: disable=unused-argument
+        """
+        The function records a transient error followed by a new attempt (see `RetryPolicy`).
+        """
+
+        with self.lock:
+            metrics: PhaseMetrics = self.phases[self.stack[-1]]
+            metrics.counts = metrics.counts._replace(retries=metrics.counts.retries + 1)
+
+    def get_query_tag(self) -> str:
+        """
+        The function returns the QUERY_TAG of the requests of the current phase.
+        """
+
+        return json.dumps({"application": "snow-revoke-privileges", "run_id": self.run_id, "phase": self.current_phase}, separators=(",", ":"))
+
+    def get_durations(self) -> Dict[str, float]:
+        """..."""
+
+        with self.lock:
+            return {name: metrics.duration for name, metrics in self.phases.items() if name != "run"}
+
+    def get_report(self, settings: Optional[Dict[str, Any]] = None, history: Optional[List[Tuple[float, int]]] = None) -> Dict[str, Any]:
+        """
+        The function returns the run report: the measures of each phase in their order of start, the totals and the
+        successive windows of the concurrency controller.
+
+        Args:
+            settings (Dict[str, Any]): The settings of the run (without credentials).
+            history (List[Tuple[float, int]]): The history of the concurrency window (see `ConcurrencyController`).
+        """
+
+        with self.lock:
+            phases: List[PhaseMetrics] = list(self.phases.values())
+            self.phases["run"].duration = time.perf_counter() - self.start
+            self.phases["run"].peak_rss = self.get_peak_rss()
+
+        totals: PhaseMetrics = PhaseMetrics("total")
+        totals.duration = self.phases["run"].duration
+        totals.peak_rss = self.phases["run"].peak_rss
+        totals.counts = RequestCounts(*(sum(counts) for counts in zip(*(metrics.counts for metrics in phases))))
+
+        for metrics in phases:
+            totals.latencies.extend(metrics.latencies)
+
+            for kind, count in metrics.queries_by_kind.items():
+                totals.queries_by_kind[kind] = totals.queries_by_kind.get(kind, 0) + count
+
+        started: float = history[0][0] if history else 0.0
+
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "settings": settings if settings is not None else {},
+            "phases": [metrics.to_dict() for metrics in phases if metrics.name != "run" or metrics.counts.queries > 0],
+            "total": totals.to_dict(),
+            "concurrency": [{"time": round(moment - started, 3), "window": window} for moment, window in (history or [])],
+        }
+
+    def write_report(self, path: str, settings: Optional[Dict[str, Any]] = None, history: Optional[List[Tuple[float, int]]] = None) -> None:
+        """
+        The function writes the run report in a JSON file (see `get_report`).
+        """
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.get_report(settings, history), file, indent=2)
+
+        logging.getLogger("app").info("The run report will be available in the file '%s'.", path)
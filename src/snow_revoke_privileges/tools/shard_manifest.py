@@ -0,0 +1,122 @@
+"""tools/shard_manifest.py"""
+
+import datetime
+import json
+import os
+import zlib
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from snow_revoke_privileges.tools.configuration import Configuration, load_file
+
+
+def get_schema_bucket(database: str, schema: str, buckets: int) -> int:  # pylint: disable=unused-variable
+    """
+    The function returns the bucket of a schema among `buckets`, with a hash which is the same in every process and on
+    every machine (unlike `hash()`).
+    """
+
+    return zlib.crc32(f"{database}.{schema}".encode("utf-8")) % buckets
+
+
+class Shard(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `Shard` class describes a part of a sharded run: the account, and the settings of the run (the databases and,
+    with `schema_shard`, the bucket of the schemas analyzed).
+    """
+
+    shard_id: str
+    account: str
+    settings: Dict[str, Any]
+
+
+class ShardManifest:  # pylint: disable=unused-variable
+    """
+    The `ShardManifest` class contains the shards of a run spread across several processes or machines (see the
+    `shards` package). It is written in a JSON file without credentials: each worker reads the credentials of its
+    account in the fleet configuration.
+    """
+
+    # Path of the fleet configuration (accounts, credentials and shared settings).
+    fleet: str
+
+    # Directory containing one output directory per shard, and the merged outputs.
+    output_directory: str
+
+    shards: List[Shard]
+    created_on: str
+
+    def __init__(self, fleet: str, output_directory: str, shards: List[Shard], created_on: Optional[str] = None) -> None:
+        """..."""
+
+        self.fleet = fleet
+        self.output_directory = output_directory
+        self.shards = shards
+        self.created_on = created_on if created_on is not None else datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+
+    @staticmethod
+    def load(path: str) -> "ShardManifest":
+        """..."""
+
+        with open(path, "r", encoding="utf-8") as file:
+            content: Dict[str, Any] = json.load(file)
+
+        shards: List[Shard] = [Shard(shard["shard_id"], shard["account"], shard["settings"]) for shard in content["shards"]]
+
+        return ShardManifest(content["fleet"], content["output_directory"], shards, content["created_on"])
+
+    def save(self, path: str) -> None:
+        """..."""
+
+        content: Dict[str, Any] = {
+            "fleet": self.fleet,
+            "output_directory": self.output_directory,
+            "created_on": self.created_on,
+            "shards": [shard._asdict() for shard in self.shards],
+        }
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(content, file, indent=2)
+
+    def get_shard(self, shard_id: str) -> Shard:
+        """
+        Raises:
+            KeyError: if the manifest does not contain the shard.
+        """
+
+        for shard in self.shards:
+            if shard.shard_id == shard_id:
+                return shard
+
+        raise KeyError(f"The shard '{shard_id}' is not in the manifest.")
+
+    def get_worker_shards(self, index: int, count: int) -> List[Shard]:
+        """
+        The function returns the shards processed by a worker among `count` (e.g. the index of a job of an indexed
+        Kubernetes job or of a CI matrix), the shards being dealt in turn.
+        """
+
+        return [shard for position, shard in enumerate(self.shards) if position % count == index]
+
+    def get_shard_directory(self, shard: Shard, output_directory: Optional[str] = None) -> str:
+        """..."""
+        return os.path.join(output_directory if output_directory is not None else self.output_directory, shard.shard_id)
+
+    def get_configuration(self, shard: Shard, fleet: Optional[str] = None, output_directory: Optional[str] = None) -> Configuration:
+        """
+        The function returns the configuration of a shard, with the credentials of its account read in the fleet
+        configuration and its own output directory.
+
+        Args:
+            shard (Shard): The shard processed.
+            fleet (str): The path of the fleet configuration (by default the one of the manifest).
+            output_directory (str): The directory of the outputs of the shards (by default the one of the manifest).
+        """
+
+        accounts: Dict[str, Any] = {account["name"]: account for account in load_file(fleet if fleet is not None else self.fleet)["accounts"]}
+
+        user_configuration: Dict[str, Any] = {
+            "settings": shard.settings,
+            "snowflake_credentials": accounts[shard.account]["snowflake_credentials"],
+        }
+
+        return Configuration(user_configuration, self.get_shard_directory(shard, output_directory))
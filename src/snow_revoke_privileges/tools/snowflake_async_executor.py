@@ -0,0 +1,248 @@
+"""tools/snowflake_async_executor.py"""
+
+import threading
+import time
+from queue import Queue
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from snowflake.connector import SnowflakeConnection
+from snowflake.connector.cursor import SnowflakeCursor
+
+from snow_revoke_privileges.tools.concurrency_controller import ConcurrencyController
+from snow_revoke_privileges.tools.execution_ledger import FAILED, SUCCESS, RequestResult
+from snow_revoke_privileges.tools.retry_policy import RetryPolicy
+from snow_revoke_privileges.tools.run_metrics import RunMetrics
+from snow_revoke_privileges.tools.snowflake_pool import SnowflakeConnectionPool
+
+
+class ExecutionContext(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `ExecutionContext` class contains what the asynchronous execution reports each request to: the metrics of the
+    run, and the concurrency controller with the retry policy telling which errors are transient.
+    """
+
+    metrics: RunMetrics
+    controller: ConcurrencyController
+    retry_policy: RetryPolicy
+
+
+class ExecutionState(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `ExecutionState` class contains the progress of a run of the asynchronous execution: the requests left, the
+    number of requests in flight on all the connections, and the last error which has stopped a connection.
+    """
+
+    requests: Iterator[str]
+    in_flight: int = 0
+    exhausted: bool = False
+    error: Optional[Exception] = None
+
+
+class SnowflakeAsyncExecutor:  # pylint: disable=unused-variable
+    """
+    The `SnowflakeAsyncExecutor` class submits the requests with `execute_async` on a few connections of the pool,
+    keeps up to `window` requests in flight and polls their query ID to collect the results as they complete. The
+    number of requests in flight follows the window of the concurrency controller (see `get_scaled_window`).
+    """
+
+    # Minimum and maximum number of seconds between two polls when no request has completed.
+    poll_delay_min: float = 0.05
+    poll_delay_max: float = 1.0
+
+    def __init__(self, pool: SnowflakeConnectionPool, window: int, context: ExecutionContext, read: Optional[Callable[[SnowflakeCursor], pd.DataFrame]] = None) -> None:
+        """
+        Args:
+            pool (SnowflakeConnectionPool): The `pool` parameter is the pool providing the connections.
+            window (int): The `window` parameter is the maximum number of requests in flight (all connections included).
+            context (ExecutionContext): The `context` parameter contains the metrics and the concurrency controller
+        receiving the latency of each request.
+            read (Callable): The `read` parameter is the function reading the rows of a completed request from its cursor
+        (by default the rows are not retrieved).
+        """
+
+        self.pool = pool
+        self.window = window
+        self.context = context
+        self.read = read
+
+        self.lock = threading.Lock()
+        self.results: Queue[Optional[Tuple[RequestResult, Optional[pd.DataFrame], Optional[Exception]]]] = Queue()
+        self.state: ExecutionState = ExecutionState(iter([]))
+
+    def run(self, requests: Iterable[str]) -> Iterator[Tuple[RequestResult, Optional[pd.DataFrame], Optional[Exception]]]:
+        """
+        The function executes the requests and yields, in the order of completion, the result of each request with its
+        rows (when `read` is given) or the error raised.
+
+        Args:
+            requests (Iterable[str]): The `requests` parameter contains the SQL requests to execute.
+
+        Raises:
+            Exception: the error which has stopped the connections when requests are left without being executed (the
+        requests which were in flight on a connection stopped are yielded as failed).
+        """
+
+        self.state = ExecutionState(iter(requests))
+
+        lanes: int = max(1, min(self.pool.size, self.window))
+        threads: List[threading.Thread] = [threading.Thread(target=self.run_lane, args=(max(1, self.window // lanes), ), daemon=True) for _ in range(lanes)]
+
+        for thread in threads:
+            thread.start()
+
+        running_lanes: int = lanes
+
+        while running_lanes > 0:
+            result: Optional[Tuple[RequestResult, Optional[pd.DataFrame], Optional[Exception]]] = self.results.get()
+
+            if result is None:
+                running_lanes -= 1
+            else:
+                yield result
+
+        if self.state.error is not None and not self.state.exhausted:
+            raise self.state.error
+
+    def run_lane(self, window: int) -> None:
+        """
+        The function submits and polls requests on one connection until there is no request left. When the connection
+        fails (e.g. it cannot be opened), the requests in flight on it are reported as failed with the error, and the
+        other connections go on with the remaining requests.
+
+        Args:
+            window (int): The `window` parameter is the maximum number of requests in flight on this connection.
+        """
+
+        in_flight: Dict[str, Tuple[str, float]] = {}
+
+        try:
+            with self.pool.connection() as cnx:
+
+                delay: float = self.poll_delay_min
+
+                while True:
+
+                    self.submit(cnx, in_flight, window)
+
+                    if len(in_flight) == 0 and self.state.exhausted:
+                        break
+
+                    # The requests in flight on the other connections may fill the window of the controller.
+                    if len(in_flight) > 0 and self.poll(cnx, in_flight):
+                        delay = self.poll_delay_min
+                    else:
+                        delay = min(delay * 2, self.poll_delay_max)
+                        time.sleep(delay)
+
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            with self.lock:
+                self.state = self.state._replace(error=err)
+
+            for request, start in in_flight.values():
+                self.finish(request, time.perf_counter() - start, err)
+                self.results.put((RequestResult(request, FAILED, None, time.perf_counter() - start, f"{type(err).__name__}: {err}"), None, err))
+
+        finally:
+            self.results.put(None)
+
+    def submit(self, cnx: SnowflakeConnection, in_flight: Dict[str, Tuple[str, float]], window: int) -> None:
+        """..."""
+
+        while len(in_flight) < window:
+            request: Optional[str] = self.next_request()
+
+            if request is None:
+                return
+
+            start: float = time.perf_counter()
+
+            try:
+                cur = cnx.cursor()
+                cur.execute_async(request)
+                in_flight[str(cur.sfqid)] = (request, start)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                self.finish(request, time.perf_counter() - start, err)
+                self.results.put((RequestResult(request, FAILED, None, time.perf_counter() - start, f"{type(err).__name__}: {err}"), None, err))
+
+    def poll(self, cnx: SnowflakeConnection, in_flight: Dict[str, Tuple[str, float]]) -> bool:
+        """
+        The function checks the status of the requests in flight and collects the ones which are completed.
+
+        Returns:
+            True if at least one request has completed.
+        """
+
+        completed: bool = False
+
+        for query_id, (request, start) in list(in_flight.items()):
+
+            if cnx.is_still_running(cnx.get_query_status(query_id)):
+                continue
+
+            del in_flight[query_id]
+            completed = True
+            self.results.put(self.collect(cnx, query_id, request, start))
+
+        return completed
+
+    def collect(self, cnx: SnowflakeConnection, query_id: str, request: str, start: float) -> Tuple[RequestResult, Optional[pd.DataFrame], Optional[Exception]]:
+        """..."""
+
+        collected: Tuple[RequestResult, Optional[pd.DataFrame], Optional[Exception]] = self.__collect(cnx, query_id, request, start)
+        self.finish(request, collected[0].duration, collected[2], len(collected[1]) if collected[1] is not None else 0)
+
+        return collected
+
+    def __collect(self, cnx: SnowflakeConnection, query_id: str, request: str, start: float) -> Tuple[RequestResult, Optional[pd.DataFrame], Optional[Exception]]:
+        """..."""
+
+        try:
+            cnx.get_query_status_throw_if_error(query_id)
+
+            if self.read is None:
+                return (RequestResult(request, SUCCESS, query_id, time.perf_counter() - start), None, None)
+
+            cur = cnx.cursor()
+
+            try:
+                cur.get_results_from_sfqid(query_id)
+                result: pd.DataFrame = self.read(cur)
+            finally:
+                cur.close()
+
+            return (RequestResult(request, SUCCESS, query_id, time.perf_counter() - start), result, None)
+
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            return (RequestResult(request, FAILED, query_id, time.perf_counter() - start, f"{type(err).__name__}: {err}"), None, err)
+
+    def next_request(self) -> Optional[str]:
+        """
+        The function returns the next request to submit, or None when there is no request left (`exhausted`) or when
+        the requests in flight already fill the window of the concurrency controller.
+        """
+
+        with self.lock:
+            if self.state.in_flight >= self.context.controller.get_scaled_window(self.window):
+                return None
+
+            request: Optional[str] = next(self.state.requests, None)
+
+            if request is None:
+                self.state = self.state._replace(exhausted=True)
+                return None
+
+            self.state = self.state._replace(in_flight=self.state.in_flight + 1)
+            return request
+
+    def finish(self, request: str, duration: float, error: Optional[Exception], rows: int = 0) -> None:
+        """
+        The function records the end of a request in the metrics and in the concurrency controller.
+        """
+
+        with self.lock:
+            self.state = self.state._replace(in_flight=self.state.in_flight - 1)
+
+        self.context.metrics.record_query(request, duration, rows, error is not None)
+        self.context.controller.record_latency(duration, error is not None and self.context.retry_policy.is_transient(error))
@@ -0,0 +1,170 @@
+"""tools/snowflake_batch_executor.py"""
+
+import logging
+import time
+from typing import Iterable, Iterator, List, Optional
+
+from progress.bar import Bar  # pyright: ignore
+
+from snow_revoke_privileges.tools.execution_ledger import FAILED, SUCCESS, ExecutionLedger, RequestResult
+from snow_revoke_privileges.tools.my_snowflake import MySnowflake
+from snow_revoke_privileges.tools.snowflake_async_executor import SnowflakeAsyncExecutor
+
+
+class SnowflakeBatchExecutor:  # pylint: disable=unused-variable
+    """
+    The `SnowflakeBatchExecutor` class executes requests whose rows are not fetched (REVOKE, GRANT...) with the pool of
+    `MySnowflake`: in multi-statement batches, asynchronously or one by one depending on its settings.
+    """
+
+    @staticmethod
+    def execute_multi_requests(requests: List[str], ledger: Optional[ExecutionLedger] = None) -> List[RequestResult]:  # pylint: disable=unused-variable
+        """
+        The function executes multiple SQL requests using a Snowflake connection object.
+
+        Args:
+        requests (List[str]): A list of SQL queries to be executed on a Snowflake database connection.
+        ledger (ExecutionLedger): The ledger recording the result of each request as soon as it completes. The requests
+        already recorded as successful in the ledger (resumed run) are skipped.
+
+        Returns:
+        the result of each request executed, in the order of completion.
+        """
+
+        if ledger is not None:
+            requests = ledger.get_pending_requests(requests)
+
+        return SnowflakeBatchExecutor.record_results(SnowflakeBatchExecutor.iterate_results(requests), len(requests), ledger)
+
+    @staticmethod
+    def record_results(results: Iterable[RequestResult], count: int, ledger: Optional[ExecutionLedger] = None) -> List[RequestResult]:  # pylint: disable=unused-variable
+        """
+        The function consumes the results of requests as they complete: the failed requests are logged, each result is
+        recorded in the ledger and the progress bar is updated.
+
+        Args:
+        results (Iterable[RequestResult]): The results of the requests, in the order of completion.
+        count (int): The number of requests expected (for the progress bar).
+        ledger (ExecutionLedger): The ledger recording the result of each request as soon as it completes.
+
+        Returns:
+        the results of the requests, in the order of completion.
+        """
+
+        start: float = time.perf_counter()
+        recorded: List[RequestResult] = []
+
+        with Bar("Executing request in Snowflake", max=count) as progress:
+
+            for result in results:
+
+                if result.status == FAILED:
+                    logging.getLogger("app").fatal("SQL request : '%s' has failed (%s).", result.request, result.error)
+
+                if ledger is not None:
+                    ledger.record(result)
+
+                recorded.append(result)
+                progress.next()
+
+        duration: float = time.perf_counter() - start
+        logging.getLogger("app").debug("A total of %s requests was executed in %.1f s (%.0f requests/s).", len(recorded), duration, len(recorded) / max(duration, 1e-6))
+
+        return recorded
+
+    @staticmethod
+    def iterate_results(requests: List[str]) -> Iterator[RequestResult]:  # pylint: disable=unused-variable
+        """
+        The function executes the requests in batches, asynchronously or one by one depending on the settings, and yields
+        their results in the order of completion.
+        """
+
+        if MySnowflake.batch_size > 1:
+            batches: List[List[str]] = [requests[i:i + MySnowflake.batch_size] for i in range(0, len(requests), MySnowflake.batch_size)]
+
+            for batch_results in MySnowflake.imap_unordered(SnowflakeBatchExecutor.execute_batch_requests, batches):
+                yield from batch_results
+
+        elif MySnowflake.async_window > 0:
+            for result, _, error in SnowflakeAsyncExecutor(MySnowflake.pool, MySnowflake.async_window, MySnowflake.get_execution_context()).run(requests):
+
+                # The requests which have failed with a transient error are executed again with the retry policy.
+                if error is not None and MySnowflake.retry_policy.is_transient(error):
+                    yield SnowflakeBatchExecutor.execute_single_request(result.request)
+                else:
+                    yield result
+
+        else:
+            yield from MySnowflake.imap_unordered(SnowflakeBatchExecutor.execute_single_request, requests)
+
+    @staticmethod
+    def execute_batch_requests(requests: List[str]) -> List[RequestResult]:  # pylint: disable=unused-variable
+        """
+        The function executes several SQL requests in a single multi-statement request, so that they cost one round-trip.
+        A multi-statement request stops at the first statement which fails without telling which one, so the statements of
+        a failed batch are executed again one by one: each failure is then logged with its own statement (REVOKE and
+        GRANT OWNERSHIP can be executed twice without effect).
+
+        Args:
+            requests (List[str]): The SQL requests to be executed together.
+
+        Returns:
+            the result of each request of the batch (all of them share the query ID and the duration of the batch when it succeeds).
+        """
+
+        start: float = time.perf_counter()
+
+        try:
+            query_id: Optional[str] = MySnowflake.retry_policy.call(SnowflakeBatchExecutor.__execute_request, ";\n".join(requests), len(requests))
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            logging.getLogger("app").debug("A batch of %s requests has failed (%s), they will be executed one by one.", len(requests), type(err))
+            return [SnowflakeBatchExecutor.execute_single_request(request) for request in requests]
+
+        duration: float = time.perf_counter() - start
+
+        return [RequestResult(request, SUCCESS, query_id, duration) for request in requests]
+
+    @staticmethod
+    def execute_single_request(request: str) -> RequestResult:  # pylint: disable=unused-variable
+        """
+        The function executes a single SQL request using a Snowflake connection and a cursor.
+
+        Args:
+        request (str): The `request` parameter is a string that contains a SQL query to be executed on a
+        Snowflake database. The function `execute_single_request` takes this query as input and executes it
+        with a connection of the pool. The rows returned are not fetched, only the status, the query ID
+        and the duration of the execution are returned.
+        """
+
+        start: float = time.perf_counter()
+
+        try:
+            query_id: Optional[str] = MySnowflake.retry_policy.call(SnowflakeBatchExecutor.__execute_request, request)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            return RequestResult(request, FAILED, getattr(err, "sfqid", None), time.perf_counter() - start, f"{type(err).__name__}: {err}")
+
+        return RequestResult(request, SUCCESS, query_id, time.perf_counter() - start)
+
+    @staticmethod
+    def __execute_request(request: str, num_statements: Optional[int] = None) -> Optional[str]:
+        """
+        The function executes a SQL request (or several ones with `num_statements`) once and returns its query ID.
+        """
+
+        start: float = time.perf_counter()
+        failed: bool = True
+
+        with MySnowflake.pool.connection() as cnx:
+            cur = cnx.cursor()
+
+            try:
+                if num_statements is None:
+                    cur.execute(request)
+                else:
+                    cur.execute(request, num_statements=num_statements)
+
+                failed = False
+                return cur.sfqid
+            finally:
+                cur.close()
+                MySnowflake.metrics.record_query(request, time.perf_counter() - start, 0, failed, num_statements or 1)
@@ -0,0 +1,181 @@
+"""tools/snowflake_pool.py"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from queue import Empty, LifoQueue
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional
+
+import snowflake.connector as sc
+from snowflake.connector import SnowflakeConnection
+
+
+class SessionState(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `SessionState` class records when a connection of the pool was last used and the QUERY_TAG of its session.
+    """
+
+    last_used: float = 0.0
+    query_tag: Optional[str] = None
+
+
+class SnowflakeConnectionPool:  # pylint: disable=unused-variable,too-many-instance-attributes
+    """
+    The `SnowflakeConnectionPool` class keeps up to `size` authenticated connections and lends them to the
+    threads executing the requests, so that each thread uses its own connection.
+    """
+
+    # Number of seconds after which an idle connection is checked before being lent again.
+    health_check_interval: float = 60.0
+
+    def __init__(self, config: Dict[str, Any], size: int = 8, connect: Optional[Callable[..., Any]] = None) -> None:
+        """
+        Args:
+            config (Dict[str, Any]): The `config` parameter contains the credentials given to the connector.
+            size (int): The `size` parameter is the maximum number of connections opened at the same time.
+            connect (Callable): The `connect` parameter is the function opening a connection (by default `snowflake.connector.connect`).
+        """
+
+        self.config = config
+        self.size = size
+        self.connect = connect if connect is not None else sc.connect
+
+        self.idle_connections: LifoQueue[Any] = LifoQueue()
+
+        # Function returning the QUERY_TAG of the requests as a SQL string literal (none by default).
+        self.query_tag: Optional[Callable[[], str]] = None
+
+        # State of the session of each connection opened, by ID of connection.
+        self.sessions: Dict[int, SessionState] = {}
+        self.semaphore = threading.BoundedSemaphore(size)
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def connection(self) -> Iterator[SnowflakeConnection]:
+        """
+        The function lends a healthy connection for the duration of the `with` block and gives it back to the pool afterwards.
+        """
+
+        self.semaphore.acquire()  # pylint: disable=consider-using-with
+
+        try:
+            cnx: SnowflakeConnection = self.acquire()
+
+            try:
+                yield cnx
+            finally:
+                self.release(cnx)
+
+        finally:
+            self.semaphore.release()
+
+    def acquire(self) -> SnowflakeConnection:
+        """..."""
+
+        while True:
+            try:
+                cnx: SnowflakeConnection = self.idle_connections.get_nowait()
+            except Empty:
+                return self.tag(self.open())
+
+            if self.is_healthy(cnx):
+                return self.tag(cnx)
+
+            logging.getLogger("app").debug("A connection with Snowflake was lost and will be opened again.")
+            self.discard(cnx)
+
+    def release(self, cnx: SnowflakeConnection) -> None:
+        """..."""
+
+        if cnx.is_closed():
+            self.discard(cnx)
+            return
+
+        with self.lock:
+            self.sessions[id(cnx)] = self.sessions.get(id(cnx), SessionState())._replace(last_used=time.monotonic())
+
+        self.idle_connections.put(cnx)
+
+    def open(self) -> SnowflakeConnection:
+        """..."""
+
+        cnx: SnowflakeConnection = self.connect(**self.config)
+
+        cur = cnx.cursor(sc.DictCursor)
+        cur.execute(f"USE ROLE {self.config['role']};")
+        cur.close()
+
+        with self.lock:
+            self.sessions[id(cnx)] = self.sessions.get(id(cnx), SessionState())._replace(last_used=time.monotonic())
+
+        return cnx
+
+    def tag(self, cnx: SnowflakeConnection) -> SnowflakeConnection:
+        """
+        The function sets the QUERY_TAG of the session when it has changed since the connection was last lent (e.g. a
+        new phase of the run has started).
+        """
+
+        if self.query_tag is None:
+            return cnx
+
+        query_tag: str = self.query_tag()
+
+        with self.lock:
+            if self.sessions.get(id(cnx), SessionState()).query_tag == query_tag:
+                return cnx
+
+        try:
+            cur = cnx.cursor()
+            cur.execute(f"ALTER SESSION SET QUERY_TAG = {query_tag}")
+            cur.close()
+        except Exception:
+            self.discard(cnx)
+            raise
+
+        with self.lock:
+            self.sessions[id(cnx)] = self.sessions.get(id(cnx), SessionState())._replace(query_tag=query_tag)
+
+        return cnx
+
+    def is_healthy(self, cnx: SnowflakeConnection) -> bool:
+        """..."""
+
+        if cnx.is_closed():
+            return False
+
+        with self.lock:
+            idle_time: float = time.monotonic() - self.sessions.get(id(cnx), SessionState()).last_used
+
+        if idle_time < self.health_check_interval:
+            return True
+
+        try:
+            cur = cnx.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+        except Exception:  # pylint: disable=broad-exception-caught
+            return False
+
+        return True
+
+    def discard(self, cnx: SnowflakeConnection) -> None:
+        """..."""
+
+        with self.lock:
+            self.sessions.pop(id(cnx), None)
+
+        try:
+            cnx.close()
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass
+
+    def close(self) -> None:
+        """..."""
+
+        while True:
+            try:
+                self.discard(self.idle_connections.get_nowait())
+            except Empty:
+                return
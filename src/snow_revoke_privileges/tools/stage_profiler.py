@@ -0,0 +1,207 @@
+"""tools/stage_profiler.py"""
+
+import cProfile
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+from contextlib import contextmanager
+from types import FrameType
+from typing import Callable, Dict, Iterator, List, Optional, TypeVar
+
+TaskInput = TypeVar("TaskInput")
+TaskOutput = TypeVar("TaskOutput")
+
+
+class StageProfile:  # pylint: disable=unused-variable
+    """
+    The `StageProfile` class contains the profiles collected during a stage: one cProfile profile per thread (the main
+    thread and the workers of the pool) and the stacks sampled on all the threads.
+    """
+
+    name: str
+    profiles: Dict[int, cProfile.Profile]
+    stacks: Dict[str, int]
+
+    def __init__(self, name: str) -> None:
+        """..."""
+
+        self.name = name
+        self.profiles = {}
+        self.stacks = {}
+
+
+class StageProfiler:  # pylint: disable=unused-variable
+    """
+    The `StageProfiler` class profiles the stages of a run (`--profile`): the main thread and the tasks executed by the
+    threads of the pool are profiled with cProfile, and a sampler records the stacks of all the threads. At the end of
+    each stage, the profiles of the threads are merged in `profile-<stage>.pstats` and the stacks are written in
+    `profile-<stage>.collapsed` (one `thread;function;function count` line per stack, the input of flamegraph.pl or
+    speedscope). The samples measure the wall time, including the threads waiting for Snowflake.
+    """
+
+    enabled: bool
+
+    # Number of seconds between two samples of the stacks.
+    interval: float
+
+    # Function returning the path of an output file (see `Configuration.get_output_path`).
+    get_path: Callable[[str], str]
+
+    current: Optional[StageProfile]
+
+    def __init__(self, enabled: bool = False, get_path: Optional[Callable[[str], str]] = None, interval: float = 0.005) -> None:
+        """
+        Args:
+            enabled (bool): The `enabled` parameter indicates if the stages are profiled (otherwise the profiler does nothing).
+            get_path (Callable): The `get_path` parameter returns the path of the files written (by default in the current directory).
+            interval (float): The `interval` parameter is the number of seconds between two samples of the stacks.
+        """
+
+        self.enabled = enabled
+        self.get_path = get_path if get_path is not None else os.path.abspath
+        self.interval = interval
+        self.current = None
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        The function profiles a stage for the duration of the `with` block. The stages cannot be nested, since a thread
+        is profiled by a single cProfile profile at a time.
+        """
+
+        if not self.enabled or self.current is not None:
+            yield
+            return
+
+        profile: StageProfile = StageProfile(name)
+        stopped: threading.Event = threading.Event()
+        sampler: threading.Thread = threading.Thread(target=self.sample, args=(profile, stopped), name="stage-profiler", daemon=True)
+
+        with self.lock:
+            self.current = profile
+
+        sampler.start()
+
+        try:
+            with self.profile(profile):
+                yield
+
+        finally:
+            stopped.set()
+            sampler.join()
+
+            with self.lock:
+                self.current = None
+
+            self.dump(profile)
+
+    @contextmanager
+    def profile(self, stage_profile: StageProfile) -> Iterator[None]:
+        """
+        The function profiles the current thread with its profile of the stage (created at the first call). When
+        another profiler is already active (e.g. with Python 3.12+), the thread is only sampled.
+        """
+
+        with self.lock:
+            profile: cProfile.Profile = stage_profile.profiles.setdefault(threading.get_ident(), cProfile.Profile())
+
+        try:
+            profile.enable()
+        except ValueError:
+            yield
+            return
+
+        try:
+            yield
+        finally:
+            profile.disable()
+
+    def run(self, task: Callable[[TaskInput], TaskOutput], item: TaskInput) -> TaskOutput:
+        """
+        The function executes a task in a thread of the pool, profiled when a stage is profiled.
+        """
+
+        stage_profile: Optional[StageProfile] = self.current
+
+        if stage_profile is None:
+            return task(item)
+
+        with self.profile(stage_profile):
+            return task(item)
+
+    def sample(self, stage_profile: StageProfile, stopped: threading.Event) -> None:
+        """
+        The function records the stacks of all the threads (except itself) until the end of the stage.
+        """
+
+        while not stopped.wait(self.interval):
+
+            names: Dict[int, str] = {thread.ident: self.get_thread_name(thread.name) for thread in threading.enumerate() if thread.ident is not None}
+
+            for ident, frame in sys._current_frames().items():  # pylint: disable=protected-access
+
+                if ident == threading.get_ident():
+                    continue
+
+                stack: str = ";".join([names.get(ident, "thread")] + self.get_functions(frame))
+                stage_profile.stacks[stack] = stage_profile.stacks.get(stack, 0) + 1
+
+    @staticmethod
+    def get_thread_name(name: str) -> str:
+        """
+        The function returns the name of a thread without its number, so that the workers of a pool are merged.
+        """
+
+        return re.sub(r"[-_]\d+(?:_\d+)?$", "", name)
+
+    @staticmethod
+    def get_functions(frame: Optional[FrameType]) -> List[str]:
+        """
+        The function returns the functions of a stack, from the outermost to the innermost (e.g. `my_snowflake.py:fetch_pandas_all`).
+        """
+
+        functions: List[str] = []
+
+        while frame is not None:
+            functions.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+            frame = frame.f_back
+
+        return functions[::-1]
+
+    def dump(self, stage_profile: StageProfile) -> None:
+        """
+        The function writes the merged profile and the collapsed stacks of a stage.
+        """
+
+        profiles: List[cProfile.Profile] = list(stage_profile.profiles.values())
+        stats: Optional[pstats.Stats] = None
+
+        for profile in profiles:
+            try:
+                if stats is None:
+                    stats = pstats.Stats(profile)
+                else:
+                    stats.add(profile)
+            except TypeError:
+                # A profile which has never been enabled contains no data.
+                continue
+
+        if stats is not None:
+            stats.dump_stats(self.get_path(f"profile-{stage_profile.name}.pstats"))
+
+        with open(self.get_path(f"profile-{stage_profile.name}.collapsed"), "w", encoding="utf-8") as file:
+            for stack, count in sorted(stage_profile.stacks.items()):
+                file.write(f"{stack} {count}\n")
+
+        logging.getLogger("app").info(
+            "The profile of the stage '%s' (%s threads, %s samples) will be available in the files 'profile-%s.pstats' and 'profile-%s.collapsed'.",
+            stage_profile.name,
+            len(profiles),
+            sum(stage_profile.stacks.values()),
+            stage_profile.name,
+            stage_profile.name,
+        )
@@ -0,0 +1,263 @@
+"""tools/wave_scheduler.py"""
+
+import logging
+import re
+import threading
+from queue import Empty, Queue
+from typing import Dict, Iterator, List, NamedTuple, Optional, Pattern, Set, Tuple
+
+from snow_revoke_privileges.tools.execution_ledger import ExecutionLedger, RequestResult
+from snow_revoke_privileges.tools.my_snowflake import MySnowflake
+from snow_revoke_privileges.tools.snowflake_batch_executor import SnowflakeBatchExecutor
+
+# Phases of the requests, in the order required on a same object.
+REVOKE: str = "REVOKE"
+OWNERSHIP: str = "OWNERSHIP"
+GRANT: str = "GRANT"
+
+
+class RequestTarget(NamedTuple):  # pylint: disable=unused-variable
+    """
+    The `RequestTarget` class contains the phase of a request and the parts of the name of the database, schema or
+    object it targets.
+    """
+
+    phase: str
+    scope: Tuple[str, ...]
+
+
+class WaveScheduler:  # pylint: disable=unused-variable
+    """
+    The `WaveScheduler` class executes the REVOKE, GRANT OWNERSHIP and GRANT requests as a dependency graph instead of
+    phase by phase: a request only waits for the requests which must be executed before it on the same database,
+    schema or object, so that the ownerships of a schema are transferred while the revokes of other schemas are
+    still running. The requests whose dependencies have completed are executed at the same time, in batches when
+    `batch_size` is set.
+
+    The dependencies are the following:
+      - a GRANT OWNERSHIP on an object waits for the REVOKE on this object (an object cannot be transferred while it
+        has outbound privileges), and for the REVOKE ON ALL of its schema,
+      - a GRANT OWNERSHIP ON ALL objects of a schema waits for the REVOKE on the objects of this schema,
+      - a GRANT on a schema (usage, future and current privileges) waits for the REVOKE and the GRANT OWNERSHIP on this
+        schema and its objects, so that the new privileges are neither revoked nor blocking a transfer,
+      - a GRANT on a database waits for the REVOKE on this database.
+    """
+
+    # First qualified name of a request (e.g. `"DB"."SCHEMA"."TABLE"`), which is the object targeted.
+    identifier: Pattern[str] = re.compile(r'"(?:[^"]|"")*"(?:\."(?:[^"]|"")*")*')
+
+    requests: List[str]
+    targets: List[RequestTarget]
+
+    # Requests waiting for each request, and number of dependencies not completed yet for each request.
+    dependents: List[List[int]]
+    missing: List[int]
+
+    def __init__(self) -> None:
+        """..."""
+
+        self.requests = []
+        self.targets = []
+        self.dependents = []
+        self.missing = []
+
+        self.applied: Set[int] = set()
+        self.ready: Queue[int] = Queue()
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """..."""
+        return len(self.requests)
+
+    def add(self, requests: List[str], phase: str) -> None:
+        """
+        The function adds requests to the graph.
+
+        Args:
+            requests (List[str]): The SQL requests generated by `SnowRevokeRequests` or `SnowNewGrantRequest`.
+            phase (str): The phase of the requests (REVOKE, OWNERSHIP or GRANT).
+        """
+
+        for request in requests:
+            self.requests.append(request)
+            self.targets.append(RequestTarget(phase, self.get_scope(request)))
+            self.dependents.append([])
+            self.missing.append(0)
+
+    def get_scope(self, request: str) -> Tuple[str, ...]:
+        """
+        The function returns the parts of the name of the database, schema or object targeted by a request (an empty
+        tuple when the request has no qualified name).
+        """
+
+        match: Optional[re.Match[str]] = self.identifier.search(request)
+
+        if match is None:
+            return ()
+
+        return tuple(MySnowflake.split_identifier(match.group(0)))
+
+    def is_schema_wide(self, node: int) -> bool:
+        """
+        The function indicates if a request targets all the objects of a schema (`... ON ALL <TYPE>S IN SCHEMA ...`).
+        """
+
+        return len(self.targets[node].scope) == 2 and " ON ALL " in self.requests[node]
+
+    def build(self) -> int:
+        """
+        The function creates the dependencies between the requests added.
+
+        Returns:
+            the number of dependencies.
+        """
+
+        # Indexes of the requests which other requests may wait for.
+        revokes: Dict[Tuple[str, ...], List[int]] = {}
+        schema_wide_revokes: Dict[Tuple[str, ...], List[int]] = {}
+        object_revokes: Dict[Tuple[str, ...], List[int]] = {}
+        in_schema: Dict[Tuple[str, ...], List[int]] = {}
+
+        for node, (phase, scope) in enumerate(self.targets):
+
+            if phase == REVOKE:
+                revokes.setdefault(scope, []).append(node)
+
+                if self.is_schema_wide(node):
+                    schema_wide_revokes.setdefault(scope, []).append(node)
+                elif len(scope) > 2:
+                    object_revokes.setdefault(scope[:2], []).append(node)
+
+            if phase in (REVOKE, OWNERSHIP) and len(scope) >= 2:
+                in_schema.setdefault(scope[:2], []).append(node)
+
+        dependencies: int = 0
+
+        for node, (phase, scope) in enumerate(self.targets):
+
+            for dependency in self.get_dependencies(node, phase, scope, (revokes, schema_wide_revokes, object_revokes, in_schema)):
+                self.dependents[dependency].append(node)
+                self.missing[node] += 1
+                dependencies += 1
+
+        return dependencies
+
+    def get_dependencies(self, node: int, phase: str, scope: Tuple[str, ...], indexes: Tuple[Dict[Tuple[str, ...], List[int]], ...]) -> List[int]:
+        """..."""
+
+        revokes, schema_wide_revokes, object_revokes, in_schema = indexes
+
+        if phase == OWNERSHIP and self.is_schema_wide(node):
+            return object_revokes.get(scope, []) + schema_wide_revokes.get(scope, [])
+
+        if phase == OWNERSHIP and len(scope) > 2:
+            return revokes.get(scope, []) + schema_wide_revokes.get(scope[:2], [])
+
+        if phase == GRANT and len(scope) == 2:
+            return in_schema.get(scope, [])
+
+        if phase == GRANT and len(scope) == 1:
+            return revokes.get(scope, [])
+
+        return []
+
+    def get_waves(self) -> int:
+        """
+        The function returns the length of the longest chain of dependencies, i.e. the number of waves of requests.
+        """
+
+        waves: List[int] = [1] * len(self.requests)
+
+        # The dependencies always belong to a previous phase, so the requests are visited phase by phase.
+        for phase in (REVOKE, OWNERSHIP, GRANT):
+            for node in (node for node in range(len(self.requests)) if self.targets[node].phase == phase):
+                for dependent in self.dependents[node]:
+                    waves[dependent] = max(waves[dependent], waves[node] + 1)
+
+        return max(waves, default=0)
+
+    def execute(self, ledger: Optional[ExecutionLedger] = None) -> List[RequestResult]:
+        """
+        The function executes the requests as soon as their dependencies have completed (even if they have failed, as
+        the phases would do).
+
+        Args:
+            ledger (ExecutionLedger): The ledger recording the result of each request as soon as it completes. The
+        requests already recorded as successful in the ledger (resumed run) are skipped.
+
+        Returns:
+            the result of each request executed, in the order of completion.
+        """
+
+        dependencies: int = self.build()
+
+        if ledger is not None:
+            pending: Set[str] = set(ledger.get_pending_requests(self.requests))
+            self.applied = {node for node, request in enumerate(self.requests) if request not in pending}
+
+        logging.getLogger("app").info(
+            "A total of %s requests will be performed in %s waves (%s dependencies).",
+            len(self.requests) - len(self.applied),
+            self.get_waves(),
+            dependencies,
+        )
+
+        for node in range(len(self.requests)):
+            if self.missing[node] == 0:
+                self.ready.put(node)
+
+        results: Iterator[RequestResult] = (result for node_results in MySnowflake.imap_released(self.run, self.get_ready) for result in node_results)
+
+        return SnowflakeBatchExecutor.record_results(results, len(self.requests) - len(self.applied), ledger)
+
+    def get_ready(self) -> List[List[int]]:
+        """
+        The function returns the requests whose dependencies have completed, grouped by `batch_size`, without waiting
+        (see `MySnowflake.imap_released`, which calls it again each time a group completes).
+
+        No request is left behind: the dependencies always point to a previous phase, so the graph has no cycle and,
+        as long as requests remain, either one of them is ready or a request is running in a thread of the pool. Each
+        request releases its dependents before its group completes, even when it fails (see `run`).
+        """
+
+        groups: List[List[int]] = []
+        nodes: List[int] = []
+
+        while True:
+            try:
+                nodes.append(self.ready.get_nowait())
+            except Empty:
+                break
+
+            if len(nodes) == max(1, MySnowflake.batch_size):
+                groups.append(nodes)
+                nodes = []
+
+        return groups + ([nodes] if len(nodes) > 0 else [])
+
+    def run(self, nodes: List[int]) -> List[RequestResult]:
+        """
+        The function executes a group of requests (in a thread of the pool) and releases the requests waiting for them.
+        """
+
+        requests: List[str] = [self.requests[node] for node in nodes if node not in self.applied]
+
+        try:
+            if len(requests) > 1:
+                return SnowflakeBatchExecutor.execute_batch_requests(requests)
+
+            return [SnowflakeBatchExecutor.execute_single_request(request) for request in requests]
+
+        finally:
+            self.complete(nodes)
+
+    def complete(self, nodes: List[int]) -> None:
+        """..."""
+
+        with self.lock:
+            for node in nodes:
+                for dependent in self.dependents[node]:
+                    self.missing[dependent] -= 1
+
+                    if self.missing[dependent] == 0:
+                        self.ready.put(dependent)
@@ -0,0 +1,65 @@
+"""tests/conftest.py"""
+
+import functools
+import glob
+import os
+from typing import Any, Callable, Iterator, Set
+
+import pytest
+
+from snow_revoke_privileges.application import Application
+from snow_revoke_privileges.benchmark.account import create_settings
+from snow_revoke_privileges.benchmark.fake_snowflake import FakeBehavior, FakeConnection, FakeStatistics
+from snow_revoke_privileges.benchmark.synthetic_account import SyntheticAccount
+from snow_revoke_privileges.tools.configuration import Configuration
+from snow_revoke_privileges.tools.my_snowflake import MySnowflake, SnowflakeOptions
+
+
+def read_requests(directory: str) -> Set[str]:
+    """
+    The function returns the requests written in the output files of a run.
+    """
+
+    requests: Set[str] = set()
+
+    for path in glob.glob(os.path.join(directory, "output-*.sql")):
+        with open(path, "r", encoding="utf-8") as file:
+            requests.update(line.rstrip(";\n") for line in file if not line.startswith("--") and line.strip() != "")
+
+    return requests
+
+
+@pytest.fixture
+def run_application(tmp_path: Any) -> Callable[..., Set[str]]:
+    """
+    The fixture returns a function executing the application on a synthetic account with fake connections, in its own
+    output directory, and returning the requests written in the output files.
+    """
+
+    def run(account: SyntheticAccount, name: str = "run", **settings: Any) -> Set[str]:
+        directory: str = str(tmp_path / name)
+        os.makedirs(directory)
+
+        config: Configuration = Configuration(create_settings(account, **settings), directory)
+        Application(connect=functools.partial(FakeConnection, FakeStatistics(), account=account), config=config).execute()
+
+        return read_requests(directory)
+
+    return run
+
+
+@pytest.fixture
+def connect_account() -> Iterator[Callable[..., FakeStatistics]]:
+    """
+    The fixture returns a function connecting `MySnowflake` to a synthetic account with fake connections, and returning
+    the statistics of the connections. The pool is closed at the end of the test.
+    """
+
+    def connect(account: SyntheticAccount, **options: Any) -> FakeStatistics:
+        statistics: FakeStatistics = FakeStatistics()
+        MySnowflake.initialize_database({"role": "TEST"}, SnowflakeOptions(4, functools.partial(FakeConnection, statistics, FakeBehavior(**options), account)))
+        return statistics
+
+    yield connect
+
+    MySnowflake.pool.close()
@@ -0,0 +1,109 @@
+"""tests/test_account_usage.py"""
+
+import sqlite3
+from typing import Any, Dict, Iterator, List
+
+import pandas as pd
+import pytest
+
+from snow_revoke_privileges.snow_account_usage import SnowAccountUsage
+from snow_revoke_privileges.tools.configuration import Configuration
+
+# Columns of the ACCOUNT_USAGE views read by `SnowAccountUsage` (same names as in Snowflake).
+VIEWS: Dict[str, List[str]] = {
+    "DATABASES": ["DATABASE_NAME", "DATABASE_OWNER", "TYPE", "CREATED", "LAST_ALTERED", "DELETED"],
+    "SCHEMATA": ["SCHEMA_NAME", "CATALOG_NAME", "SCHEMA_OWNER", "CREATED", "LAST_ALTERED", "DELETED"],
+    "TABLES": ["TABLE_NAME", "TABLE_SCHEMA", "TABLE_CATALOG", "TABLE_OWNER", "TABLE_TYPE", "CREATED", "LAST_ALTERED", "DELETED"],
+    "VIEWS": ["TABLE_NAME", "TABLE_SCHEMA", "TABLE_CATALOG", "TABLE_OWNER", "CREATED", "LAST_ALTERED", "DELETED"],
+    "FUNCTIONS": ["FUNCTION_NAME", "FUNCTION_SCHEMA", "FUNCTION_CATALOG", "FUNCTION_OWNER", "ARGUMENT_SIGNATURE", "CREATED", "LAST_ALTERED", "DELETED"],
+    "PROCEDURES": ["PROCEDURE_NAME", "PROCEDURE_SCHEMA", "PROCEDURE_CATALOG", "PROCEDURE_OWNER", "ARGUMENT_SIGNATURE", "CREATED", "LAST_ALTERED", "DELETED"],
+    "SEQUENCES": ["SEQUENCE_NAME", "SEQUENCE_SCHEMA", "SEQUENCE_CATALOG", "SEQUENCE_OWNER", "CREATED", "LAST_ALTERED", "DELETED"],
+    "STAGES": ["STAGE_NAME", "STAGE_SCHEMA", "STAGE_CATALOG", "STAGE_OWNER", "CREATED", "LAST_ALTERED", "DELETED"],
+    "FILE_FORMATS": ["FILE_FORMAT_NAME", "FILE_FORMAT_SCHEMA", "FILE_FORMAT_CATALOG", "FILE_FORMAT_OWNER", "CREATED", "LAST_ALTERED", "DELETED"],
+    "PIPES": ["PIPE_NAME", "PIPE_SCHEMA", "PIPE_CATALOG", "PIPE_OWNER", "CREATED", "LAST_ALTERED", "DELETED"],
+    "GRANTS_TO_ROLES": ["PRIVILEGE", "GRANTED_ON", "NAME", "TABLE_CATALOG", "TABLE_SCHEMA", "GRANTED_TO", "GRANTEE_NAME", "DELETED_ON"],
+}
+
+ROWS: Dict[str, List[Dict[str, Any]]] = {
+    "DATABASES": [
+        {"DATABASE_NAME": "SALES", "DATABASE_OWNER": "DBA", "TYPE": "STANDARD"},
+        {"DATABASE_NAME": "OTHER", "DATABASE_OWNER": "DBA", "TYPE": "STANDARD"},
+        {"DATABASE_NAME": "SHARED", "DATABASE_OWNER": "DBA", "TYPE": "IMPORTED DATABASE"},
+    ],
+    "SCHEMATA": [
+        {"SCHEMA_NAME": "PUBLIC", "CATALOG_NAME": "SALES", "SCHEMA_OWNER": "DBA"},
+        {"SCHEMA_NAME": "INFORMATION_SCHEMA", "CATALOG_NAME": "SALES"},
+    ],
+    "TABLES": [
+        {"TABLE_NAME": "ORDERS", "TABLE_SCHEMA": "PUBLIC", "TABLE_CATALOG": "SALES", "TABLE_OWNER": "ANALYST", "TABLE_TYPE": "BASE TABLE"},
+        {"TABLE_NAME": "DROPPED", "TABLE_SCHEMA": "PUBLIC", "TABLE_CATALOG": "SALES", "TABLE_TYPE": "BASE TABLE", "DELETED": "2024-01-01"},
+        {"TABLE_NAME": "ORDERS_MV", "TABLE_SCHEMA": "PUBLIC", "TABLE_CATALOG": "SALES", "TABLE_TYPE": "MATERIALIZED VIEW"},
+        {"TABLE_NAME": "TABLES", "TABLE_SCHEMA": "INFORMATION_SCHEMA", "TABLE_CATALOG": "SALES", "TABLE_TYPE": "BASE TABLE"},
+        {"TABLE_NAME": "CUSTOMERS", "TABLE_SCHEMA": "PUBLIC", "TABLE_CATALOG": "OTHER", "TABLE_TYPE": "BASE TABLE"},
+    ],
+    "FUNCTIONS": [
+        {"FUNCTION_NAME": "ADD_TAX", "FUNCTION_SCHEMA": "PUBLIC", "FUNCTION_CATALOG": "SALES", "FUNCTION_OWNER": "ANALYST", "ARGUMENT_SIGNATURE": "(AMOUNT NUMBER, RATE FLOAT)"},
+    ],
+    "GRANTS_TO_ROLES": [
+        {"PRIVILEGE": "USAGE", "GRANTED_ON": "DATABASE", "NAME": "SALES", "GRANTED_TO": "ROLE", "GRANTEE_NAME": "ANALYST"},
+        {"PRIVILEGE": "USAGE", "GRANTED_ON": "SCHEMA", "NAME": "PUBLIC", "TABLE_CATALOG": "SALES", "GRANTED_TO": "ROLE", "GRANTEE_NAME": "ANALYST"},
+        {"PRIVILEGE": "SELECT", "GRANTED_ON": "TABLE", "NAME": "ORDERS", "TABLE_CATALOG": "SALES", "TABLE_SCHEMA": "PUBLIC", "GRANTED_TO": "ROLE", "GRANTEE_NAME": "ANALYST"},
+        {"PRIVILEGE": "SELECT", "GRANTED_ON": "TABLE", "NAME": "ORDERS", "TABLE_CATALOG": "SALES", "TABLE_SCHEMA": "PUBLIC", "GRANTED_TO": "ROLE", "GRANTEE_NAME": "OLD", "DELETED_ON": "2024-01-01"},
+        {"PRIVILEGE": "SELECT", "GRANTED_ON": "TABLE", "NAME": "CUSTOMERS", "TABLE_CATALOG": "OTHER", "TABLE_SCHEMA": "PUBLIC", "GRANTED_TO": "ROLE", "GRANTEE_NAME": "ANALYST"},
+    ],
+}
+
+
+@pytest.fixture
+def account_usage() -> Iterator[SnowAccountUsage]:
+    """The fixture returns a `SnowAccountUsage` reading the views of an in-memory SQLite stand-in of ACCOUNT_USAGE."""
+
+    connection: sqlite3.Connection = sqlite3.connect(":memory:")
+    connection.execute("ATTACH DATABASE ':memory:' AS ACCOUNT_USAGE")
+
+    for view, columns in VIEWS.items():
+        connection.execute(f"CREATE TABLE ACCOUNT_USAGE.{view} ({', '.join(columns)})")
+
+        for row in ROWS.get(view, []):
+            connection.execute(f"INSERT INTO ACCOUNT_USAGE.{view} ({', '.join(row)}) VALUES ({', '.join('?' for _ in row)})", list(row.values()))
+
+    config: Configuration = Configuration({"settings": {"run_dry": True, "new_owner": "SYSADMIN", "databases": ["SALES"], "objects": ["TABLE"]}})
+
+    try:
+        yield SnowAccountUsage(lambda request: pd.read_sql_query(request, connection), "ACCOUNT_USAGE", config)
+    finally:
+        connection.close()
+
+
+def test_all_views_can_be_queried(account_usage: SnowAccountUsage) -> None:
+    """The SELECT generated for each type of object only uses the columns of its view."""
+
+    for object_type in account_usage.views:
+        objects: pd.DataFrame = account_usage.retrieve_objects(object_type)
+        assert list(objects.columns) == ["DATABASE_NAME", "SCHEMA_NAME", "OBJECT_NAME", "ARGUMENTS", "CREATED_ON", "LAST_ALTERED", "OWNER"]
+
+
+def test_objects_are_filtered(account_usage: SnowAccountUsage) -> None:
+    """The deleted objects, the other databases, the ignored schemas and the other table types are left out."""
+
+    assert list(account_usage.retrieve_objects("DATABASE")["DATABASE_NAME"]) == ["SALES"]
+    assert list(account_usage.retrieve_objects("SCHEMA")["SCHEMA_NAME"]) == ["PUBLIC"]
+    assert list(account_usage.retrieve_objects("TABLE")["OBJECT_NAME"]) == ["ORDERS"]
+    assert list(account_usage.retrieve_objects("MATERIALIZED VIEW")["OBJECT_NAME"]) == ["ORDERS_MV"]
+
+
+def test_function_arguments_match_show_output(account_usage: SnowAccountUsage) -> None:
+    """The signature of the view is converted to the arguments returned by the SHOW commands."""
+
+    functions: pd.DataFrame = account_usage.retrieve_objects("FUNCTION")
+
+    assert list(functions["ARGUMENTS"]) == ["ADD_TAX(NUMBER,FLOAT)"]
+
+
+def test_grants_are_qualified(account_usage: SnowAccountUsage) -> None:
+    """The current grants of the selected databases are returned with the names of a SHOW GRANTS command."""
+
+    grants: pd.DataFrame = account_usage.retrieve_grants()
+
+    assert sorted(grants["name"]) == ['"SALES"', '"SALES"."PUBLIC"', '"SALES"."PUBLIC"."ORDERS"']
+    assert list(grants.columns) == ["privilege", "granted_on", "name", "granted_to", "grantee_name"]
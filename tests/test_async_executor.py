@@ -0,0 +1,98 @@
+"""tests/test_async_executor.py"""
+
+import functools
+from typing import Any, List, Optional, Tuple
+
+import pandas as pd
+import pytest
+
+from snow_revoke_privileges.benchmark.fake_snowflake import FakeBehavior, FakeConnection, FakeStatistics
+from snow_revoke_privileges.tools.concurrency_controller import ConcurrencyController
+from snow_revoke_privileges.tools.execution_ledger import FAILED, SUCCESS, RequestResult
+from snow_revoke_privileges.tools.retry_policy import RetryPolicy
+from snow_revoke_privileges.tools.run_metrics import RunMetrics
+from snow_revoke_privileges.tools.snowflake_async_executor import ExecutionContext, SnowflakeAsyncExecutor
+from snow_revoke_privileges.tools.snowflake_pool import SnowflakeConnectionPool
+
+
+class LostConnection(FakeConnection):
+    """
+    The `LostConnection` class is a fake connection which is lost as soon as the status of a request is polled.
+    """
+
+    def get_query_status(self, query_id: str) -> str:
+        """..."""
+        raise OSError("The connection was reset.")
+
+
+def refuse_connection(**config: Any) -> FakeConnection:
+    """
+    The function mimics a connector which cannot open any connection.
+    """
+
+    raise OSError("The connection was refused.")
+
+
+def run_requests(connect: Any, requests: List[str], connections: int, window: int) -> List[Tuple[RequestResult, Optional[pd.DataFrame], Optional[Exception]]]:
+    """
+    The function executes requests asynchronously and returns their results.
+    """
+
+    pool: SnowflakeConnectionPool = SnowflakeConnectionPool({"role": "TEST"}, connections, connect)
+    context: ExecutionContext = ExecutionContext(RunMetrics(), ConcurrencyController(connections, connections), RetryPolicy())
+
+    try:
+        return list(SnowflakeAsyncExecutor(pool, window, context).run(requests))
+    finally:
+        pool.close()
+
+
+def test_connection_refused_is_raised() -> None:
+    """When no connection can be opened, the error is raised instead of returning without any result."""
+
+    with pytest.raises(OSError, match="refused"):
+        run_requests(refuse_connection, [f"REVOKE {i}" for i in range(3)], 2, 4)
+
+
+def test_requests_in_flight_on_a_lost_connection_fail() -> None:
+    """The requests in flight on a connection which is lost are reported as failed with its error."""
+
+    results: List[Tuple[RequestResult, Optional[pd.DataFrame], Optional[Exception]]] = run_requests(functools.partial(LostConnection, FakeStatistics()), [f"REVOKE {i}" for i in range(3)], 1, 4)
+
+    assert sorted(result.request for result, _, _ in results) == ["REVOKE 0", "REVOKE 1", "REVOKE 2"]
+    assert all(result.status == FAILED and isinstance(error, OSError) for result, _, error in results)
+
+
+def test_requests_left_on_lost_connections_are_raised() -> None:
+    """The error is raised when all the connections are lost before all the requests were submitted."""
+
+    with pytest.raises(OSError, match="reset"):
+        run_requests(functools.partial(LostConnection, FakeStatistics()), [f"REVOKE {i}" for i in range(5)], 1, 2)
+
+
+def test_requests_in_flight_follow_the_controller() -> None:
+    """The requests in flight are limited by the window of the concurrency controller, scaled to the asynchronous window."""
+
+    controller: ConcurrencyController = ConcurrencyController(1, 4, initial_window=1)
+    measures: List[Tuple[int, int]] = []
+
+    class MeasuredExecutor(SnowflakeAsyncExecutor):
+        """..."""
+
+        def next_request(self) -> Optional[str]:
+            """..."""
+            request: Optional[str] = super().next_request()
+            measures.append((self.state.in_flight, controller.get_scaled_window(8)))
+            return request
+
+    pool: SnowflakeConnectionPool = SnowflakeConnectionPool({"role": "TEST"}, 2, functools.partial(FakeConnection, FakeStatistics(), FakeBehavior(0.01)))
+    context: ExecutionContext = ExecutionContext(RunMetrics(), controller, RetryPolicy())
+
+    try:
+        results: List[Tuple[RequestResult, Optional[pd.DataFrame], Optional[Exception]]] = list(MeasuredExecutor(pool, 8, context).run([f"REVOKE {i}" for i in range(6)]))
+    finally:
+        pool.close()
+
+    assert all(result.status == SUCCESS for result, _, _ in results) and len(results) == 6
+    assert measures[0] == (1, 2)
+    assert all(in_flight <= window for in_flight, window in measures)
@@ -0,0 +1,49 @@
+"""tests/test_concurrency_controller.py"""
+
+from snow_revoke_privileges.tools.concurrency_controller import ConcurrencyController
+
+
+def run_round(controller: ConcurrencyController, latency: float, failed: bool = False) -> None:
+    """The function executes a full round of requests with the same latency."""
+
+    for position in range(controller.window):
+        controller.acquire()
+        controller.release(latency, failed and position == 0)
+
+
+def test_window_grows_while_healthy_and_halves_on_errors() -> None:
+    """The window grows by one after each healthy round, and is halved by a transient error."""
+
+    controller: ConcurrencyController = ConcurrencyController(2, 8)
+
+    for _ in range(10):
+        run_round(controller, 0.1)
+
+    assert controller.window == 8
+
+    run_round(controller, 0.1, failed=True)
+    assert controller.window == 4
+
+    controller.record_error(RuntimeError("throttled"))
+    run_round(controller, 0.1)
+    assert controller.window == 2
+
+
+def test_window_halves_when_the_latency_degrades() -> None:
+    """The window is halved when the latency of a round exceeds the best one by the tolerance."""
+
+    controller: ConcurrencyController = ConcurrencyController(1, 16, initial_window=8, latency_tolerance=2.0)
+
+    run_round(controller, 0.1)
+    run_round(controller, 0.5)
+
+    assert controller.window == 4
+    assert [window for _, window in controller.history] == [8, 9, 4]
+
+
+def test_from_settings_defaults_to_a_fixed_window() -> None:
+    """Without the concurrency section, the window is fixed to the number of connections."""
+
+    controller: ConcurrencyController = ConcurrencyController.from_settings({"connections": 6})
+
+    assert (controller.min_window, controller.max_window, controller.window) == (6, 6, 6)
@@ -0,0 +1,68 @@
+"""tests/test_configuration.py"""
+
+from typing import Any, Dict
+
+import pytest
+
+from snow_revoke_privileges.tools.configuration import Configuration, ConfigurationError
+
+
+def create_configuration(**settings: Any) -> Configuration:
+    """
+    The function creates a configuration whose mandatory settings are valid.
+    """
+
+    defaults: Dict[str, Any] = {"run_dry": True, "new_owner": "SYSADMIN", "databases": ["DB"], "objects": ["TABLE"], "log_level": "info"}
+
+    return Configuration({"settings": {**defaults, **settings}, "snowflake_credentials": {"role": "ACCOUNTADMIN"}})
+
+
+@pytest.mark.parametrize("settings", [{"discovery_mode": "ROLE"}, {"inventory_mode": "Show"}, {"execution_order": "WAVES"}])
+def test_values_are_compared_exactly(settings: Dict[str, Any]) -> None:
+    """A value whose case differs from the allowed values is rejected, since the classes of the run compare it exactly."""
+
+    with pytest.raises(ConfigurationError, match="must be one of"):
+        create_configuration(**settings).validate()
+
+
+def test_log_level_ignores_case() -> None:
+    """The log level is given to the logger in upper case, so its case is ignored."""
+
+    assert create_configuration(log_level="INFO").validate()["log_level"] == "INFO"
+
+
+def test_invalid_settings_are_reported_together() -> None:
+    """All the errors of the settings are given in the message."""
+
+    with pytest.raises(ConfigurationError) as error:
+        create_configuration(databases=["DB", 1], connections=0, run_dry="yes").validate()
+
+    assert "'databases' must be a list of strings" in str(error.value)
+    assert "'connections' must be greater than or equal to 1" in str(error.value)
+    assert "'run_dry' must be of type bool" in str(error.value)
+
+
+@pytest.mark.parametrize(
+    "settings, message",
+    [
+        ({"retry": {"max_attempts": "x"}}, "'retry.max_attempts' must be of type int"),
+        ({"retry": {"base_delay": -1}}, "'retry.base_delay' must be greater than or equal to 0"),
+        ({"concurrency": {"min": 0, "max": 8}}, "'concurrency.min' must be greater than or equal to 1"),
+        ({"concurrency": {"initial": 2.5}}, "'concurrency.initial' must be of type int"),
+        ({"schema_shard": {"bucket": 0}}, "'schema_shard.buckets' is mandatory"),
+        ({"schema_shard": {"bucket": 2, "buckets": 2}}, "'schema_shard.bucket' must be lower than 'schema_shard.buckets'"),
+    ],
+)
+def test_nested_settings_are_checked(settings: Dict[str, Any], message: str) -> None:
+    """The keys of the `retry`, `concurrency` and `schema_shard` mappings are checked before any connection."""
+
+    with pytest.raises(ConfigurationError, match=message):
+        create_configuration(**settings).validate()
+
+
+def test_valid_nested_settings_are_accepted() -> None:
+    """The mappings whose keys match their schema are accepted, a float setting accepting an integer."""
+
+    settings: Dict[str, Any] = {"retry": {"max_attempts": 3, "base_delay": 1, "max_delay": 10.0}, "concurrency": {"min": 2, "max": 16, "initial": 4}, "schema_shard": {"bucket": 1, "buckets": 2}}
+
+    assert create_configuration(**settings).validate()["schema_shard"] == {"bucket": 1, "buckets": 2}
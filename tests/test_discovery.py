@@ -0,0 +1,32 @@
+"""tests/test_discovery.py"""
+
+from typing import Callable, List, Set
+
+from snow_revoke_privileges.benchmark.synthetic_account import SyntheticAccount
+
+
+def test_role_discovery_matches_object_discovery(run_application: Callable[..., Set[str]]) -> None:
+    """The grants retrieved role by role produce the same requests as the grants retrieved object by object."""
+
+    account: SyntheticAccount = SyntheticAccount(databases=2, schemas=3, objects={"TABLE": 6, "VIEW": 3, "FUNCTION": 2, "PROCEDURE": 2})
+
+    by_object: Set[str] = run_application(account, "object", discovery_mode="object", run_dry=True)
+    by_role: Set[str] = run_application(account, "role", discovery_mode="role", run_dry=True)
+
+    assert any(request.startswith("REVOKE") for request in by_object)
+    assert any(request.startswith("REVOKE ALL PRIVILEGES ON FUNCTION") for request in by_object)
+    assert any(request.startswith("REVOKE ALL PRIVILEGES ON PROCEDURE") for request in by_object)
+    assert by_role == by_object
+
+
+def test_role_discovery_skips_missing_databases(run_application: Callable[..., Set[str]]) -> None:
+    """The databases of the configuration which do not exist are skipped by both discovery modes."""
+
+    account: SyntheticAccount = SyntheticAccount(databases=2, schemas=2, objects={"TABLE": 3})
+    databases: List[str] = ["DB_000", "MISSING", "DB_001"]
+
+    by_object: Set[str] = run_application(account, "object", discovery_mode="object", databases=databases, run_dry=True)
+    by_role: Set[str] = run_application(account, "role", discovery_mode="role", databases=databases, run_dry=True)
+
+    assert any(request.startswith("REVOKE") for request in by_object)
+    assert by_role == by_object
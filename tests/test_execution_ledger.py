@@ -0,0 +1,40 @@
+"""tests/test_execution_ledger.py"""
+
+import logging
+from pathlib import Path
+
+import pytest
+
+from snow_revoke_privileges.tools.execution_ledger import FAILED, SUCCESS, ExecutionLedger, RequestResult
+
+
+def test_resume_skips_successful_requests(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """A resumed run executes again the requests which have failed or were not executed."""
+
+    path: str = str(tmp_path / "ledger.jsonl")
+
+    ledger: ExecutionLedger = ExecutionLedger(path)
+    ledger.record(RequestResult("REVOKE 1", SUCCESS, "01", 0.1))
+    ledger.record(RequestResult("REVOKE 2", FAILED, "02", 0.1, "ProgrammingError"))
+    ledger.close()
+
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('{"hash": "trunc')
+
+    with caplog.at_level(logging.INFO, logger="app"):
+        resumed: ExecutionLedger = ExecutionLedger(path, resume=True)
+
+    assert resumed.get_pending_requests(["REVOKE 1", "REVOKE 2", "REVOKE 3"]) == ["REVOKE 2", "REVOKE 3"]
+    assert any("1 requests has failed" in record.getMessage() for record in caplog.records)
+
+
+def test_new_run_starts_a_new_ledger(tmp_path: Path) -> None:
+    """Without resume, the ledger of the previous run is discarded."""
+
+    path: str = str(tmp_path / "ledger.jsonl")
+
+    ledger: ExecutionLedger = ExecutionLedger(path)
+    ledger.record(RequestResult("REVOKE 1", SUCCESS, "01", 0.1))
+    ledger.close()
+
+    assert ExecutionLedger(path).get_pending_requests(["REVOKE 1"]) == ["REVOKE 1"]
@@ -0,0 +1,91 @@
+"""tests/test_objects.py"""
+
+import re
+from typing import Any, Callable, Dict, List, Set
+
+import pandas as pd
+import pytest
+
+from snow_revoke_privileges.benchmark.account import create_settings
+from snow_revoke_privileges.benchmark.fake_snowflake import FakeStatistics
+from snow_revoke_privileges.benchmark.synthetic_account import SyntheticAccount
+from snow_revoke_privileges.snow_objects import SnowObjects
+from snow_revoke_privileges.tools.configuration import Configuration
+from snow_revoke_privileges.tools.shard_manifest import get_schema_bucket
+
+
+def retrieve_objects(account: SyntheticAccount, **settings: Any) -> pd.DataFrame:
+    """The function returns the objects found by `SnowObjects` in a synthetic account."""
+
+    snow_objects: SnowObjects = SnowObjects(Configuration(create_settings(account, **settings)))
+    snow_objects.retrieve()
+    snow_objects.filter()
+
+    return snow_objects.get_dataframe()
+
+
+@pytest.mark.parametrize("settings", [{}, {"schemas": ["SCHEMA_0000", "SCHEMA_0001", "SCHEMA_0002"]}, {"scope_pushdown": False}])
+def test_pages_do_not_mix_schemas(connect_account: Callable[..., FakeStatistics], settings: Dict[str, Any]) -> None:
+    """The names repeated in several schemas are neither skipped nor returned twice when the pages are small."""
+
+    account: SyntheticAccount = SyntheticAccount(databases=2, schemas=3, objects={"TABLE": 5})
+    connect_account(account)
+
+    objects: pd.DataFrame = retrieve_objects(account, show_page_size=2, **settings)
+    tables: pd.DataFrame = objects.loc[objects["OBJECT_TYPE"] == "TABLE"]
+
+    assert len(objects.loc[objects["OBJECT_TYPE"] == "SCHEMA"]) == 6
+    assert len(tables) == 30
+    assert not tables.duplicated(["DATABASE_NAME", "SCHEMA_NAME", "OBJECT_NAME"]).any()
+
+
+def test_only_unique_names_are_paginated() -> None:
+    """Only the SHOW commands whose names are unique in their scope are paginated."""
+
+    assert SnowObjects.is_paginable('SHOW TABLES IN SCHEMA "DB"."PUBLIC"', "TABLE")
+    assert SnowObjects.is_paginable('SHOW SCHEMAS IN DATABASE "DB"', "SCHEMA")
+    assert SnowObjects.is_paginable("SHOW DATABASES IN ACCOUNT", "DATABASE")
+    assert not SnowObjects.is_paginable('SHOW TABLES IN DATABASE "DB"', "TABLE")
+    assert not SnowObjects.is_paginable("SHOW SCHEMAS IN ACCOUNT", "SCHEMA")
+
+
+@pytest.mark.parametrize("settings", [{"schemas": [f"SCHEMA_{schema:04d}" for schema in range(8)]}, {"pipeline": True}])
+def test_schema_buckets_skip_the_other_schemas(connect_account: Callable[..., FakeStatistics], settings: Dict[str, Any]) -> None:
+    """Each schema is listed by the shard of its bucket only, and the buckets together list all the schemas."""
+
+    account: SyntheticAccount = SyntheticAccount(databases=1, schemas=8, objects={"TABLE": 2})
+    statistics: FakeStatistics = connect_account(account)
+    tables: List[pd.DataFrame] = []
+
+    for bucket in range(2):
+        schema_shard: Dict[str, int] = {"bucket": bucket, "buckets": 2}
+        start: int = len(statistics.statements)
+
+        if settings.get("pipeline", False) is True:
+            snow_objects: SnowObjects = SnowObjects(Configuration(create_settings(account, schema_shard=schema_shard)))
+            objects: pd.DataFrame = pd.concat(list(snow_objects.iterate_schemas()))
+        else:
+            objects = retrieve_objects(account, schema_shard=schema_shard, **settings)
+
+        shown: Set[str] = set(re.findall(r'^SHOW TABLES IN SCHEMA "[^"]+"\."([^"]+)"', "\n".join(statistics.statements[start:]), re.MULTILINE))
+        kept: Set[str] = {schema for database, schema in zip(account.all_schemas["DATABASE_NAME"], account.all_schemas["SCHEMA_NAME"]) if get_schema_bucket(database, schema, 2) == bucket}
+
+        assert 0 < len(shown) < 8
+        assert shown == kept
+        tables.append(objects.loc[objects["OBJECT_TYPE"] == "TABLE"])
+
+    assert len(pd.concat(tables).drop_duplicates(["SCHEMA_NAME", "OBJECT_NAME"])) == 16
+
+
+def test_missing_schemas_are_not_listed(connect_account: Callable[..., FakeStatistics]) -> None:
+    """The schemas selected in the configuration which do not exist in a database are not listed, since their SHOW commands fail."""
+
+    account: SyntheticAccount = SyntheticAccount(databases=2, schemas=2, objects={"TABLE": 3})
+    statistics: FakeStatistics = connect_account(account)
+
+    objects: pd.DataFrame = retrieve_objects(account, schemas=["SCHEMA_0000", "MISSING"])
+    tables: pd.DataFrame = objects.loc[objects["OBJECT_TYPE"] == "TABLE"]
+
+    assert set(zip(tables["DATABASE_NAME"], tables["SCHEMA_NAME"])) == {("DB_000", "SCHEMA_0000"), ("DB_001", "SCHEMA_0000")}
+    assert len(tables) == 6
+    assert not any("MISSING" in statement for statement in statistics.statements)
@@ -0,0 +1,61 @@
+"""tests/test_privileges.py"""
+
+from typing import Callable, Set
+
+import pandas as pd
+
+from snow_revoke_privileges.benchmark.account import create_settings
+from snow_revoke_privileges.benchmark.synthetic_account import SyntheticAccount
+from snow_revoke_privileges.snow_privileges import SnowPrivileges
+from snow_revoke_privileges.tools.configuration import Configuration
+
+
+def test_future_grants_are_kept_by_default(run_application: Callable[..., Set[str]]) -> None:
+    """The future grants are only revoked with `revoke_future_grants`."""
+
+    account: SyntheticAccount = SyntheticAccount(databases=1, schemas=2, objects={"TABLE": 3})
+
+    default: Set[str] = run_application(account, "default", run_dry=True)
+    revoked: Set[str] = run_application(account, "revoked", run_dry=True, revoke_future_grants=True)
+
+    assert not any(request.startswith("REVOKE ALL PRIVILEGES ON FUTURE") for request in default)
+    assert {request for request in revoked if not request.startswith("REVOKE ALL PRIVILEGES ON FUTURE")} == default
+    assert any(request.startswith("REVOKE ALL PRIVILEGES ON FUTURE TABLES IN SCHEMA") for request in revoked)
+
+
+def test_inventory_ownerships_keep_the_type_of_owner() -> None:
+    """The ownerships built from the inventory are granted to a role or to a database role, as returned in `owner_role_type`."""
+
+    account: SyntheticAccount = SyntheticAccount(databases=1, schemas=1, objects={"TABLE": 2})
+    objects: pd.DataFrame = pd.DataFrame(
+        {
+            "KEY_OBJECT": ['"DB_000"."SCHEMA_0000"."TABLE_000000"', '"DB_000"."SCHEMA_0000"."TABLE_000001"', '"DB_000"."SCHEMA_0000"."TABLE_000002"'],
+            "OBJECT_TYPE": "TABLE",
+            "ARGUMENTS": None,
+            "OWNER": ["ROLE_000", "DB_000.ADMIN", "ROLE_001"],
+            "OWNER_ROLE_TYPE": ["ROLE", "DATABASE_ROLE", None],
+        }
+    )
+
+    ownerships: pd.DataFrame = SnowPrivileges(objects, config=Configuration(create_settings(account))).get_inventory_ownerships(objects)
+
+    assert list(ownerships["GRANTED_TO"]) == ["ROLE", "DATABASE_ROLE", "ROLE"]
+
+
+def test_owner_prefilter_keeps_the_grants_of_the_owned_objects(run_application: Callable[..., Set[str]]) -> None:
+    """The grants on the objects already owned by `new_owner` are still revoked, and the ownerships are transferred to the role `new_owner`."""
+
+    account: SyntheticAccount = SyntheticAccount(databases=1, schemas=2, objects={"TABLE": 3})
+    owned: pd.DataFrame = account.all_objects.loc[account.all_objects["OWNER"] == account.new_owner]
+    owned_keys: Set[str] = {f'"{database}"."{schema}"."{name}"' for database, schema, name in zip(owned["DATABASE_NAME"], owned["SCHEMA_NAME"], owned["NAME"])}
+
+    default: Set[str] = run_application(account, "default", run_dry=True)
+    prefiltered: Set[str] = run_application(account, "prefiltered", run_dry=True, owner_prefilter=True)
+
+    def get_owned_revokes(requests: Set[str]) -> Set[str]:
+        """..."""
+        return {request for request in requests if request.startswith("REVOKE ") and any(f" {key} " in request for key in owned_keys)}
+
+    assert len(owned_keys) > 0 and len(get_owned_revokes(default)) > 0
+    assert get_owned_revokes(prefiltered) == get_owned_revokes(default)
+    assert all(f" TO ROLE {account.new_owner}" in request for request in prefiltered if request.startswith("GRANT OWNERSHIP "))
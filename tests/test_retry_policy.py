@@ -0,0 +1,121 @@
+"""tests/test_retry_policy.py"""
+
+import functools
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+from snowflake.connector.errors import OperationalError, ProgrammingError, TooManyRequests
+
+from snow_revoke_privileges.benchmark.fake_snowflake import FakeBehavior, FakeConnection, FakeStatistics
+from snow_revoke_privileges.tools.execution_ledger import FAILED, SUCCESS, RequestResult
+from snow_revoke_privileges.tools.my_snowflake import MySnowflake, SnowflakeOptions
+from snow_revoke_privileges.tools.snowflake_batch_executor import SnowflakeBatchExecutor
+from snow_revoke_privileges.tools.retry_policy import RetryPolicy, write_dead_letter
+
+
+class FlakyCall:
+    """The `FlakyCall` class fails with given errors before succeeding."""
+
+    def __init__(self, errors: List[Exception]) -> None:
+        self.errors = errors
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+
+        if len(self.errors) > 0:
+            raise self.errors.pop(0)
+
+        return "done"
+
+
+def test_transient_errors_are_retried_with_backoff() -> None:
+    """A call failing with transient errors is executed again after longer and longer delays."""
+
+    delays: List[float] = []
+    errors: List[BaseException] = []
+    policy: RetryPolicy = RetryPolicy(5, base_delay=1.0, max_delay=30.0, sleep=delays.append)
+    policy.listener = errors.append
+    call: FlakyCall = FlakyCall([OperationalError(msg="Connection reset by peer."), OperationalError(msg="Connection reset by peer."), OperationalError(msg="Connection reset by peer.")])
+
+    assert policy.call(call) == "done"
+    assert call.calls == 4
+    assert len(errors) == 3
+    assert 0.5 <= delays[0] <= 1.0
+    assert 1.0 <= delays[1] <= 2.0
+    assert 2.0 <= delays[2] <= 4.0
+
+
+def test_permanent_errors_are_not_retried() -> None:
+    """A call failing with a permanent error is not executed again."""
+
+    delays: List[float] = []
+    call: FlakyCall = FlakyCall([ProgrammingError(msg="SQL compilation error.")])
+
+    with pytest.raises(ProgrammingError):
+        RetryPolicy(5, sleep=delays.append).call(call)
+
+    assert call.calls == 1
+    assert len(delays) == 0
+
+
+def test_last_error_is_raised_after_the_last_attempt() -> None:
+    """The last transient error is raised when all the attempts have failed."""
+
+    delays: List[float] = []
+    call: FlakyCall = FlakyCall([OperationalError(msg="Connection reset by peer.") for _ in range(5)])
+
+    with pytest.raises(OperationalError):
+        RetryPolicy(3, sleep=delays.append).call(call)
+
+    assert call.calls == 3
+    assert len(delays) == 2
+
+
+def test_throttling_doubles_the_delay_up_to_the_maximum() -> None:
+    """The delays are doubled when Snowflake throttles the requests, and never exceed the maximum."""
+
+    policy: RetryPolicy = RetryPolicy(base_delay=1.0, max_delay=10.0)
+    throttling: TooManyRequests = TooManyRequests(msg="Too many requests.")
+
+    assert 1.0 <= policy.get_delay(1, throttling) <= 2.0
+    assert 5.0 <= policy.get_delay(10, throttling) <= 10.0
+    assert policy.is_transient(throttling)
+    assert not policy.is_transient(ProgrammingError(msg="SQL compilation error."))
+
+
+def test_dead_letter_only_contains_failed_requests(tmp_path: Path) -> None:
+    """The failed requests are written with their error, and the file is removed when nothing has failed."""
+
+    path: str = str(tmp_path / "dead-letter.sql")
+    results: List[RequestResult] = [RequestResult("REVOKE 1", SUCCESS, "01", 0.1), RequestResult("REVOKE 2", FAILED, "02", 0.1, "ProgrammingError: line 1\nline 2")]
+
+    assert write_dead_letter(path, results) == 1
+
+    with open(path, "r", encoding="utf-8") as file:
+        assert file.read() == "-- ProgrammingError: line 1 line 2\nREVOKE 2;\n"
+
+    assert write_dead_letter(path, results[:1]) == 0
+    assert not os.path.exists(path)
+
+
+@pytest.mark.parametrize("batch_size", [0, 5])
+def test_only_permanent_errors_reach_the_dead_letter(batch_size: int) -> None:
+    """With fake connections injecting transient errors, only the requests failing with a permanent error fail."""
+
+    statistics: FakeStatistics = FakeStatistics()
+    connect = functools.partial(FakeConnection, statistics, FakeBehavior(transient_rate=0.5))
+    MySnowflake.initialize_database({"role": "TEST"}, SnowflakeOptions(4, connect, batch_size=batch_size, retry_policy=RetryPolicy(50, base_delay=0.0, sleep=lambda _: None)))
+
+    requests: List[str] = [f"REVOKE ALL PRIVILEGES ON TABLE T_{position} FROM ROLE R" for position in range(100)] + ["REVOKE ALL PRIVILEGES ON TABLE FAIL FROM ROLE R"]
+
+    try:
+        results: List[RequestResult] = SnowflakeBatchExecutor.execute_multi_requests(requests)
+    finally:
+        MySnowflake.pool.close()
+
+    assert statistics.transient_errors > 0
+    assert len(results) == len(requests)
+    assert [result.request for result in results if result.status == FAILED] == ["REVOKE ALL PRIVILEGES ON TABLE FAIL FROM ROLE R"]
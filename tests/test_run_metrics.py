@@ -0,0 +1,28 @@
+"""tests/test_run_metrics.py"""
+
+from typing import Any, Dict
+
+from snow_revoke_privileges.tools.run_metrics import RunMetrics
+
+
+def test_report_counts_each_phase_and_the_total() -> None:
+    """The requests are counted in the phase running, and the total adds up the counts of all the phases."""
+
+    metrics: RunMetrics = RunMetrics("test")
+
+    with metrics.phase("objects"):
+        metrics.record_query("SHOW TABLES IN DATABASE DB", 0.1, rows=10)
+        metrics.record_retry(OSError())
+        metrics.record_query("SHOW TABLES IN DATABASE DB", 0.2, rows=10)
+
+    with metrics.phase("revoke"):
+        metrics.record_query("REVOKE SELECT ON TABLE T FROM ROLE R;\nREVOKE SELECT ON TABLE U FROM ROLE R", 0.3, failed=True, statements=2)
+
+    report: Dict[str, Any] = metrics.get_report()
+    phases: Dict[str, Dict[str, Any]] = {phase["name"]: phase for phase in report["phases"]}
+
+    assert list(phases) == ["objects", "revoke"]
+    assert {key: phases["objects"][key] for key in ("queries", "statements", "rows", "retries", "errors")} == {"queries": 2, "statements": 2, "rows": 20, "retries": 1, "errors": 0}
+    assert phases["revoke"]["queries_by_kind"] == {"REVOKE": 1}
+    assert {key: report["total"][key] for key in ("queries", "statements", "rows", "retries", "errors")} == {"queries": 3, "statements": 4, "rows": 20, "retries": 1, "errors": 1}
+    assert report["total"]["queries_by_kind"] == {"REVOKE": 1, "SHOW TABLES": 2}
@@ -0,0 +1,106 @@
+"""tests/test_shards.py"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Set
+
+import pytest
+import yaml
+
+from snow_revoke_privileges.benchmark.synthetic_account import SyntheticAccount
+from snow_revoke_privileges.shards import merge, planner
+from snow_revoke_privileges.tools.configuration import ConfigurationError
+from snow_revoke_privileges.tools.shard_manifest import Shard, ShardManifest, get_schema_bucket
+
+
+def write_fleet(path: Path, **sharding: Any) -> str:
+    """
+    The function writes a fleet configuration of two accounts (two databases and one database) with a given sharding.
+    """
+
+    content: Dict[str, Any] = {
+        "sharding": sharding,
+        "settings": {"run_dry": True, "new_owner": "SYSADMIN", "objects": ["DATABASE", "SCHEMA", "TABLE"], "log_level": "info"},
+        "accounts": [
+            {"name": "PROD", "snowflake_credentials": {"role": "ACCOUNTADMIN"}, "settings": {"databases": ["SALES", "FINANCE"]}},
+            {"name": "DEV", "snowflake_credentials": {"role": "ACCOUNTADMIN"}, "settings": {"databases": ["DEV"]}},
+        ],
+    }
+
+    with open(path / "fleet.yaml", "w", encoding="utf-8") as file:
+        yaml.safe_dump(content, file)
+
+    return str(path / "fleet.yaml")
+
+
+@pytest.mark.parametrize(
+    "sharding, shard_ids",
+    [
+        ({"by": "account"}, ["PROD", "DEV"]),
+        ({"by": "database"}, ["PROD-SALES", "PROD-FINANCE", "DEV-DEV"]),
+        ({"by": "schema", "schema_buckets": 1}, ["PROD-SALES", "PROD-FINANCE", "DEV-DEV"]),
+        ({"by": "schema", "schema_buckets": 2}, ["PROD-SALES-0", "PROD-SALES-1", "PROD-FINANCE-0", "PROD-FINANCE-1", "DEV-DEV-0", "DEV-DEV-1"]),
+    ],
+)
+def test_plan_splits_the_fleet(tmp_path: Path, sharding: Dict[str, Any], shard_ids: List[str]) -> None:
+    """The fleet is split by account, by database or by bucket of schemas of each database."""
+
+    manifest: ShardManifest = planner.plan(write_fleet(tmp_path, **sharding), str(tmp_path / "output"))
+
+    assert [shard.shard_id for shard in manifest.shards] == shard_ids
+
+    for shard in manifest.shards:
+
+        # A shard of an account keeps its databases, the other shards have a single database.
+        if sharding["by"] == "account":
+            assert shard.settings["databases"] == {"PROD": ["SALES", "FINANCE"], "DEV": ["DEV"]}[shard.account]
+        else:
+            assert shard.settings["databases"] == [shard.shard_id.split("-")[1]]
+
+        if sharding.get("schema_buckets", 1) > 1:
+            assert shard.settings["schema_shard"] == {"bucket": int(shard.shard_id.split("-")[2]), "buckets": 2}
+        else:
+            assert "schema_shard" not in shard.settings
+
+
+def test_plan_rejects_invalid_sharding(tmp_path: Path) -> None:
+    """An unknown sharding mode is rejected before any connection."""
+
+    with pytest.raises(ConfigurationError, match="sharding mode"):
+        planner.plan(write_fleet(tmp_path, by="table"), str(tmp_path / "output"))
+
+
+def test_report_totals() -> None:
+    """The measures are added up, except the duration which is the one of the longest shard."""
+
+    manifest: ShardManifest = ShardManifest("fleet.yaml", "output", [Shard("A", "PROD", {}), Shard("B", "PROD", {}), Shard("C", "DEV", {})], "2026-01-01T00:00:00+00:00")
+
+    reports: Dict[str, Dict[str, Any]] = {
+        "A": {"total": {"queries": 10, "statements": 12, "rows": 100, "retries": 1, "errors": 0, "duration": 2.5, "queries_by_kind": {"SHOW": 8, "REVOKE": 2}}},
+        "B": {"total": {"queries": 5, "statements": 5, "rows": 50, "retries": 0, "errors": 2, "duration": 4.0, "queries_by_kind": {"SHOW": 5}}},
+    }
+
+    report: Dict[str, Any] = merge.get_report(manifest, reports)
+
+    assert report["total"] == {
+        "queries": 15,
+        "statements": 17,
+        "rows": 150,
+        "retries": 1,
+        "errors": 2,
+        "duration": 4.0,
+        "shard_duration": 6.5,
+        "queries_by_kind": {"REVOKE": 2, "SHOW": 13},
+    }
+    assert [shard["shard_id"] for shard in report["shards"]] == ["A", "B"]
+    assert report["missing"] == ["C"]
+
+
+@pytest.mark.parametrize("discovery_mode", ["object", "role"])
+def test_empty_bucket_is_processed(run_application: Callable[..., Set[str]], discovery_mode: str) -> None:
+    """A shard whose bucket does not contain any schema of its database finds nothing to revoke, without failing."""
+
+    account: SyntheticAccount = SyntheticAccount(databases=1, schemas=4, objects={"TABLE": 2})
+    buckets: Set[int] = {get_schema_bucket(database, schema, 2) for database, schema in zip(account.all_schemas["DATABASE_NAME"], account.all_schemas["SCHEMA_NAME"])}
+
+    assert buckets == {0}
+    assert run_application(account, schema_shard={"bucket": 1, "buckets": 2}, discovery_mode=discovery_mode, run_dry=True) == set()
@@ -0,0 +1,69 @@
+"""tests/test_snapshot.py"""
+
+import functools
+from pathlib import Path
+from typing import Any, Callable, List, Set
+
+import pytest
+
+from snow_revoke_privileges.application import Application
+from snow_revoke_privileges.benchmark.account import create_settings
+from snow_revoke_privileges.benchmark.fake_snowflake import FakeBehavior, FakeConnection, FakeStatistics
+from snow_revoke_privileges.benchmark.synthetic_account import SyntheticAccount
+from snow_revoke_privileges.tools.configuration import Configuration, ConfigurationError
+
+
+def test_incremental_show_mode_is_rejected(run_application: Callable[..., Set[str]]) -> None:
+    """The incremental mode is rejected with the SHOW commands, which cannot detect the objects altered."""
+
+    account: SyntheticAccount = SyntheticAccount(databases=1, schemas=1, objects={"TABLE": 2})
+
+    with pytest.raises(ConfigurationError, match="inventory_mode"):
+        run_application(account, "first", run_dry=True, incremental=True)
+
+
+def test_incremental_account_usage_mode(run_application: Callable[..., Set[str]]) -> None:
+    """The first incremental run finds the same requests as a full run."""
+
+    account: SyntheticAccount = SyntheticAccount(databases=1, schemas=1, objects={"TABLE": 2})
+
+    first: Set[str] = run_application(account, "first", run_dry=True, incremental=True, inventory_mode="account_usage")
+
+    assert len(first) > 0
+    assert first == run_application(account, "full", run_dry=True)
+
+
+def run_incremental(directory: str, account: SyntheticAccount, failing_marker: str = "FAIL", **settings: Any) -> List[str]:
+    """
+    The function executes the application in an output directory kept between the runs, and returns the REVOKE and
+    GRANT statements executed.
+    """
+
+    statistics: FakeStatistics = FakeStatistics()
+    config: Configuration = Configuration(create_settings(account, inventory_mode="account_usage", **settings), directory)
+    Application(connect=functools.partial(FakeConnection, statistics, FakeBehavior(failing_marker=failing_marker), account), config=config).execute()
+
+    return [statement for statement in statistics.statements if statement.startswith(("REVOKE ", "GRANT "))]
+
+
+def test_dry_run_keeps_the_snapshot(tmp_path: Path) -> None:
+    """A dry run does not save its snapshot, so the next run still executes all the statements."""
+
+    account: SyntheticAccount = SyntheticAccount(databases=1, schemas=2, objects={"TABLE": 4})
+    (tmp_path / "full").mkdir()
+    full: List[str] = run_incremental(str(tmp_path / "full"), account)
+
+    assert run_incremental(str(tmp_path), account, run_dry=True, incremental=True) == []
+    assert sorted(run_incremental(str(tmp_path), account, incremental=True)) == sorted(full)
+    assert run_incremental(str(tmp_path), account, incremental=True) == []
+
+
+def test_failed_objects_are_analyzed_again(tmp_path: Path) -> None:
+    """The objects whose statements have failed are left out of the snapshot, so the next run executes them again."""
+
+    account: SyntheticAccount = SyntheticAccount(databases=1, schemas=2, objects={"TABLE": 4})
+    first: List[str] = run_incremental(str(tmp_path), account, failing_marker='"TABLE_000001"', incremental=True)
+    second: List[str] = run_incremental(str(tmp_path), account, incremental=True)
+
+    assert len(first) > 0 and not any('"TABLE_000001"' in statement for statement in first)
+    assert len(second) > 0 and all('"TABLE_000001"' in statement for statement in second)
@@ -0,0 +1,23 @@
+"""tests/test_statement_planner.py"""
+
+from typing import Callable, Set
+
+from snow_revoke_privileges.benchmark.synthetic_account import GrantProfile, SyntheticAccount
+
+
+def is_collapsed(request: str) -> bool:
+    """The function indicates if a request targets all the objects of a type in a schema."""
+    return request.startswith(("REVOKE ALL PRIVILEGES ON ALL ", "GRANT OWNERSHIP ON ALL "))
+
+
+def test_statements_are_only_collapsed_on_demand(run_application: Callable[..., Set[str]]) -> None:
+    """The statements are collapsed by schema only with `collapse_threshold`."""
+
+    account: SyntheticAccount = SyntheticAccount(databases=1, schemas=2, objects={"TABLE": 4}, profile=GrantProfile(grants_per_object=20, owned_ratio=0.0))
+
+    default: Set[str] = run_application(account, "default", run_dry=True)
+    collapsed: Set[str] = run_application(account, "collapsed", run_dry=True, collapse_threshold=2)
+
+    assert not any(is_collapsed(request) for request in default)
+    assert any(is_collapsed(request) for request in collapsed)
+    assert len(collapsed) < len(default)
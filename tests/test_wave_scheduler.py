@@ -0,0 +1,90 @@
+"""tests/test_wave_scheduler.py"""
+
+import functools
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from snow_revoke_privileges.benchmark.fake_snowflake import FakeBehavior, FakeConnection, FakeStatistics
+from snow_revoke_privileges.tools.execution_ledger import SUCCESS, ExecutionLedger, RequestResult
+from snow_revoke_privileges.tools.my_snowflake import MySnowflake, SnowflakeOptions
+from snow_revoke_privileges.tools.wave_scheduler import GRANT, OWNERSHIP, REVOKE, WaveScheduler
+
+
+def create_scheduler() -> WaveScheduler:
+    """The function creates a graph where the first wave is a single slow request, so that no request is ready while it runs."""
+
+    scheduler: WaveScheduler = WaveScheduler()
+    scheduler.add(['REVOKE ALL PRIVILEGES ON TABLE "DB"."S"."SLOW" FROM ROLE R'], REVOKE)
+    scheduler.add(['GRANT OWNERSHIP ON TABLE "DB"."S"."SLOW" TO ROLE SYSADMIN COPY CURRENT GRANTS'], OWNERSHIP)
+    scheduler.add(['GRANT USAGE ON SCHEMA "DB"."S" TO ROLE SYSADMIN', 'GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA "DB"."S" TO ROLE SYSADMIN'], GRANT)
+
+    return scheduler
+
+
+def test_dependencies_follow_the_phases() -> None:
+    """A transfer waits for the revoke of its object, and the grants on the schema wait for both."""
+
+    scheduler: WaveScheduler = create_scheduler()
+
+    assert scheduler.build() == 5
+    assert scheduler.get_waves() == 3
+    assert scheduler.dependents == [[1, 2, 3], [2, 3], [], []]
+
+
+@pytest.mark.parametrize("connections,batch_size", [(1, 0), (4, 0), (4, 2)])
+def test_waves_without_ready_requests_do_not_block(connections: int, batch_size: int) -> None:
+    """The execution waits for the running requests to release the next ones, and completes."""
+
+    connect = functools.partial(FakeConnection, FakeStatistics(), FakeBehavior(0.01))
+    MySnowflake.initialize_database({"role": "TEST"}, SnowflakeOptions(connections, connect, batch_size=batch_size))
+
+    scheduler: WaveScheduler = create_scheduler()
+    results: List[RequestResult] = []
+
+    thread: threading.Thread = threading.Thread(target=lambda: results.extend(scheduler.execute()), daemon=True)
+    thread.start()
+    thread.join(10)
+
+    MySnowflake.pool.close()
+
+    assert not thread.is_alive()
+    assert sorted(result.request for result in results) == sorted(scheduler.requests)
+    assert all(result.status == SUCCESS for result in results)
+
+
+def test_results_are_recorded_while_waiting(tmp_path: Path) -> None:
+    """A result is recorded in the ledger as soon as it completes, even when no request is ready while a slow one runs."""
+
+    connect = functools.partial(FakeConnection, FakeStatistics(), FakeBehavior(0.05))
+    MySnowflake.initialize_database({"role": "TEST"}, SnowflakeOptions(2, connect))
+
+    scheduler: WaveScheduler = WaveScheduler()
+    scheduler.add(['REVOKE ALL PRIVILEGES ON TABLE "DB"."S"."FAST" FROM ROLE R', 'REVOKE ALL PRIVILEGES ON TABLE "DB"."S"."SLOW" FROM ROLE R'], REVOKE)
+    scheduler.add(['GRANT OWNERSHIP ON TABLE "DB"."S"."SLOW" TO ROLE SYSADMIN COPY CURRENT GRANTS'], OWNERSHIP)
+
+    recorded: Dict[str, float] = {}
+
+    class TimedLedger(ExecutionLedger):
+        """..."""
+
+        def record(self, result: RequestResult) -> None:
+            """..."""
+            recorded[result.request] = time.perf_counter()
+            super().record(result)
+
+    ledger: TimedLedger = TimedLedger(str(tmp_path / "ledger.jsonl"))
+    start: float = time.perf_counter()
+
+    try:
+        scheduler.execute(ledger)
+    finally:
+        ledger.close()
+        MySnowflake.pool.close()
+
+    # The slow revoke lasts ten times the latency, the fast one is recorded long before.
+    assert recorded['REVOKE ALL PRIVILEGES ON TABLE "DB"."S"."FAST" FROM ROLE R'] - start < 0.25
+    assert recorded['REVOKE ALL PRIVILEGES ON TABLE "DB"."S"."SLOW" FROM ROLE R'] - start >= 0.5